@@ -1,4 +1,11 @@
 # API module
-from .main import app
-
 __all__ = ["app"]
+
+
+def __getattr__(name: str):
+    # Imported on first access so api.server can configure the environment
+    # (multiprocess metrics, tokenizers) before the app and its metrics load
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,521 @@
+"""
+Sovereign AI - Background Job Manager
+Runs long multi-call LLM pipelines outside the request and streams
+their partial results to clients as Server-Sent Events
+Job state is kept in a local SQLite file shared by all API workers
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from config.settings import get_settings
+from llm.scheduler import Priority, llm_priority
+
+logger = structlog.get_logger()
+
+
+def sse_frame(event: str, data: Any) -> str:
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a background job"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class JobEvent:
+    """A single progress event published by a job"""
+    event: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class Job:
+    """Background job with its accumulated progress events"""
+    job_id: str
+    kind: str
+    user_id: str
+    status: JobStatus = JobStatus.PENDING
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[float] = None
+    events: List[JobEvent] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    _condition: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job status summary for API responses"""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "created_at": self.created_at.isoformat(),
+            "events": len(self.events),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+JobRunner = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+ACTIVE_STATUSES = (JobStatus.PENDING.value, JobStatus.RUNNING.value)
+
+ORPHANED_JOB_ERROR = "Job interrupted: the API worker running it stopped"
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this pid exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    SQLite store for job status, results and progress events
+    Runs in WAL mode so any API worker can serve a job another worker runs.
+    Each row records the pid of the worker running the job and a heartbeat
+    (updated_at), so jobs left behind by a dead worker can be failed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the job database on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, "
+                "kind TEXT NOT NULL, "
+                "user_id TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "created_at TEXT NOT NULL, "
+                "finished_at REAL, "
+                "result TEXT, "
+                "error TEXT, "
+                "owner_pid INTEGER, "
+                "updated_at REAL)"
+            )
+            # Stores created before the owner/heartbeat columns
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column in ("owner_pid INTEGER", "updated_at REAL"):
+                if column.split()[0] not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                "job_id TEXT NOT NULL, "
+                "seq INTEGER NOT NULL, "
+                "event TEXT NOT NULL, "
+                "data TEXT NOT NULL, "
+                "PRIMARY KEY (job_id, seq))"
+            )
+            self._conn.commit()
+            logger.info("job_store_opened", path=self.path)
+
+        return self._conn
+
+    def save(self, job: Job, event: Optional[JobEvent] = None):
+        """Write a job's status row, and optionally its latest event, in one transaction"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs "
+                    "(job_id, kind, user_id, status, created_at, finished_at, result, error, owner_pid, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job.job_id,
+                        job.kind,
+                        job.user_id,
+                        job.status.value,
+                        job.created_at.isoformat(),
+                        job.finished_at,
+                        json.dumps(job.result, default=str) if job.result is not None else None,
+                        job.error,
+                        os.getpid(),
+                        time.time(),
+                    )
+                )
+                if event is not None:
+                    conn.execute(
+                        "INSERT INTO job_events (job_id, seq, event, data) VALUES (?, ?, ?, ?)",
+                        (job.job_id, len(job.events) - 1, event.event, json.dumps(event.data, default=str))
+                    )
+
+    def load(self, job_id: str) -> Optional[Job]:
+        """Load a job and its events (None if unknown)"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT kind, user_id, status, created_at, finished_at, result, error "
+                "FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            events = self._events_since(conn, job_id, 0)
+
+        kind, user_id, status, created_at, finished_at, result, error = row
+        return Job(
+            job_id=job_id,
+            kind=kind,
+            user_id=user_id,
+            status=JobStatus(status),
+            created_at=datetime.fromisoformat(created_at),
+            finished_at=finished_at,
+            events=events,
+            result=json.loads(result) if result is not None else None,
+            error=error,
+        )
+
+    def poll(self, job_id: str, index: int) -> Tuple[Optional[JobStatus], Optional[float], List[JobEvent]]:
+        """
+        Get a job's status, heartbeat and the events published after the first index
+
+        The status is read first: a terminal event is written together with
+        the final status, so a finished status implies all events are returned.
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT status, updated_at FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None, None, []
+            return JobStatus(row[0]), row[1], self._events_since(conn, job_id, index)
+
+    def touch(self, job_id: str):
+        """Refresh the heartbeat of a job that is still running"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE jobs SET updated_at = ? WHERE job_id = ? AND status IN (?, ?)",
+                    (time.time(), job_id, *ACTIVE_STATUSES)
+                )
+
+    def active(self) -> List[Tuple[str, Optional[int], Optional[float]]]:
+        """Job ID, owner pid and heartbeat of every pending or running job"""
+        with self._lock:
+            conn = self._connect()
+            return conn.execute(
+                "SELECT job_id, owner_pid, updated_at FROM jobs WHERE status IN (?, ?)",
+                ACTIVE_STATUSES
+            ).fetchall()
+
+    def fail(self, job_ids: List[str], error: str) -> int:
+        """Mark jobs that are still pending or running failed, with a terminal error event"""
+        failed = 0
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for job_id in job_ids:
+                    updated = conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? "
+                        "WHERE job_id = ? AND status IN (?, ?)",
+                        (JobStatus.FAILED.value, error, now, now, job_id, *ACTIVE_STATUSES)
+                    ).rowcount
+                    if not updated:
+                        continue
+                    conn.execute(
+                        "INSERT INTO job_events (job_id, seq, event, data) "
+                        "SELECT ?, COALESCE(MAX(seq) + 1, 0), ?, ? FROM job_events WHERE job_id = ?",
+                        (job_id, "error", json.dumps({"error": error}), job_id)
+                    )
+                    failed += 1
+        return failed
+
+    @staticmethod
+    def _events_since(conn: sqlite3.Connection, job_id: str, index: int) -> List[JobEvent]:
+        rows = conn.execute(
+            "SELECT event, data FROM job_events WHERE job_id = ? AND seq >= ? ORDER BY seq",
+            (job_id, index)
+        ).fetchall()
+        return [JobEvent(event=event, data=json.loads(data)) for event, data in rows]
+
+    def purge(self, finished_before: float) -> int:
+        """Delete jobs (and their events) that finished before a timestamp"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "DELETE FROM job_events WHERE job_id IN ("
+                    "SELECT job_id FROM jobs WHERE finished_at < ?)",
+                    (finished_before,)
+                )
+                return conn.execute(
+                    "DELETE FROM jobs WHERE finished_at < ?",
+                    (finished_before,)
+                ).rowcount
+
+
+class JobManager:
+    """
+    Job manager shared across API workers
+    Jobs run as asyncio tasks in the worker that accepted them; their state
+    and events are written to the JobStore so every worker can report and
+    stream them until their TTL expires
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.store = JobStore(self.settings.jobs.store_path)
+        # Jobs running (or recently run) in this worker
+        self._jobs: Dict[str, Job] = {}
+
+    async def _store_call(self, func: Callable[..., Any], *args) -> Any:
+        """Run a JobStore call off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def _purge_expired(self):
+        """Drop finished jobs older than the result TTL"""
+        cutoff = time.time() - self.settings.jobs.result_ttl_seconds
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+        expired = await self._store_call(self.store.purge, cutoff)
+        if expired:
+            logger.info("jobs_expired", count=expired)
+
+        await self.fail_orphaned()
+
+    async def fail_orphaned(self) -> int:
+        """
+        Fail jobs whose worker is gone
+
+        A pending or running job is orphaned when its heartbeat is older than
+        stale_after_seconds, its owner process no longer exists, or it is
+        owned by this process's pid without running here (a previous
+        process that reused the pid). Run at startup and on job reads.
+
+        Returns:
+            Number of jobs marked failed
+        """
+        stale_before = time.time() - self.settings.jobs.stale_after_seconds
+        pid = os.getpid()
+        orphaned = [
+            job_id
+            for job_id, owner_pid, updated_at in await self._store_call(self.store.active)
+            if job_id not in self._jobs and (
+                updated_at is None
+                or updated_at < stale_before
+                or owner_pid is None
+                or owner_pid == pid
+                or not _pid_alive(owner_pid)
+            )
+        ]
+        if not orphaned:
+            return 0
+
+        failed = await self._store_call(self.store.fail, orphaned, ORPHANED_JOB_ERROR)
+        if failed:
+            logger.warning("jobs_orphaned", count=failed)
+        return failed
+
+    async def submit(self, kind: str, user_id: str, runner: JobRunner) -> Job:
+        """
+        Start a job in the background
+
+        Args:
+            kind: Job type (e.g. policy_mapping, soc_cmm)
+            user_id: Owner of the job
+            runner: Coroutine function producing the final result
+
+        Returns:
+            The created job
+        """
+        await self._purge_expired()
+
+        job = Job(job_id=secrets.token_urlsafe(16), kind=kind, user_id=user_id)
+        self._jobs[job.job_id] = job
+        await self._store_call(self.store.save, job)
+        job._task = asyncio.create_task(self._run(job, runner))
+
+        logger.info("job_submitted", job_id=job.job_id, kind=kind, user_id=user_id)
+        return job
+
+    async def _run(self, job: Job, runner: JobRunner):
+        """Execute a job and publish its terminal event"""
+        job.status = JobStatus.RUNNING
+        start_time = time.time()
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+
+        try:
+            await self._store_call(self.store.save, job)
+
+            # Jobs queue behind interactive and synchronous batch LLM calls
+            with llm_priority(Priority.BACKGROUND):
+                job.result = await runner(job)
+            await self.publish(job, "result", job.result, status=JobStatus.COMPLETED)
+
+        except Exception as e:
+            job.error = str(e)
+            await self.publish(job, "error", {"error": job.error}, status=JobStatus.FAILED)
+            logger.error("job_failed", job_id=job.job_id, kind=job.kind, error=job.error)
+
+        finally:
+            heartbeat.cancel()
+            job.finished_at = time.time()
+            try:
+                await self._store_call(self.store.save, job)
+            except Exception as e:
+                logger.error("job_store_write_failed", job_id=job.job_id, error=str(e))
+            logger.info(
+                "job_finished",
+                job_id=job.job_id,
+                kind=job.kind,
+                status=job.status.value,
+                events=len(job.events),
+                processing_time_ms=(job.finished_at - start_time) * 1000
+            )
+
+    async def _heartbeat(self, job: Job):
+        """Refresh the job's heartbeat in the store while it runs"""
+        interval = self.settings.jobs.heartbeat_seconds
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._store_call(self.store.touch, job.job_id)
+            except Exception as e:
+                logger.error("job_heartbeat_failed", job_id=job.job_id, error=str(e))
+
+    async def publish(
+        self,
+        job: Job,
+        event: str,
+        data: Dict[str, Any],
+        status: Optional[JobStatus] = None
+    ):
+        """Append a progress event (and optional status change), persist it and wake listeners"""
+        async with job._condition:
+            if status is not None:
+                job.status = status
+            job_event = JobEvent(event=event, data=data)
+            job.events.append(job_event)
+            try:
+                await self._store_call(self.store.save, job, job_event)
+            finally:
+                job._condition.notify_all()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID from this worker or the shared store (None if unknown or expired)"""
+        await self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = await self._store_call(self.store.load, job_id)
+        return job
+
+    async def stream(self, job: Job) -> AsyncGenerator[str, None]:
+        """
+        Stream a job's events as SSE frames
+
+        Replays events published so far, then follows new ones until the
+        job finishes. Sends keep-alive comments while idle. Jobs running in
+        another worker are followed by polling the shared store.
+        """
+        if job.job_id not in self._jobs:
+            async for frame in self._stream_remote(job):
+                yield frame
+            return
+
+        keepalive = self.settings.jobs.sse_keepalive_seconds
+        index = 0
+
+        while True:
+            # The terminal event is published together with the final status,
+            # so once done is observed every event is already in the list
+            finished = job.done
+
+            while index < len(job.events):
+                event = job.events[index]
+                index += 1
+                yield sse_frame(event.event, event.data)
+
+            if finished:
+                return
+
+            idle = False
+            async with job._condition:
+                try:
+                    await asyncio.wait_for(
+                        job._condition.wait_for(lambda: len(job.events) > index),
+                        timeout=keepalive
+                    )
+                except asyncio.TimeoutError:
+                    idle = True
+
+            if idle:
+                yield ": keep-alive\n\n"
+
+    async def _stream_remote(self, job: Job) -> AsyncGenerator[str, None]:
+        """Stream a job owned by another worker from the shared store (ends with an error event if that worker dies)"""
+        keepalive = self.settings.jobs.sse_keepalive_seconds
+        interval = self.settings.jobs.stream_poll_seconds
+        stale_after = self.settings.jobs.stale_after_seconds
+        index = 0
+        idle_since = time.monotonic()
+
+        while True:
+            status, updated_at, events = await self._store_call(self.store.poll, job.job_id, index)
+
+            for event in events:
+                index += 1
+                yield sse_frame(event.event, event.data)
+
+            if status is None or status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                return
+
+            # The next poll picks up the error event written for an orphaned job
+            if updated_at is None or updated_at < time.time() - stale_after:
+                await self.fail_orphaned()
+
+            if events:
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since >= keepalive:
+                idle_since = time.monotonic()
+                yield ": keep-alive\n\n"
+
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+job_manager = JobManager()
@@ -8,9 +8,15 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 import hashlib
+import hmac
+import ipaddress
 import json
+import os
+import time
 
 from fastapi import FastAPI, HTTPException, Depends, Request, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from prometheus_client import CollectorRegistry, REGISTRY, generate_latest, multiprocess, CONTENT_TYPE_LATEST
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
@@ -21,21 +27,96 @@ from security.auth import (
     auth_service, SessionContext, Role, Permission,
     require_permission, require_mfa, ROLE_PERMISSIONS
 )
-from security.dlp import dlp_engine
+from security.dlp import get_dlp_engine, dlp_engine_loaded, DLPEngine
 from llm import get_llm_client, LLMMessage, LLMRole
-from rag.engine import rag_engine, DocumentType
-from modules.policy_mapper import policy_mapper, ComplianceFramework
-from modules.soc_cmm_analyzer import soc_cmm_analyzer, SOCCMMDomain, MaturityLevel, Evidence
+from rag.engine import get_rag_engine, rag_engine_loaded, DocumentType, Document, RAGEngine
+from modules.policy_mapper import get_policy_mapper, ComplianceFramework
+from modules.soc_cmm_analyzer import get_soc_cmm_analyzer, SOCCMMDomain, MaturityLevel, Evidence
+from api.jobs import job_manager, Job, sse_frame
 
 logger = structlog.get_logger()
 settings = get_settings()
 security = HTTPBearer()
 
+# Seconds clients are told to wait while the models warm up
+WARMUP_RETRY_AFTER_SECONDS = 5
+
+# Background warm-up task (fast start only)
+_warmup_task: Optional[asyncio.Task] = None
+
 
 # ============================================================================
 # Startup / Shutdown
 # ============================================================================
 
+async def warm_up_models():
+    """Build the RAG and DLP engines off the event loop and run a dummy encode and scan"""
+    start_time = time.perf_counter()
+    loop = asyncio.get_running_loop()
+
+    async def warm_up_rag():
+        rag_engine = await loop.run_in_executor(None, get_rag_engine)
+        await rag_engine.warm_up()
+
+    async def warm_up_dlp():
+        dlp_engine = await loop.run_in_executor(None, get_dlp_engine)
+        await loop.run_in_executor(None, dlp_engine.warm_up)
+
+    try:
+        await asyncio.gather(warm_up_rag(), warm_up_dlp())
+    except Exception as e:
+        logger.error("model_warmup_failed", error=str(e))
+        return
+
+    logger.info("models_warmed_up", duration_ms=round((time.perf_counter() - start_time) * 1000, 1))
+
+
+async def _load_engine(getter):
+    """Build an engine off the event loop, or answer 503 while the background warm-up is building it"""
+    if _warmup_task is not None and not _warmup_task.done():
+        raise HTTPException(
+            status_code=503,
+            detail="AI models are warming up",
+            headers={"Retry-After": str(WARMUP_RETRY_AFTER_SECONDS)}
+        )
+    return await asyncio.get_running_loop().run_in_executor(None, getter)
+
+
+async def rag_engine_ready() -> RAGEngine:
+    """
+    Dependency for routes that use the RAG engine
+
+    Loading the embedding model takes seconds and holds a lock, so it must
+    never happen on the event loop (it would stall every request, health
+    checks included).
+
+    Returns:
+        The loaded RAG engine
+
+    Raises:
+        HTTPException: 503 with Retry-After while the warm-up is still running
+    """
+    if rag_engine_loaded():
+        return get_rag_engine()
+    return await _load_engine(get_rag_engine)
+
+
+async def dlp_engine_ready() -> DLPEngine:
+    """
+    Dependency for routes that use the DLP engine, directly or through an
+    LLM client (which scans prompts and outputs with it)
+
+    Returns:
+        The loaded DLP engine
+
+    Raises:
+        HTTPException: 503 with Retry-After while the warm-up is still running
+    """
+    if dlp_engine_loaded():
+        return get_dlp_engine()
+    return await _load_engine(get_dlp_engine)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifecycle management"""
@@ -54,6 +135,12 @@ async def lifespan(app: FastAPI):
         logger.critical("sovereignty_violation", error=str(e))
         raise
 
+    # Jobs left running by a previous (crashed or restarted) worker never finish
+    try:
+        await job_manager.fail_orphaned()
+    except Exception as e:
+        logger.error("job_recovery_failed", error=str(e))
+
     # Initialize LLM client via factory
     llm_client = get_llm_client()
 
@@ -74,12 +161,28 @@ async def lifespan(app: FastAPI):
             message=f"{llm_client.get_provider_name()} not responding"
         )
 
+    # Warm up models before serving: uvicorn accepts no requests (the health
+    # check included) until startup completes. Fast start serves right away
+    # and warms up in the background; AI routes answer 503 until it is done.
+    global _warmup_task
+    if settings.api_warmup and settings.api_fast_start:
+        _warmup_task = asyncio.create_task(warm_up_models())
+    elif settings.api_warmup:
+        await warm_up_models()
+
     yield
 
     # Shutdown
     logger.info("sovereign_ai_shutting_down")
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    if dlp_engine_loaded():
+        logger.info("dlp_fast_path_stats", **get_dlp_engine().stats())
     await llm_client.close()
-    rag_engine.persist()
+    if rag_engine_loaded():
+        rag_engine = get_rag_engine()
+        rag_engine.persist()
+        rag_engine.shutdown()
 
 
 # ============================================================================
@@ -166,6 +269,25 @@ async def get_current_session(
     return session
 
 
+async def metrics_scraper(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+):
+    """Admit the Prometheus scraper: bearer token if configured, else internal clients only"""
+    token = settings.security.metrics_token
+    if token:
+        if not credentials or not hmac.compare_digest(credentials.credentials, token):
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        return
+
+    try:
+        client = ipaddress.ip_address(request.client.host if request.client else "")
+    except ValueError:
+        raise HTTPException(status_code=403, detail="Metrics are internal only")
+    if not any(client in ipaddress.ip_network(net) for net in settings.security.metrics_allowed_networks):
+        raise HTTPException(status_code=403, detail="Metrics are internal only")
+
+
 async def audit_log(
     request: Request,
     session: SessionContext,
@@ -262,6 +384,7 @@ class SOCCMMResponse(BaseModel):
     priority_improvements: List[Dict[str, Any]]
     roadmap: List[Dict[str, Any]]
     processing_time_ms: float
+    domain_timings_ms: Dict[str, float] = {}
 
 
 class DocumentIndexRequest(BaseModel):
@@ -271,6 +394,10 @@ class DocumentIndexRequest(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class DocumentBulkIndexRequest(BaseModel):
+    documents: List[DocumentIndexRequest] = Field(..., min_length=1, max_length=1000)
+
+
 class HealthResponse(BaseModel):
     status: str
     version: str
@@ -308,6 +435,17 @@ async def health_check():
     )
 
 
+@app.get("/metrics", dependencies=[Depends(metrics_scraper)])
+async def metrics():
+    """Prometheus metrics for the local monitoring stack, summed over all API workers"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/api/v1/status")
 async def api_status(session: SessionContext = Depends(get_current_session)):
     """API status with authentication"""
@@ -403,7 +541,9 @@ async def ai_query(
     request: Request,
     body: AIQueryRequest,
     background_tasks: BackgroundTasks,
-    session: SessionContext = Depends(get_current_session)
+    session: SessionContext = Depends(get_current_session),
+    rag_engine: RAGEngine = Depends(rag_engine_ready),
+    dlp_engine: DLPEngine = Depends(dlp_engine_ready)
 ):
     """
     Query the AI Cybersecurity Director
@@ -418,20 +558,11 @@ async def ai_query(
     if was_blocked and settings.dlp.block_on_detection:
         raise HTTPException(status_code=400, detail="Query contains blocked content")
 
-    # Determine document types based on context
-    doc_types = None
-    if body.context_type == "policy":
-        doc_types = [DocumentType.POLICY, DocumentType.FRAMEWORK]
-    elif body.context_type == "risk":
-        doc_types = [DocumentType.RISK, DocumentType.THREAT_INTEL]
-    elif body.context_type == "compliance":
-        doc_types = [DocumentType.FRAMEWORK, DocumentType.CONTROL]
-
     # RAG query
     result = await rag_engine.query(
         question=sanitized_query,
-        doc_types=doc_types,
-        system_prompt_key="risk_analyst" if body.context_type == "risk" else "policy_mapper",
+        doc_types=_query_doc_types(body.context_type),
+        system_prompt_key=_query_prompt_key(body.context_type),
         user_id=session.user_id
     )
 
@@ -452,13 +583,7 @@ async def ai_query(
     return AIQueryResponse(
         answer=result.answer,
         sources=[
-            {
-                "id": s.document.id,
-                "type": s.document.doc_type.value,
-                "relevance": round(s.similarity_score, 2),
-                "excerpt": s.document.content[:200] + "..."
-            }
-            for s in result.sources
+            _serialize_source(s) for s in result.sources
         ] if body.include_sources else [],
         confidence=result.confidence,
         model=result.model,
@@ -467,7 +592,100 @@ async def ai_query(
     )
 
 
-@app.post("/api/v1/ai/chat")
+@app.post("/api/v1/ai/query/stream")
+async def ai_query_stream(
+    request: Request,
+    body: AIQueryRequest,
+    background_tasks: BackgroundTasks,
+    session: SessionContext = Depends(get_current_session),
+    rag_engine: RAGEngine = Depends(rag_engine_ready),
+    dlp_engine: DLPEngine = Depends(dlp_engine_ready)
+):
+    """
+    Query the AI Cybersecurity Director with a streamed answer (SSE)
+    Emits a sources event, then token events as the answer is generated
+    (output DLP applied incrementally), then a done or error event
+    """
+    # Permission check
+    if Permission.AI_RISK_ANALYSIS not in session.permissions:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    # DLP scan query
+    sanitized_query, was_blocked = dlp_engine.scan_prompt(body.query, session.user_id)
+    if was_blocked and settings.dlp.block_on_detection:
+        raise HTTPException(status_code=400, detail="Query contains blocked content")
+
+    # Audit log up front: a client may disconnect before the stream ends
+    await audit_log(
+        request=request,
+        session=session,
+        action="ai_query",
+        resource="ai_director",
+        details={
+            "query_length": len(body.query),
+            "context_type": body.context_type,
+            "streamed": True
+        },
+        background_tasks=background_tasks
+    )
+
+    async def events():
+        try:
+            async for event, data in rag_engine.query_stream(
+                question=sanitized_query,
+                doc_types=_query_doc_types(body.context_type),
+                system_prompt_key=_query_prompt_key(body.context_type),
+                user_id=session.user_id
+            ):
+                if event == "sources":
+                    data = {
+                        "sources": [_serialize_source(s) for s in data] if body.include_sources else []
+                    }
+                elif event == "token":
+                    data = {"text": data}
+                yield sse_frame(event, data)
+
+        except Exception as e:
+            logger.error("ai_query_stream_failed", user_id=session.user_id, error=str(e))
+            yield sse_frame("error", {"error": "Answer generation failed"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+def _query_doc_types(context_type: Optional[str]) -> Optional[List[DocumentType]]:
+    """Determine document types based on query context"""
+    if context_type == "policy":
+        return [DocumentType.POLICY, DocumentType.FRAMEWORK]
+    elif context_type == "risk":
+        return [DocumentType.RISK, DocumentType.THREAT_INTEL]
+    elif context_type == "compliance":
+        return [DocumentType.FRAMEWORK, DocumentType.CONTROL]
+    return None
+
+
+def _query_prompt_key(context_type: Optional[str]) -> str:
+    """System prompt for a query context"""
+    return "risk_analyst" if context_type == "risk" else "policy_mapper"
+
+
+def _serialize_source(source) -> Dict[str, Any]:
+    """Serialize a cited RAG source for API responses"""
+    return {
+        "id": source.document.id,
+        "type": source.document.doc_type.value,
+        "relevance": round(source.similarity_score, 2),
+        "excerpt": source.document.content[:200] + "..."
+    }
+
+
+@app.post("/api/v1/ai/chat", dependencies=[Depends(dlp_engine_ready)])
 async def ai_chat(
     request: Request,
     messages: List[Dict[str, str]],
@@ -515,7 +733,14 @@ async def ai_chat(
 # Policy Mapping Endpoints
 # ============================================================================
 
-@app.post("/api/v1/compliance/policy-mapping", response_model=PolicyMappingResponse)
+# Policy mapping embeds statements and controls through the RAG engine.
+# Every route reaching an LLM client needs the DLP engine: the clients scan
+# prompts and outputs with it synchronously.
+@app.post(
+    "/api/v1/compliance/policy-mapping",
+    response_model=PolicyMappingResponse,
+    dependencies=[Depends(rag_engine_ready), Depends(dlp_engine_ready)]
+)
 async def map_policy_to_frameworks(
     request: Request,
     body: PolicyMappingRequest,
@@ -530,12 +755,9 @@ async def map_policy_to_frameworks(
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
     # Parse frameworks
-    frameworks = [
-        ComplianceFramework(f) for f in body.frameworks
-        if f in [cf.value for cf in ComplianceFramework]
-    ]
+    frameworks = _parse_frameworks(body.frameworks)
 
-    result = await policy_mapper.analyze_policy(
+    result = await get_policy_mapper().analyze_policy(
         policy_id=body.policy_id,
         policy_title=body.policy_title,
         policy_content=body.policy_content,
@@ -557,19 +779,92 @@ async def map_policy_to_frameworks(
         background_tasks=background_tasks
     )
 
+    return _policy_mapping_response(result)
+
+
+@app.post(
+    "/api/v1/compliance/policy-mapping/jobs",
+    status_code=202,
+    dependencies=[Depends(rag_engine_ready), Depends(dlp_engine_ready)]
+)
+async def submit_policy_mapping_job(
+    request: Request,
+    body: PolicyMappingRequest,
+    background_tasks: BackgroundTasks,
+    session: SessionContext = Depends(get_current_session)
+):
+    """
+    Start policy mapping as a background job
+    Progress streams from /api/v1/jobs/{job_id}/events
+    """
+    if Permission.AI_POLICY_MAPPING not in session.permissions:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    frameworks = _parse_frameworks(body.frameworks)
+
+    async def run(job: Job) -> Dict[str, Any]:
+        async def on_progress(event: str, payload: Dict[str, Any]):
+            await job_manager.publish(job, "statement", {
+                "statement_id": payload["statement_id"],
+                "framework": payload["framework"].value,
+                "cached": payload["cached"],
+                "mappings": [_serialize_mapping(m) for m in payload["mappings"]],
+            })
+
+        result = await get_policy_mapper().analyze_policy(
+            policy_id=body.policy_id,
+            policy_title=body.policy_title,
+            policy_content=body.policy_content,
+            statements=body.statements,
+            target_frameworks=frameworks,
+            user_id=session.user_id,
+            progress_callback=on_progress
+        )
+        return _policy_mapping_response(result).model_dump()
+
+    job = await job_manager.submit("policy_mapping", session.user_id, run)
+
+    await audit_log(
+        request=request,
+        session=session,
+        action="policy_mapping_job",
+        resource=f"policy:{body.policy_id}",
+        details={
+            "job_id": job.job_id,
+            "frameworks": body.frameworks,
+            "statements_count": len(body.statements)
+        },
+        background_tasks=background_tasks
+    )
+
+    return {"job_id": job.job_id, "status": job.status.value}
+
+
+def _parse_frameworks(names: List[str]) -> List[ComplianceFramework]:
+    """Parse requested framework names, ignoring unknown ones"""
+    return [
+        ComplianceFramework(f) for f in names
+        if f in [cf.value for cf in ComplianceFramework]
+    ]
+
+
+def _serialize_mapping(m) -> Dict[str, Any]:
+    """Serialize a PolicyMapping for API responses"""
+    return {
+        "statement_id": m.statement_id,
+        "control_id": m.control.control_id,
+        "framework": m.control.framework.value,
+        "coverage": m.coverage_level.value,
+        "confidence": m.confidence_score,
+        "rationale": m.rationale
+    }
+
+
+def _policy_mapping_response(result) -> PolicyMappingResponse:
+    """Build the API response for a policy analysis result"""
     return PolicyMappingResponse(
         policy_id=result.policy_id,
-        mappings=[
-            {
-                "statement_id": m.statement_id,
-                "control_id": m.control.control_id,
-                "framework": m.control.framework.value,
-                "coverage": m.coverage_level.value,
-                "confidence": m.confidence_score,
-                "rationale": m.rationale
-            }
-            for m in result.mappings
-        ],
+        mappings=[_serialize_mapping(m) for m in result.mappings],
         coverage_summary={
             framework.value: summary
             for framework, summary in result.coverage_summary.items()
@@ -585,7 +880,11 @@ async def map_policy_to_frameworks(
 # SOC-CMM Assessment Endpoints
 # ============================================================================
 
-@app.post("/api/v1/assessment/soc-cmm", response_model=SOCCMMResponse)
+@app.post(
+    "/api/v1/assessment/soc-cmm",
+    response_model=SOCCMMResponse,
+    dependencies=[Depends(dlp_engine_ready)]
+)
 async def assess_soc_cmm(
     request: Request,
     body: SOCCMMRequest,
@@ -599,20 +898,9 @@ async def assess_soc_cmm(
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
     # Convert evidence
-    evidence_list = [
-        Evidence(
-            id=e.get("id", str(i)),
-            title=e.get("title", ""),
-            description=e.get("description", ""),
-            domain=SOCCMMDomain(e.get("domain", "Technology")),
-            content=e.get("content", ""),
-            artifact_type=e.get("artifact_type", "document"),
-            uploaded_at=datetime.utcnow()
-        )
-        for i, e in enumerate(body.evidence)
-    ]
+    evidence_list = _parse_evidence(body.evidence)
 
-    result = await soc_cmm_analyzer.analyze_evidence(
+    result = await get_soc_cmm_analyzer().analyze_evidence(
         evidence_list=evidence_list,
         organization=body.organization,
         target_maturity=MaturityLevel(body.target_maturity),
@@ -631,24 +919,145 @@ async def assess_soc_cmm(
         background_tasks=background_tasks
     )
 
+    return _soc_cmm_response(result)
+
+
+@app.post(
+    "/api/v1/assessment/soc-cmm/jobs",
+    status_code=202,
+    dependencies=[Depends(dlp_engine_ready)]
+)
+async def submit_soc_cmm_job(
+    request: Request,
+    body: SOCCMMRequest,
+    background_tasks: BackgroundTasks,
+    session: SessionContext = Depends(get_current_session)
+):
+    """
+    Start a SOC-CMM assessment as a background job
+    Progress streams from /api/v1/jobs/{job_id}/events
+    """
+    if Permission.AI_SOC_CMM not in session.permissions:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    evidence_list = _parse_evidence(body.evidence)
+
+    async def run(job: Job) -> Dict[str, Any]:
+        async def on_progress(event: str, payload: Dict[str, Any]):
+            await job_manager.publish(job, "domain", {
+                **_serialize_domain_assessment(payload["assessment"]),
+                "elapsed_ms": payload["elapsed_ms"],
+            })
+
+        result = await get_soc_cmm_analyzer().analyze_evidence(
+            evidence_list=evidence_list,
+            organization=body.organization,
+            target_maturity=MaturityLevel(body.target_maturity),
+            user_id=session.user_id,
+            progress_callback=on_progress
+        )
+        return _soc_cmm_response(result).model_dump()
+
+    job = await job_manager.submit("soc_cmm", session.user_id, run)
+
+    await audit_log(
+        request=request,
+        session=session,
+        action="soc_cmm_assessment_job",
+        resource=f"organization:{body.organization}",
+        details={
+            "job_id": job.job_id,
+            "evidence_count": len(body.evidence)
+        },
+        background_tasks=background_tasks
+    )
+
+    return {"job_id": job.job_id, "status": job.status.value}
+
+
+def _parse_evidence(evidence: List[Dict[str, Any]]) -> List[Evidence]:
+    """Convert request evidence to Evidence artifacts"""
+    return [
+        Evidence(
+            id=e.get("id", str(i)),
+            title=e.get("title", ""),
+            description=e.get("description", ""),
+            domain=SOCCMMDomain(e.get("domain", "Technology")),
+            content=e.get("content", ""),
+            artifact_type=e.get("artifact_type", "document"),
+            uploaded_at=datetime.utcnow()
+        )
+        for i, e in enumerate(evidence)
+    ]
+
+
+def _serialize_domain_assessment(a) -> Dict[str, Any]:
+    """Serialize a DomainAssessment for API responses"""
+    return {
+        "domain": a.domain.value,
+        "current_level": a.current_level.name,
+        "score": a.score,
+        "strengths": a.strengths,
+        "weaknesses": a.weaknesses
+    }
+
+
+def _soc_cmm_response(result) -> SOCCMMResponse:
+    """Build the API response for a SOC-CMM assessment"""
     return SOCCMMResponse(
         assessment_id=result.assessment_id,
         overall_maturity=result.overall_maturity.name,
         overall_score=result.overall_score,
         domain_assessments=[
-            {
-                "domain": a.domain.value,
-                "current_level": a.current_level.name,
-                "score": a.score,
-                "strengths": a.strengths,
-                "weaknesses": a.weaknesses
-            }
-            for a in result.domain_assessments
+            _serialize_domain_assessment(a) for a in result.domain_assessments
         ],
         executive_summary=result.executive_summary,
         priority_improvements=result.priority_improvements,
         roadmap=result.roadmap,
-        processing_time_ms=result.processing_time_ms
+        processing_time_ms=result.processing_time_ms,
+        domain_timings_ms=result.domain_timings_ms
+    )
+
+
+# ============================================================================
+# Background Job Endpoints
+# ============================================================================
+
+async def _get_owned_job(job_id: str, session: SessionContext) -> Job:
+    """Look up a job, hiding jobs that belong to other users"""
+    job = await job_manager.get(job_id)
+    if job is None or job.user_id != session.user_id:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    session: SessionContext = Depends(get_current_session)
+):
+    """Get background job status and, once finished, its result"""
+    return (await _get_owned_job(job_id, session)).to_dict()
+
+
+@app.get("/api/v1/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    session: SessionContext = Depends(get_current_session)
+):
+    """
+    Stream background job progress as Server-Sent Events
+    Emits per-statement/per-domain events, then a final result or error event
+    """
+    job = await _get_owned_job(job_id, session)
+
+    return StreamingResponse(
+        job_manager.stream(job),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        }
     )
 
 
@@ -661,7 +1070,8 @@ async def index_document(
     request: Request,
     body: DocumentIndexRequest,
     background_tasks: BackgroundTasks,
-    session: SessionContext = Depends(get_current_session)
+    session: SessionContext = Depends(get_current_session),
+    rag_engine: RAGEngine = Depends(rag_engine_ready)
 ):
     """Index document into RAG system"""
     if Permission.DATA_WRITE not in session.permissions:
@@ -691,12 +1101,57 @@ async def index_document(
     return {"doc_id": doc_id, "status": "indexed"}
 
 
+# Bulk indexing DLP-scans the documents before they are stored
+@app.post("/api/v1/documents/index/bulk", dependencies=[Depends(dlp_engine_ready)])
+async def index_documents_bulk(
+    request: Request,
+    body: DocumentBulkIndexRequest,
+    background_tasks: BackgroundTasks,
+    session: SessionContext = Depends(get_current_session),
+    rag_engine: RAGEngine = Depends(rag_engine_ready)
+):
+    """Index many documents into RAG system with batched embedding"""
+    if Permission.DATA_WRITE not in session.permissions:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+    documents = [
+        Document(
+            id=d.doc_id or "",
+            content=d.content,
+            doc_type=DocumentType(d.doc_type),
+            metadata=d.metadata or {}
+        )
+        for d in body.documents
+    ]
+
+    try:
+        doc_ids = await rag_engine.add_documents(documents, user_id=session.user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Documents contain blocked content")
+
+    await audit_log(
+        request=request,
+        session=session,
+        action="document_bulk_index",
+        resource="documents",
+        details={
+            "document_count": len(documents),
+            "doc_ids": doc_ids,
+            "content_length": sum(len(d.content) for d in documents)
+        },
+        background_tasks=background_tasks
+    )
+
+    return {"doc_ids": doc_ids, "status": "indexed", "count": len(doc_ids)}
+
+
 @app.get("/api/v1/documents/search")
 async def search_documents(
     query: str,
     doc_type: Optional[str] = None,
     top_k: int = 5,
-    session: SessionContext = Depends(get_current_session)
+    session: SessionContext = Depends(get_current_session),
+    rag_engine: RAGEngine = Depends(rag_engine_ready)
 ):
     """Search documents in RAG system"""
     if Permission.DATA_READ not in session.permissions:
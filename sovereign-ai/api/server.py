@@ -0,0 +1,181 @@
+"""
+Sovereign AI - Preforking Server
+Loads the models once in a parent process, then forks API workers that
+share the read-only model memory copy-on-write (gunicorn --preload style)
+
+Usage: python -m api.server
+"""
+
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+
+# The tokenizers thread pool does not survive fork; must be set before import
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+import structlog
+import uvicorn
+
+from config.settings import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Workers exiting sooner than this after start are respawned with backoff
+WORKER_MIN_UPTIME_SECONDS = 10.0
+WORKER_MAX_RESTART_DELAY_SECONDS = 30.0
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    """Listening socket shared by every worker"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _prepare_metrics_dir() -> Optional[str]:
+    """
+    Empty prometheus_client multiprocess directory shared by the workers
+
+    Must run before prometheus_client is first imported, which fixes the
+    metric storage backend for the process and every worker forked from it.
+    """
+    if "prometheus_client" in sys.modules and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Too late to switch backends; /metrics stays per worker
+        logger.warning("metrics_multiprocess_unavailable")
+        return None
+
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.path.join(
+        tempfile.gettempdir(), "sovereign-prometheus"
+    )
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    os.makedirs(path, exist_ok=True)
+    # Files from a previous run would be summed into this one
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+    return path
+
+
+def _run_worker(app, sock: socket.socket):
+    """Worker body: reopen per-process connections, then serve on the shared socket"""
+    from rag.engine import get_rag_engine
+
+    # Inherited from the parent; uvicorn installs its own shutdown handlers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    get_rag_engine().reconnect()
+    uvicorn.Server(uvicorn.Config(app, log_level="info")).run(sockets=[sock])
+
+
+def _spawn_worker(app, sock: socket.socket) -> int:
+    """Fork one API worker; returns its pid in the parent"""
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            _run_worker(app, sock)
+        except BaseException as e:
+            logger.error("api_worker_failed", pid=os.getpid(), error=str(e))
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    return pid
+
+
+def serve(workers: Optional[int] = None):
+    """
+    Preload models and run forked uvicorn workers until signalled
+
+    Only model weights are loaded before forking; inference thread pools
+    (torch, tokenizers) start in each worker during its lifespan warm-up.
+    Workers write metrics to a shared PROMETHEUS_MULTIPROC_DIR so /metrics
+    reports all of them. A worker that exits is replaced; one that dies within
+    WORKER_MIN_UPTIME_SECONDS of starting is replaced after a growing
+    delay, so a crash loop does not spin.
+
+    Args:
+        workers: Worker processes (defaults to API_WORKERS)
+    """
+    workers = max(1, workers or settings.api_workers)
+    # Workers split the LLM concurrency limits between them
+    settings.api_workers = workers
+
+    metrics_dir = _prepare_metrics_dir()
+    from prometheus_client import multiprocess
+
+    from api.main import app
+    from rag.engine import get_rag_engine
+    from security.dlp import get_dlp_engine
+
+    # spaCy/Presidio load with the DLP engine; embedding weights without inference
+    get_dlp_engine()
+    get_rag_engine().load_models()
+    logger.info("models_preloaded", pid=os.getpid(), workers=workers, metrics_dir=metrics_dir)
+
+    sock = _bind_socket(settings.api_host, settings.api_port)
+    children: Dict[int, float] = {}  # pid -> start time
+    stopping = False
+
+    def stop_workers(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+
+    for _ in range(workers):
+        children[_spawn_worker(app, sock)] = time.monotonic()
+    logger.info("api_workers_started", pids=list(children), host=settings.api_host, port=settings.api_port)
+
+    restart_delay = 0.0
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started_at = children.pop(pid, None)
+        if started_at is None:
+            continue
+        exit_code = os.waitstatus_to_exitcode(status)
+        logger.info("api_worker_exited", pid=pid, exit_code=exit_code)
+        if metrics_dir:
+            # Drop the dead worker's live gauges from /metrics
+            multiprocess.mark_process_dead(pid)
+
+        if stopping:
+            continue
+
+        # Back off while workers keep dying right after start
+        if time.monotonic() - started_at < WORKER_MIN_UPTIME_SECONDS:
+            restart_delay = min(max(1.0, restart_delay * 2), WORKER_MAX_RESTART_DELAY_SECONDS)
+        else:
+            restart_delay = 0.0
+        if restart_delay:
+            time.sleep(restart_delay)
+        if stopping:
+            continue
+
+        new_pid = _spawn_worker(app, sock)
+        children[new_pid] = time.monotonic()
+        logger.warning("api_worker_respawned", pid=new_pid, replaced_pid=pid, exit_code=exit_code)
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    serve()
@@ -43,6 +43,12 @@ class SecuritySettings(BaseSettings):
     # Encryption
     encryption_key: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
 
+    # Prometheus scrape access: bearer token when set, else internal networks only
+    metrics_token: Optional[str] = None
+    metrics_allowed_networks: List[str] = [
+        "127.0.0.0/8", "::1/128", "10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"
+    ]
+
     class Config:
         env_prefix = "SECURITY_"
 
@@ -83,9 +89,35 @@ class LLMSettings(BaseSettings):
     inference_timeout_seconds: int = 300
     embedding_timeout_seconds: int = 60
 
+    # Ollama HTTP Connection Pool: enough keep-alive connections for the
+    # concurrency limit so fan-out reuses connections instead of reconnecting
+    ollama_max_connections: int = 16
+    ollama_max_keepalive_connections: int = 8
+    ollama_keepalive_expiry_seconds: float = 300.0
+    ollama_pool_timeout_seconds: float = 30.0  # Wait for a free connection
+
     # Fallback Model (lighter, faster) - Ollama only
     fallback_model: str = "mistral:7b"
 
+    # Concurrency Limits (max in-flight requests per provider, whole
+    # deployment): each of the API_WORKERS processes gets limit // workers,
+    # which must leave at least one slot beyond the reserved interactive
+    # ones (see DEPLOYMENT_GUIDE.md, LLM Concurrency).
+    # Keep the Ollama limit in line with the server's OLLAMA_NUM_PARALLEL
+    ollama_max_concurrency: int = 8
+    groq_max_concurrency: int = 16
+    openai_max_concurrency: int = 16
+    deepseek_max_concurrency: int = 16
+
+    # Request Scheduler: one admission queue per provider, capped at the
+    # limit above; interactive calls go ahead of batch and background work
+    scheduler_enabled: bool = True
+    scheduler_interactive_reserved_slots: int = 1  # Per worker; slots batch/background never use
+
+    def max_concurrency_for(self, provider: str) -> int:
+        """Get the concurrency limit for a provider"""
+        return getattr(self, f"{provider.lower()}_max_concurrency", 1)
+
     class Config:
         env_prefix = "LLM_"
 
@@ -108,18 +140,49 @@ class RAGSettings(BaseSettings):
     embedding_model: str = "all-MiniLM-L6-v2"
     embedding_dimension: int = 384
 
+    # Embedding Worker Pool (keeps encoding off the event loop)
+    embedding_workers: int = 1
+    embedding_max_queue: int = 64  # Requests admitted beyond busy workers
+    embedding_torch_threads: int = 0  # torch intra-op threads (0 = torch default)
+
+    # Persistent Chunk Embedding Cache (keyed by model + sha256 of chunk)
+    embedding_cache_enabled: bool = True
+    embedding_cache_directory: str = ""  # Default: <chroma_persist_directory>/embedding_cache
+
+    # Query Embedding Micro-Batching (coalesces concurrent retrieve() calls)
+    query_batch_max_size: int = 32
+    query_batch_max_wait_ms: float = 5.0
+
+    # Retrieval Caches
+    query_embedding_cache_max_bytes: int = 67108864  # 64MB of query embeddings
+    retrieval_cache_max_entries: int = 1024  # Invalidated when collections change
+    retrieval_cache_ttl_seconds: float = 30.0  # Bounds staleness after writes by other workers
+
     # Retrieval Settings
     top_k_results: int = 5
     similarity_threshold: float = 0.5  # Minimum threshold (captures Weak matches)
+    collection_query_workers: int = 4  # Concurrent searches per collection
+    collection_query_timeout_seconds: float = 5.0  # Per-collection search budget
+
+    # Context Packing (RAGEngine.query prompt)
+    context_max_tokens: int = 3072  # Upper bound for retrieved context in the prompt
+    # Context is measured with the embedding tokenizer, which undercounts the
+    # chat LLM's tokens: counts are padded by this share and never fall below
+    # UTF-8 bytes / 3 (see rag/context.py)
+    context_token_margin: float = 0.25
 
     # Tiered Similarity Thresholds (ISO 27001 & ECC-2:2024 ML Pipeline)
     strong_match_threshold: float = 0.85   # Controls are likely equivalent
     moderate_match_threshold: float = 0.70  # Related, address similar concepts
     weak_match_threshold: float = 0.50      # Conceptually related, different aspects
 
-    # Chunking Strategy
-    chunk_size: int = 1000
-    chunk_overlap: int = 200
+    # Chunking Strategy (measured in embedding-model tokens)
+    chunk_max_tokens: int = 256  # all-MiniLM-L6-v2 max_seq_length, incl. [CLS]/[SEP]
+    chunk_overlap_tokens: int = 32  # Repeated between chunks of the same section
+
+    # Bulk Indexing
+    embedding_batch_size: int = 256  # Chunks per SentenceTransformer.encode call
+    chroma_add_batch_size: int = 2000  # Chunks per collection.add call
 
     class Config:
         env_prefix = "RAG_"
@@ -198,10 +261,76 @@ class DLPSettings(BaseSettings):
     block_on_detection: bool = False  # Log only by default
     redact_sensitive_data: bool = True
 
+    # Fast Path: skip Presidio/spaCy NER when the regex prefilter finds
+    # nothing suspicious and the text has no capitalized-name candidates
+    fast_path_enabled: bool = True
+
+    # Scan Result Cache: identical text (repeat prompts, chat history) is
+    # analyzed once per settings version
+    scan_cache_enabled: bool = True
+    scan_cache_max_entries: int = 4096
+    scan_cache_ttl_seconds: float = 600.0
+
+    # Batch Scanning (scan_batch): spaCy nlp.pipe batch size
+    batch_size: int = 64
+    dlp_scan_documents: bool = True  # Bulk document ingestion (RAGEngine.add_documents)
+
+    # Streaming Output Scanning
+    stream_lookback_chars: int = 256  # Released text rescanned with new chunks (>= longest pattern)
+    stream_max_holdback_chars: int = 512  # Cap on unreleased text awaiting a complete match
+
     class Config:
         env_prefix = "DLP_"
 
 
+class PolicyMappingSettings(BaseSettings):
+    """Policy Mapping Engine Configuration"""
+
+    # Statement Batching (statements packed into one LLM mapping call)
+    # Set to 1 to map every statement with its own call. Batches are also
+    # capped so each statement keeps statement_output_tokens of the
+    # response within LLM max_tokens (truncated JSON falls back per statement)
+    statement_batch_size: int = Field(default=4, gt=0)
+    statement_output_tokens: int = Field(default=1024, gt=0)
+
+    # Control Pre-filter (embedding shortlist before LLM mapping)
+    # Only the top-k most similar controls per statement are sent to the LLM
+    control_prefilter_enabled: bool = True
+    control_top_k: int = 8
+    control_similarity_floor: float = 0.2
+
+    # Mapping Result Cache (local SQLite, content-addressed)
+    cache_enabled: bool = True
+    cache_path: str = "./data/policy_mapping_cache.sqlite3"
+    cache_ttl_seconds: int = 2592000  # 30 days
+    cache_max_entries: int = 50000
+
+    class Config:
+        env_prefix = "POLICY_MAPPING_"
+
+
+class JobSettings(BaseSettings):
+    """Background Job Configuration (async policy-mapping / SOC-CMM jobs)"""
+
+    # How long finished job results stay retrievable
+    result_ttl_seconds: int = 3600
+
+    # SSE keep-alive interval (keeps reverse proxies from closing idle streams)
+    sse_keepalive_seconds: int = 15
+
+    # Shared job store (local SQLite) so any API worker can serve any job
+    store_path: str = "./data/jobs.sqlite3"
+    stream_poll_seconds: float = 0.5  # Event polling for jobs run by another worker
+
+    # Running jobs refresh a heartbeat; a job whose heartbeat is older than
+    # stale_after_seconds (its worker died or restarted) is marked failed
+    heartbeat_seconds: float = 10.0
+    stale_after_seconds: float = 60.0
+
+    class Config:
+        env_prefix = "JOBS_"
+
+
 class SovereignSettings(BaseSettings):
     """Master Configuration - Sovereign AI Director"""
 
@@ -215,6 +344,8 @@ class SovereignSettings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_workers: int = 4
+    api_warmup: bool = True  # Load and exercise models before serving (health included)
+    api_fast_start: bool = False  # Serve immediately; warm up models in the background
 
     # CORS (Restricted to internal)
     cors_origins: List[str] = ["http://localhost:3001"]
@@ -236,6 +367,8 @@ class SovereignSettings(BaseSettings):
     database: DatabaseSettings = DatabaseSettings()
     audit: AuditSettings = AuditSettings()
     dlp: DLPSettings = DLPSettings()
+    policy_mapping: PolicyMappingSettings = PolicyMappingSettings()
+    jobs: JobSettings = JobSettings()
 
     class Config:
         env_file = ".env"
@@ -9,7 +9,18 @@ from .base_client import (
     EmbeddingResponse,
     SYSTEM_PROMPTS
 )
-from .ollama_client import OllamaClient
+from .ollama_client import OllamaClient, get_ollama_client
+from .concurrency import BoundedExecutor, ProgressCallback, get_provider_executor
+from .scheduler import (
+    LLMScheduler,
+    Priority,
+    ScheduledLLMClient,
+    at_priority,
+    current_priority,
+    get_llm_scheduler,
+    llm_priority,
+    scheduled
+)
 
 import structlog
 
@@ -56,7 +67,7 @@ def get_llm_client() -> BaseLLMClient:
 
     if provider == "groq":
         from .groq_client import GroqClient
-        _llm_client = GroqClient()
+        _llm_client = scheduled(GroqClient())
         logger.info(
             "llm_client_initialized",
             provider="groq",
@@ -66,7 +77,7 @@ def get_llm_client() -> BaseLLMClient:
 
     elif provider == "openai":
         from .openai_client import OpenAIClient
-        _llm_client = OpenAIClient()
+        _llm_client = scheduled(OpenAIClient())
         logger.info(
             "llm_client_initialized",
             provider="openai",
@@ -76,7 +87,7 @@ def get_llm_client() -> BaseLLMClient:
 
     elif provider == "deepseek":
         from .deepseek_client import DeepSeekClient
-        _llm_client = DeepSeekClient()
+        _llm_client = scheduled(DeepSeekClient())
         logger.info(
             "llm_client_initialized",
             provider="deepseek",
@@ -85,7 +96,9 @@ def get_llm_client() -> BaseLLMClient:
         )
 
     elif provider == "ollama":
-        _llm_client = OllamaClient()
+        # Same instance as the legacy Ollama singleton: one connection
+        # pool and one scheduler queue (already scheduled)
+        _llm_client = get_ollama_client()
         logger.info(
             "llm_client_initialized",
             provider="ollama",
@@ -108,18 +121,6 @@ def reset_llm_client():
     _llm_client = None
 
 
-# Legacy: maintain backward compatibility with direct ollama_client import
-# This will be initialized lazily when first accessed
-def _get_ollama_client():
-    """Get Ollama client for backward compatibility"""
-    from .ollama_client import ollama_client
-    return ollama_client
-
-
-# For backward compatibility - modules importing ollama_client directly
-# will get the singleton from ollama_client.py
-from .ollama_client import ollama_client
-
 __all__ = [
     # Base classes
     "BaseLLMClient",
@@ -130,8 +131,20 @@ __all__ = [
     "SYSTEM_PROMPTS",
     # Clients
     "OllamaClient",
+    "get_ollama_client",
     "get_llm_client",
     "reset_llm_client",
-    # Legacy
-    "ollama_client",
+    # Concurrency
+    "BoundedExecutor",
+    "ProgressCallback",
+    "get_provider_executor",
+    # Scheduling
+    "LLMScheduler",
+    "Priority",
+    "ScheduledLLMClient",
+    "at_priority",
+    "current_priority",
+    "get_llm_scheduler",
+    "llm_priority",
+    "scheduled",
 ]
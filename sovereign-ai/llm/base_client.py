@@ -124,6 +124,24 @@ class BaseLLMClient(ABC):
         """
         pass
 
+    async def chat_stream(
+        self,
+        messages: List[LLMMessage],
+        user_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream a multi-turn chat completion
+
+        Providers override this with native streaming; the default
+        yields the complete chat() reply as a single chunk.
+
+        Yields:
+            Chunks of the assistant reply (output DLP applied)
+        """
+        response = await self.chat(messages=messages, user_id=user_id, model=model)
+        yield response.content
+
     @abstractmethod
     async def get_embeddings(
         self,
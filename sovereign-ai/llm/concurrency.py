@@ -0,0 +1,129 @@
+"""
+Sovereign AI - LLM Concurrency Control
+Bounded-concurrency execution of LLM calls with per-provider limits
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import structlog
+
+from config.settings import get_settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# Async callback for reporting partial results of fanned-out jobs:
+# progress_callback(event_name, payload)
+ProgressCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class BoundedExecutor:
+    """
+    Runs LLM calls concurrently under a semaphore
+    Results are returned in input order regardless of completion order
+
+    With max_concurrency=None calls are not gated here: they go straight
+    to a scheduled client, whose LLMScheduler admits them by priority and
+    user. A FIFO semaphore in front of it would decide the order instead.
+    """
+
+    def __init__(self, max_concurrency: Optional[int], name: str = "llm"):
+        self.max_concurrency = max(1, max_concurrency) if max_concurrency is not None else None
+        self.name = name
+        self._semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+
+    async def _run_one(
+        self,
+        call: Callable[[], Awaitable[T]],
+        label: str
+    ) -> T:
+        """Run a single call once a slot is free and log its timings"""
+        queued_at = time.time()
+
+        async with self._semaphore or contextlib.nullcontext():
+            started_at = time.time()
+            try:
+                return await call()
+            finally:
+                finished_at = time.time()
+                logger.info(
+                    "llm_call_timing",
+                    executor=self.name,
+                    label=label,
+                    queue_wait_ms=(started_at - queued_at) * 1000,
+                    latency_ms=(finished_at - started_at) * 1000,
+                    max_concurrency=self.max_concurrency
+                )
+
+    async def map(
+        self,
+        calls: Sequence[Callable[[], Awaitable[T]]],
+        labels: Optional[Sequence[str]] = None
+    ) -> List[T]:
+        """
+        Execute calls with bounded concurrency
+
+        Args:
+            calls: Zero-argument coroutine factories
+            labels: Optional per-call labels for timing logs
+
+        Returns:
+            Results in the same order as calls
+        """
+        if labels is None:
+            labels = [str(i) for i in range(len(calls))]
+
+        return list(await asyncio.gather(*[
+            self._run_one(call, label)
+            for call, label in zip(calls, labels)
+        ]))
+
+
+def worker_concurrency(provider: str) -> int:
+    """
+    Share of a provider's concurrency limit available to this process
+
+    The configured limits are for the whole deployment (they match the
+    backend's capacity, e.g. OLLAMA_NUM_PARALLEL), but every API worker
+    process enforces its own. Each worker gets limit // api_workers, at
+    least one slot.
+
+    Args:
+        provider: Provider name (ollama, groq, openai, deepseek)
+
+    Returns:
+        Maximum in-flight calls for this process
+    """
+    settings = get_settings()
+    return max(1, settings.llm.max_concurrency_for(provider) // max(1, settings.api_workers))
+
+
+# Shared executors, one per provider, so the limit holds across requests
+_executors: Dict[str, BoundedExecutor] = {}
+
+
+def get_provider_executor(provider: str) -> BoundedExecutor:
+    """
+    Get the shared bounded executor for an LLM provider
+
+    Args:
+        provider: Provider name (ollama, groq, openai, deepseek)
+
+    Returns:
+        BoundedExecutor sized by this worker's share of the provider's
+        limit, or ungated when the LLM scheduler enforces that limit
+    """
+    provider = provider.lower()
+
+    if provider not in _executors:
+        settings = get_settings()
+        _executors[provider] = BoundedExecutor(
+            max_concurrency=None if settings.llm.scheduler_enabled else worker_concurrency(provider),
+            name=provider
+        )
+
+    return _executors[provider]
@@ -104,7 +104,8 @@ class DeepSeekClient(BaseLLMClient):
         start_time = time.time()
 
         # DLP scanning
-        from security.dlp import dlp_engine
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
 
         if self.settings.dlp.dlp_scan_inputs:
             sanitized_prompt, was_blocked = dlp_engine.scan_prompt(
@@ -177,7 +178,8 @@ class DeepSeekClient(BaseLLMClient):
     ) -> AsyncGenerator[str, None]:
         """Stream generation from DeepSeek"""
         # DLP scan input
-        from security.dlp import dlp_engine
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
 
         if self.settings.dlp.dlp_scan_inputs:
             sanitized_prompt, _ = dlp_engine.scan_prompt(
@@ -191,7 +193,7 @@ class DeepSeekClient(BaseLLMClient):
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        try:
+        async def deltas() -> AsyncGenerator[str, None]:
             stream = await self.client.chat.completions.create(
                 model=model or self.model,
                 messages=messages,
@@ -199,11 +201,19 @@ class DeepSeekClient(BaseLLMClient):
                 max_tokens=self.settings.llm.max_tokens,
                 stream=True
             )
-
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
+        try:
+            chunks = deltas()
+            # DLP scan output incrementally
+            if self.settings.dlp.dlp_scan_outputs:
+                chunks = dlp_engine.scan_output_stream(chunks, user_id or "anonymous")
+
+            async for chunk in chunks:
+                yield chunk
+
         except Exception as e:
             logger.error("deepseek_stream_error", error=str(e))
             raise
@@ -217,7 +227,8 @@ class DeepSeekClient(BaseLLMClient):
         """Multi-turn chat completion using DeepSeek"""
         start_time = time.time()
 
-        from security.dlp import dlp_engine
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
 
         # DLP scan user messages
         scanned_messages = []
@@ -270,6 +281,50 @@ class DeepSeekClient(BaseLLMClient):
             logger.error("deepseek_chat_error", error=str(e))
             raise
 
+    async def chat_stream(
+        self,
+        messages: List[LLMMessage],
+        user_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream a multi-turn chat completion from DeepSeek"""
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
+
+        # DLP scan user messages
+        deepseek_messages = []
+        for msg in messages:
+            content = msg.content
+            if msg.role == LLMRole.USER and self.settings.dlp.dlp_scan_inputs:
+                content, _ = dlp_engine.scan_prompt(content, user_id or "anonymous")
+            deepseek_messages.append({"role": msg.role.value, "content": content})
+
+        async def deltas() -> AsyncGenerator[str, None]:
+            stream = await self.client.chat.completions.create(
+                model=model or self.model,
+                messages=deepseek_messages,
+                temperature=self.settings.llm.temperature,
+                max_tokens=self.settings.llm.max_tokens,
+                top_p=self.settings.llm.top_p,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        try:
+            chunks = deltas()
+            # DLP scan output incrementally
+            if self.settings.dlp.dlp_scan_outputs:
+                chunks = dlp_engine.scan_output_stream(chunks, user_id or "anonymous")
+
+            async for chunk in chunks:
+                yield chunk
+
+        except Exception as e:
+            logger.error("deepseek_chat_stream_error", error=str(e))
+            raise
+
     async def get_embeddings(
         self,
         text: str,
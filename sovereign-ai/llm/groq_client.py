@@ -98,7 +98,8 @@ class GroqClient(BaseLLMClient):
         start_time = time.time()
 
         # DLP scanning (import here to avoid circular imports)
-        from security.dlp import dlp_engine
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
 
         if self.settings.dlp.dlp_scan_inputs:
             sanitized_prompt, was_blocked = dlp_engine.scan_prompt(
@@ -171,7 +172,8 @@ class GroqClient(BaseLLMClient):
     ) -> AsyncGenerator[str, None]:
         """Stream generation from Groq"""
         # DLP scan input
-        from security.dlp import dlp_engine
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
 
         if self.settings.dlp.dlp_scan_inputs:
             sanitized_prompt, _ = dlp_engine.scan_prompt(
@@ -185,7 +187,7 @@ class GroqClient(BaseLLMClient):
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
-        try:
+        async def deltas() -> AsyncGenerator[str, None]:
             stream = await self.client.chat.completions.create(
                 model=model or self.model,
                 messages=messages,
@@ -193,11 +195,19 @@ class GroqClient(BaseLLMClient):
                 max_tokens=self.settings.llm.max_tokens,
                 stream=True
             )
-
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
+                if chunk.choices and chunk.choices[0].delta.content:
                     yield chunk.choices[0].delta.content
 
+        try:
+            chunks = deltas()
+            # DLP scan output incrementally
+            if self.settings.dlp.dlp_scan_outputs:
+                chunks = dlp_engine.scan_output_stream(chunks, user_id or "anonymous")
+
+            async for chunk in chunks:
+                yield chunk
+
         except Exception as e:
             logger.error("groq_stream_error", error=str(e))
             raise
@@ -211,7 +221,8 @@ class GroqClient(BaseLLMClient):
         """Multi-turn chat completion using Groq"""
         start_time = time.time()
 
-        from security.dlp import dlp_engine
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
 
         # DLP scan user messages
         scanned_messages = []
@@ -264,6 +275,50 @@ class GroqClient(BaseLLMClient):
             logger.error("groq_chat_error", error=str(e))
             raise
 
+    async def chat_stream(
+        self,
+        messages: List[LLMMessage],
+        user_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream a multi-turn chat completion from Groq"""
+        from security.dlp import get_dlp_engine
+        dlp_engine = get_dlp_engine()
+
+        # DLP scan user messages
+        groq_messages = []
+        for msg in messages:
+            content = msg.content
+            if msg.role == LLMRole.USER and self.settings.dlp.dlp_scan_inputs:
+                content, _ = dlp_engine.scan_prompt(content, user_id or "anonymous")
+            groq_messages.append({"role": msg.role.value, "content": content})
+
+        async def deltas() -> AsyncGenerator[str, None]:
+            stream = await self.client.chat.completions.create(
+                model=model or self.model,
+                messages=groq_messages,
+                temperature=self.settings.llm.temperature,
+                max_tokens=self.settings.llm.max_tokens,
+                top_p=self.settings.llm.top_p,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        try:
+            chunks = deltas()
+            # DLP scan output incrementally
+            if self.settings.dlp.dlp_scan_outputs:
+                chunks = dlp_engine.scan_output_stream(chunks, user_id or "anonymous")
+
+            async for chunk in chunks:
+                yield chunk
+
+        except Exception as e:
+            logger.error("groq_chat_stream_error", error=str(e))
+            raise
+
     async def get_embeddings(
         self,
         text: str,
@@ -13,10 +13,12 @@ import httpx
 import structlog
 
 from config.settings import get_settings
-from security.dlp import dlp_engine
+from security.dlp import get_dlp_engine
 from .base_client import (
     BaseLLMClient, LLMMessage, LLMRole, LLMResponse, EmbeddingResponse, SYSTEM_PROMPTS
 )
+from .scheduler import scheduled
+from .transport import InstrumentedTransport
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -35,13 +37,23 @@ class OllamaClient(BaseLLMClient):
         # Verify no external endpoints
         self._validate_local_endpoint()
 
+        # Pooled keep-alive connections (Ollama speaks HTTP/1.1 only)
+        llm_settings = self.settings.llm
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             timeout=httpx.Timeout(
                 connect=10.0,
-                read=self.settings.llm.inference_timeout_seconds,
+                read=llm_settings.inference_timeout_seconds,
                 write=10.0,
-                pool=5.0
+                pool=llm_settings.ollama_pool_timeout_seconds
+            ),
+            transport=InstrumentedTransport(
+                provider="ollama",
+                limits=httpx.Limits(
+                    max_connections=llm_settings.ollama_max_connections,
+                    max_keepalive_connections=llm_settings.ollama_max_keepalive_connections,
+                    keepalive_expiry=llm_settings.ollama_keepalive_expiry_seconds
+                )
             )
         )
 
@@ -153,7 +165,7 @@ class OllamaClient(BaseLLMClient):
 
         # DLP scan input prompt
         if self.settings.dlp.dlp_scan_inputs:
-            sanitized_prompt, was_blocked = dlp_engine.scan_prompt(
+            sanitized_prompt, was_blocked = get_dlp_engine().scan_prompt(
                 prompt, user_id or "anonymous"
             )
             if was_blocked and self.settings.dlp.block_on_detection:
@@ -191,7 +203,7 @@ class OllamaClient(BaseLLMClient):
 
             # DLP scan output
             if self.settings.dlp.dlp_scan_outputs:
-                content, had_findings = dlp_engine.scan_output(
+                content, had_findings = get_dlp_engine().scan_output(
                     content, user_id or "anonymous"
                 )
                 if had_findings:
@@ -242,11 +254,11 @@ class OllamaClient(BaseLLMClient):
         Stream generation from private LLM
 
         Yields:
-            Chunks of generated text
+            Chunks of generated text (output DLP applied)
         """
         # DLP scan input
         if self.settings.dlp.dlp_scan_inputs:
-            sanitized_prompt, _ = dlp_engine.scan_prompt(
+            sanitized_prompt, _ = get_dlp_engine().scan_prompt(
                 prompt, user_id or "anonymous"
             )
             prompt = sanitized_prompt
@@ -264,7 +276,7 @@ class OllamaClient(BaseLLMClient):
         if system_prompt:
             request_body["system"] = system_prompt
 
-        try:
+        async def deltas() -> AsyncGenerator[str, None]:
             async with self.client.stream(
                 "POST",
                 "/api/generate",
@@ -277,6 +289,15 @@ class OllamaClient(BaseLLMClient):
                         if chunk:
                             yield chunk
 
+        try:
+            chunks = deltas()
+            # DLP scan output incrementally
+            if self.settings.dlp.dlp_scan_outputs:
+                chunks = get_dlp_engine().scan_output_stream(chunks, user_id or "anonymous")
+
+            async for chunk in chunks:
+                yield chunk
+
         except Exception as e:
             logger.error("llm_stream_error", error=str(e))
             raise
@@ -305,7 +326,7 @@ class OllamaClient(BaseLLMClient):
         scanned_messages = []
         for msg in messages:
             if msg.role == LLMRole.USER and self.settings.dlp.dlp_scan_inputs:
-                sanitized, _ = dlp_engine.scan_prompt(
+                sanitized, _ = get_dlp_engine().scan_prompt(
                     msg.content, user_id or "anonymous"
                 )
                 scanned_messages.append(LLMMessage(role=msg.role, content=sanitized))
@@ -338,7 +359,7 @@ class OllamaClient(BaseLLMClient):
 
             # DLP scan output
             if self.settings.dlp.dlp_scan_outputs:
-                content, had_findings = dlp_engine.scan_output(
+                content, had_findings = get_dlp_engine().scan_output(
                     content, user_id or "anonymous"
                 )
                 filtered = had_findings
@@ -358,6 +379,74 @@ class OllamaClient(BaseLLMClient):
             logger.error("llm_chat_error", error=str(e))
             raise
 
+    async def chat_stream(
+        self,
+        messages: List[LLMMessage],
+        user_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream a multi-turn chat completion
+
+        Args:
+            messages: List of chat messages
+            user_id: User ID for audit
+            model: Model to use
+
+        Yields:
+            Chunks of the assistant reply (output DLP applied)
+        """
+        # DLP scan all user messages
+        scanned_messages = []
+        for msg in messages:
+            if msg.role == LLMRole.USER and self.settings.dlp.dlp_scan_inputs:
+                sanitized, _ = get_dlp_engine().scan_prompt(
+                    msg.content, user_id or "anonymous"
+                )
+                scanned_messages.append(LLMMessage(role=msg.role, content=sanitized))
+            else:
+                scanned_messages.append(msg)
+
+        request_body = {
+            "model": model or self.settings.llm.ollama_model,
+            "messages": [
+                {"role": m.role.value, "content": m.content}
+                for m in scanned_messages
+            ],
+            "stream": True,
+            "options": {
+                "temperature": self.settings.llm.temperature,
+                "num_predict": self.settings.llm.max_tokens,
+            }
+        }
+
+        async def deltas() -> AsyncGenerator[str, None]:
+            async with self.client.stream(
+                "POST",
+                "/api/chat",
+                json=request_body
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line:
+                        data = json.loads(line)
+                        chunk = data.get("message", {}).get("content", "")
+                        if chunk:
+                            yield chunk
+
+        try:
+            chunks = deltas()
+            # DLP scan output incrementally
+            if self.settings.dlp.dlp_scan_outputs:
+                chunks = get_dlp_engine().scan_output_stream(chunks, user_id or "anonymous")
+
+            async for chunk in chunks:
+                yield chunk
+
+        except Exception as e:
+            logger.error("llm_chat_stream_error", error=str(e))
+            raise
+
     async def get_embeddings(
         self,
         text: str,
@@ -415,5 +504,20 @@ class OllamaClient(BaseLLMClient):
 # (Now defined in base_client.py)
 
 
-# Singleton instance
-ollama_client = OllamaClient()
+# Singleton instance (built on first use)
+_ollama_client: Optional[BaseLLMClient] = None
+
+
+def get_ollama_client() -> BaseLLMClient:
+    """Get the shared Ollama client (behind the Ollama request scheduler)"""
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = scheduled(OllamaClient())
+    return _ollama_client
+
+
+def __getattr__(name: str):
+    # Legacy module attribute: `from llm.ollama_client import ollama_client`
+    if name == "ollama_client":
+        return get_ollama_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,381 @@
+"""
+Sovereign AI - LLM Request Scheduler
+Priority lanes, per-user fair queuing and a global concurrency cap in
+front of each LLM provider
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import (
+    Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+)
+
+import structlog
+
+from config.settings import get_settings
+from monitoring.metrics import LLM_SCHEDULER_QUEUE_DEPTH, LLM_SCHEDULER_WAIT_SECONDS, LLM_SCHEDULER_ACTIVE
+from .base_client import BaseLLMClient, LLMMessage, LLMResponse, EmbeddingResponse
+from .concurrency import worker_concurrency
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+ANONYMOUS_USER = "anonymous"
+
+
+class Priority(str, Enum):
+    """Scheduling class of an LLM call, most urgent first"""
+    INTERACTIVE = "interactive"  # A user is waiting on the response (chat, RAG query)
+    BATCH = "batch"              # Multi-call analysis requested synchronously
+    BACKGROUND = "background"    # Background jobs
+
+
+LANES: List[Priority] = [Priority.INTERACTIVE, Priority.BATCH, Priority.BACKGROUND]
+
+_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    """Priority of LLM calls made in the current context"""
+    return _priority.get()
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[Priority]:
+    """
+    Lower the priority of LLM calls made in this context
+
+    The setting follows the context into awaited coroutines and tasks
+    created inside it. It never raises priority: batch analysis run from a
+    background job stays in the background lane.
+
+    Args:
+        priority: Requested priority
+
+    Yields:
+        The effective priority
+    """
+    effective = max(priority, current_priority(), key=LANES.index)
+    token = _priority.set(effective)
+    try:
+        yield effective
+    finally:
+        _priority.reset(token)
+
+
+def at_priority(priority: Priority) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator running a coroutine function under llm_priority(priority)"""
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            with llm_priority(priority):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class LLMScheduler:
+    """
+    Admission control for one LLM backend
+
+    At most max_concurrency calls run at once. Waiting calls are admitted
+    strictly by lane (interactive, then batch, then background) and
+    round-robin across users within a lane, so one user's large job cannot
+    hold every slot. The reserved interactive slots are never given to
+    batch or background calls, so a chat does not queue behind a full set
+    of long analysis generations.
+    """
+
+    def __init__(self, max_concurrency: int, name: str = "llm", reserved_interactive_slots: int = 0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.name = name
+        # Always leave at least one slot for non-interactive work
+        self.reserved_interactive_slots = min(max(0, reserved_interactive_slots), self.max_concurrency - 1)
+        self._active = 0
+        # priority -> user -> waiters in arrival order
+        self._lanes: Dict[Priority, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in LANES
+        }
+
+    @property
+    def active(self) -> int:
+        """Calls currently holding a slot"""
+        return self._active
+
+    def queued(self, priority: Optional[Priority] = None) -> int:
+        """Calls waiting for a slot, in one lane or in all"""
+        lanes = [priority] if priority else LANES
+        return sum(len(queue) for lane in lanes for queue in self._lanes[lane].values())
+
+    def _limit(self, priority: Priority) -> int:
+        """Slots a call of this priority may use"""
+        if priority == Priority.INTERACTIVE:
+            return self.max_concurrency
+        return self.max_concurrency - self.reserved_interactive_slots
+
+    def _must_wait(self, priority: Priority) -> bool:
+        """Whether a new call has to queue (no free slot, or earlier calls of equal or higher priority wait)"""
+        if self._active >= self._limit(priority):
+            return True
+        return any(self._lanes[lane] for lane in LANES[:LANES.index(priority) + 1])
+
+    def _acquire(self):
+        self._active += 1
+        LLM_SCHEDULER_ACTIVE.labels(provider=self.name).set(self._active)
+
+    def _release(self):
+        self._active -= 1
+        LLM_SCHEDULER_ACTIVE.labels(provider=self.name).set(self._active)
+        self._dispatch()
+
+    def _dispatch(self):
+        """Hand free slots to waiters: highest lane first, round-robin across users"""
+        for priority in LANES:
+            lane = self._lanes[priority]
+            while lane and self._active < self._limit(priority):
+                user, queue = next(iter(lane.items()))
+                future = queue.popleft()
+                if queue:
+                    lane.move_to_end(user)
+                else:
+                    del lane[user]
+
+                self._acquire()
+                future.set_result(None)
+                LLM_SCHEDULER_QUEUE_DEPTH.labels(provider=self.name, priority=priority.value).dec()
+
+    async def _wait(self, priority: Priority, user_id: str):
+        """Queue until _dispatch grants a slot"""
+        future = asyncio.get_running_loop().create_future()
+        self._lanes[priority].setdefault(user_id, deque()).append(future)
+        depth = LLM_SCHEDULER_QUEUE_DEPTH.labels(provider=self.name, priority=priority.value)
+        depth.inc()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted a slot just as we were cancelled: pass it on
+                self._release()
+            else:
+                lane = self._lanes[priority]
+                queue = lane.get(user_id)
+                if queue is not None and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del lane[user_id]
+                depth.dec()
+            raise
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[Priority] = None,
+        user_id: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold one of the backend's slots for the duration of the block
+
+        Args:
+            priority: Scheduling class (defaults to the context's llm_priority)
+            user_id: User the call is made for (fair queuing key)
+        """
+        priority = priority or current_priority()
+        queued_at = time.perf_counter()
+
+        if self._must_wait(priority):
+            await self._wait(priority, user_id or ANONYMOUS_USER)
+        else:
+            self._acquire()
+
+        LLM_SCHEDULER_WAIT_SECONDS.labels(provider=self.name, priority=priority.value).observe(
+            time.perf_counter() - queued_at
+        )
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        priority: Optional[Priority] = None,
+        user_id: Optional[str] = None
+    ) -> T:
+        """
+        Run a call once the scheduler admits it
+
+        Args:
+            call: Zero-argument coroutine factory
+            priority: Scheduling class (defaults to the context's llm_priority)
+            user_id: User the call is made for
+
+        Returns:
+            The call's result
+        """
+        async with self.slot(priority=priority, user_id=user_id):
+            return await call()
+
+
+class ScheduledLLMClient(BaseLLMClient):
+    """
+    LLM client that admits every inference call through an LLMScheduler
+    Streams hold their slot until fully consumed; other attributes
+    (list_models, base_url, ...) are delegated to the wrapped client
+    """
+
+    def __init__(self, client: BaseLLMClient, scheduler: LLMScheduler):
+        self._wrapped = client
+        self._scheduler = scheduler
+
+    def __getattr__(self, name: str) -> Any:
+        wrapped = self.__dict__.get("_wrapped")
+        if wrapped is None:
+            raise AttributeError(name)
+        return getattr(wrapped, name)
+
+    @property
+    def wrapped(self) -> BaseLLMClient:
+        return self._wrapped
+
+    @property
+    def scheduler(self) -> LLMScheduler:
+        return self._scheduler
+
+    async def health_check(self) -> bool:
+        return await self._wrapped.health_check()
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        user_id: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stream: bool = False
+    ) -> LLMResponse:
+        async with self._scheduler.slot(user_id=user_id):
+            return await self._wrapped.generate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                user_id=user_id,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=stream
+            )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        user_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        async with self._scheduler.slot(user_id=user_id):
+            async for chunk in self._wrapped.generate_stream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                user_id=user_id,
+                model=model
+            ):
+                yield chunk
+
+    async def chat(
+        self,
+        messages: List[LLMMessage],
+        user_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> LLMResponse:
+        async with self._scheduler.slot(user_id=user_id):
+            return await self._wrapped.chat(messages=messages, user_id=user_id, model=model)
+
+    async def chat_stream(
+        self,
+        messages: List[LLMMessage],
+        user_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        async with self._scheduler.slot(user_id=user_id):
+            async for chunk in self._wrapped.chat_stream(messages=messages, user_id=user_id, model=model):
+                yield chunk
+
+    async def get_embeddings(
+        self,
+        text: str,
+        model: Optional[str] = None
+    ) -> EmbeddingResponse:
+        async with self._scheduler.slot():
+            return await self._wrapped.get_embeddings(text=text, model=model)
+
+    async def close(self):
+        await self._wrapped.close()
+
+    def get_provider_name(self) -> str:
+        return self._wrapped.get_provider_name()
+
+
+# Shared schedulers, one per provider, so the cap holds across all callers
+_schedulers: Dict[str, LLMScheduler] = {}
+
+
+def get_llm_scheduler(provider: str) -> LLMScheduler:
+    """
+    Get the shared scheduler for an LLM provider
+
+    Args:
+        provider: Provider name (ollama, groq, openai, deepseek)
+
+    Returns:
+        LLMScheduler capped at this worker's share of the provider's limit
+    """
+    provider = provider.lower()
+
+    if provider not in _schedulers:
+        settings = get_settings()
+        _schedulers[provider] = LLMScheduler(
+            max_concurrency=worker_concurrency(provider),
+            name=provider,
+            reserved_interactive_slots=settings.llm.scheduler_interactive_reserved_slots
+        )
+        requested = settings.llm.scheduler_interactive_reserved_slots
+        if _schedulers[provider].reserved_interactive_slots < requested:
+            logger.warning(
+                "llm_scheduler_reservation_clamped",
+                provider=provider,
+                max_concurrency=_schedulers[provider].max_concurrency,
+                requested_reserved_slots=requested,
+                reserved_interactive_slots=_schedulers[provider].reserved_interactive_slots,
+                message="Worker share too small to reserve interactive slots; raise the provider limit"
+            )
+        logger.info(
+            "llm_scheduler_initialized",
+            provider=provider,
+            max_concurrency=_schedulers[provider].max_concurrency,
+            reserved_interactive_slots=_schedulers[provider].reserved_interactive_slots
+        )
+
+    return _schedulers[provider]
+
+
+def scheduled(client: BaseLLMClient) -> BaseLLMClient:
+    """
+    Put a client behind its provider's shared scheduler
+
+    Args:
+        client: Provider client
+
+    Returns:
+        ScheduledLLMClient, or the client itself if the scheduler is disabled
+    """
+    if not get_settings().llm.scheduler_enabled or isinstance(client, ScheduledLLMClient):
+        return client
+    return ScheduledLLMClient(client, get_llm_scheduler(client.get_provider_name()))
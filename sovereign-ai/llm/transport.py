@@ -0,0 +1,50 @@
+"""
+Sovereign AI - LLM HTTP Transport
+Connection-pool instrumentation for the LLM HTTP clients
+"""
+
+import time
+from typing import Any, Dict
+
+import httpx
+
+from monitoring.metrics import LLM_POOL_WAIT_SECONDS, LLM_CONNECTIONS
+
+# First httpcore trace event of a request once it holds a connection:
+# a TCP connect for a new connection, the request headers for a reused one
+NEW_CONNECTION_EVENT = "connection.connect_tcp.started"
+SEND_HEADERS_EVENT_SUFFIX = ".send_request_headers.started"
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    AsyncHTTPTransport that records connection pool wait time and whether
+    each request opened a new connection or reused a keep-alive one
+    """
+
+    def __init__(self, provider: str, **kwargs):
+        super().__init__(**kwargs)
+        self.provider = provider
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = time.perf_counter()
+        acquired = False
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            nonlocal acquired
+            if acquired:
+                return
+
+            if event_name == NEW_CONNECTION_EVENT:
+                connection = "new"
+            elif event_name.endswith(SEND_HEADERS_EVENT_SUFFIX):
+                connection = "reused"
+            else:
+                return
+
+            acquired = True
+            LLM_POOL_WAIT_SECONDS.labels(provider=self.provider).observe(time.perf_counter() - started_at)
+            LLM_CONNECTIONS.labels(provider=self.provider, connection=connection).inc()
+
+        request.extensions = {**request.extensions, "trace": trace}
+        return await super().handle_async_request(request)
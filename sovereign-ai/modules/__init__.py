@@ -1,13 +1,13 @@
 # AI Director Modules
-from .policy_mapper import PolicyMappingEngine, policy_mapper, ComplianceFramework
-from .soc_cmm_analyzer import SOCCMMAnalyzer, soc_cmm_analyzer, SOCCMMDomain, MaturityLevel, Evidence
+from .policy_mapper import PolicyMappingEngine, get_policy_mapper, ComplianceFramework
+from .soc_cmm_analyzer import SOCCMMAnalyzer, get_soc_cmm_analyzer, SOCCMMDomain, MaturityLevel, Evidence
 
 __all__ = [
     "PolicyMappingEngine",
-    "policy_mapper",
+    "get_policy_mapper",
     "ComplianceFramework",
     "SOCCMMAnalyzer",
-    "soc_cmm_analyzer",
+    "get_soc_cmm_analyzer",
     "SOCCMMDomain",
     "MaturityLevel",
     "Evidence",
@@ -0,0 +1,197 @@
+"""
+Sovereign AI - Policy Mapping Cache
+Disk-backed, content-addressed cache of LLM policy mapping results
+Stored in a local SQLite file - no external cache services
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+# Keys per SELECT ... IN (...) (below SQLite's bound-parameter limit)
+LOOKUP_CHUNK_SIZE = 500
+
+
+class MappingCache:
+    """
+    SQLite cache for statement-to-framework mapping results
+    Entries expire after a TTL and are evicted least-recently-used
+    once the cache exceeds its maximum size
+
+    The database runs in WAL mode so API workers can share it. Reads and
+    writes are batched per analysis; access times from reads are kept in
+    memory and written with the next write, and the size limit is
+    enforced every evict_interval inserts rather than on each write.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int, evict_interval: int = 256):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.evict_interval = max(1, evict_interval)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._inserts_since_evict = 0
+
+    @staticmethod
+    def make_key(
+        statement_content: str,
+        framework: str,
+        catalogue_version: str,
+        model: str,
+        temperature: float,
+        control_top_k: Optional[int] = None,
+        similarity_floor: Optional[float] = None
+    ) -> str:
+        """Build the content-addressed key for a mapping request (shortlist settings when the prompt was prefiltered)"""
+        material = json.dumps(
+            [statement_content, framework, catalogue_version, model, temperature, control_top_k, similarity_floor]
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS mapping_cache ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "last_accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_mapping_cache_last_accessed "
+                "ON mapping_cache(last_accessed)"
+            )
+            self._conn.commit()
+            logger.info("mapping_cache_opened", path=self.path)
+
+        return self._conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get cached mapping items for several keys in one read
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Items per key found and not expired (misses are omitted)
+        """
+        now = time.time()
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                for offset in range(0, len(unique_keys), LOOKUP_CHUNK_SIZE):
+                    chunk = unique_keys[offset:offset + LOOKUP_CHUNK_SIZE]
+                    rows = conn.execute(
+                        "SELECT key, value, created_at FROM mapping_cache "
+                        f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+
+                    for key, value, created_at in rows:
+                        # Expired rows are removed by the next eviction
+                        if now - created_at <= self.ttl_seconds:
+                            found[key] = json.loads(value)
+                            self._touched[key] = now
+
+            return found
+
+        except Exception as e:
+            logger.error("mapping_cache_read_failed", error=str(e))
+            return {}
+
+    def set_many(self, entries: Dict[str, List[Dict[str, Any]]]):
+        """
+        Store mapping items for several keys in one transaction
+
+        Also writes pending access times and, every evict_interval
+        inserts, removes expired and least-recently-used overflow entries.
+
+        Args:
+            entries: Items per cache key
+        """
+        now = time.time()
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                touched, self._touched = self._touched, {}
+
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO mapping_cache "
+                        "(key, value, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                        [(key, json.dumps(items), now, now) for key, items in entries.items()]
+                    )
+                    conn.executemany(
+                        "UPDATE mapping_cache SET last_accessed = MAX(last_accessed, ?) WHERE key = ?",
+                        [(accessed, key) for key, accessed in touched.items() if key not in entries]
+                    )
+
+                    self._inserts_since_evict += len(entries)
+                    if self._inserts_since_evict >= self.evict_interval:
+                        self._inserts_since_evict = 0
+                        self._evict(conn, now)
+
+        except Exception as e:
+            logger.error("mapping_cache_write_failed", error=str(e))
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Delete expired entries, then least-recently-used overflow"""
+        expired = conn.execute(
+            "DELETE FROM mapping_cache WHERE created_at < ?",
+            (now - self.ttl_seconds,)
+        ).rowcount
+
+        count = conn.execute("SELECT COUNT(*) FROM mapping_cache").fetchone()[0]
+        overflow = max(0, count - self.max_entries)
+        if overflow:
+            conn.execute(
+                "DELETE FROM mapping_cache WHERE key IN ("
+                "SELECT key FROM mapping_cache "
+                "ORDER BY last_accessed ASC LIMIT ?)",
+                (overflow,)
+            )
+
+        if expired or overflow:
+            logger.info("mapping_cache_evicted", expired=expired, overflow=overflow, entries=count - overflow)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get cached mapping items, or None on miss/expiry"""
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, items: List[Dict[str, Any]]):
+        """Store mapping items"""
+        self.set_many({key: items})
+
+    def close(self):
+        """Write pending access times and close the cache database"""
+        if self._touched:
+            self.set_many({})
+
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -5,22 +5,31 @@ Supports NCA ECC, NIST CSF, ISO 27001, SOC 2, CIS Controls
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, field
+import functools
+import hashlib
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
 import json
 import re
 
+import numpy as np
 import structlog
 
 from config.settings import get_settings
-from llm.ollama_client import ollama_client, SYSTEM_PROMPTS, LLMMessage, LLMRole
-from rag.engine import rag_engine, DocumentType
+from llm.ollama_client import get_ollama_client, SYSTEM_PROMPTS, LLMMessage, LLMRole
+from llm.concurrency import get_provider_executor, worker_concurrency, ProgressCallback
+from llm.scheduler import Priority, at_priority
+from modules.mapping_cache import MappingCache
+from rag.engine import get_rag_engine, DocumentType
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Low temperature for consistent (and therefore cacheable) mappings
+MAPPING_TEMPERATURE = 0.1
+
 
 class ComplianceFramework(str, Enum):
     """Supported compliance frameworks"""
@@ -283,7 +292,19 @@ class PolicyMappingEngine:
             ComplianceFramework.NCA_ECC: NCA_ECC_CONTROLS,
             ComplianceFramework.NIST_CSF: NIST_CSF_CONTROLS,
         }
-
+        # Normalized control embeddings per framework (built on first use)
+        self._control_index: Dict[ComplianceFramework, Tuple[List[str], np.ndarray]] = {}
+        self._catalogue_versions: Dict[ComplianceFramework, str] = {}
+
+        # Persistent cache of mapping results, keyed by content
+        mapping_settings = self.settings.policy_mapping
+        self.cache = MappingCache(
+            path=mapping_settings.cache_path,
+            ttl_seconds=mapping_settings.cache_ttl_seconds,
+            max_entries=mapping_settings.cache_max_entries
+        ) if mapping_settings.cache_enabled else None
+
+    @at_priority(Priority.BATCH)
     async def analyze_policy(
         self,
         policy_id: str,
@@ -291,7 +312,8 @@ class PolicyMappingEngine:
         policy_content: str,
         statements: List[Dict[str, str]],
         target_frameworks: List[ComplianceFramework],
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> PolicyAnalysisResult:
         """
         Analyze a policy and map to compliance frameworks
@@ -303,6 +325,8 @@ class PolicyMappingEngine:
             statements: List of policy statements
             target_frameworks: Frameworks to map against
             user_id: User performing analysis
+            progress_callback: Receives a "statement_mapped" event as each
+                statement's mappings for a framework become available
 
         Returns:
             PolicyAnalysisResult with mappings and recommendations
@@ -314,24 +338,107 @@ class PolicyMappingEngine:
         all_gaps: List[Dict[str, Any]] = []
         all_recommendations: List[str] = []
 
-        # Analyze each statement against each framework
-        for statement in statements:
-            stmt_id = statement.get("id", statement.get("code", ""))
-            stmt_content = statement.get("content", "")
-
-            for framework in target_frameworks:
-                framework_controls = self.frameworks.get(framework, {})
+        # Normalize statements to (id, content) pairs
+        statement_pairs = [
+            (stmt.get("id", stmt.get("code", "")), stmt.get("content", ""))
+            for stmt in statements
+        ]
 
-                # Use AI to find relevant controls
-                relevant_mappings = await self._map_statement_to_framework(
-                    statement_id=stmt_id,
-                    statement_content=stmt_content,
+        # Serve unchanged statements from the mapping cache (one batched
+        # read off the event loop)
+        framework_results: Dict[Tuple[int, ComplianceFramework], List[PolicyMapping]] = {}
+        # Results of this analysis awaiting the end-of-analysis cache write
+        cache_pending: Dict[str, List[Dict[str, Any]]] = {}
+        pending: Dict[ComplianceFramework, List[int]] = {}
+        cache_hits = 0
+        cached_items = await self._cache_lookup_many(statement_pairs, target_frameworks)
+        for framework in target_frameworks:
+            pending[framework] = []
+            for index, (stmt_id, stmt_content) in enumerate(statement_pairs):
+                cached = self._cached_mappings(cached_items, stmt_id, stmt_content, framework)
+                if cached is not None:
+                    framework_results[(index, framework)] = cached
+                    cache_hits += 1
+                else:
+                    pending[framework].append(index)
+        cache_misses = sum(len(indices) for indices in pending.values())
+
+        if progress_callback:
+            for index in range(len(statement_pairs)):
+                for framework in target_frameworks:
+                    if (index, framework) in framework_results:
+                        await progress_callback("statement_mapped", {
+                            "statement_id": statement_pairs[index][0],
+                            "framework": framework,
+                            "mappings": framework_results[(index, framework)],
+                            "cached": True,
+                        })
+
+        # Embed uncached statements once for the control pre-filter; only
+        # catalogues larger than top-k can be narrowed, so skip the rest
+        prefiltered = {framework for framework in target_frameworks if self._prefiltered(framework)}
+        statement_vectors: Dict[int, np.ndarray] = {}
+        pending_indices = sorted(set().union(*(pending[framework] for framework in prefiltered)))
+        if pending_indices:
+            vectors = await self._embed_normalized(
+                [statement_pairs[i][1] for i in pending_indices]
+            )
+            statement_vectors = dict(zip(pending_indices, vectors))
+
+        # Pack uncached statements into batches so the controls context is
+        # sent once per batch rather than once per statement, and map each
+        # batch under the provider's concurrency limit. Batches are sized so
+        # the batched response fits the output token budget
+        batch_size = max(1, min(
+            self.settings.policy_mapping.statement_batch_size,
+            self.settings.llm.max_tokens // self.settings.policy_mapping.statement_output_tokens
+        ))
+        calls = []
+        labels = []
+        call_keys = []
+        candidate_counts = []
+        for framework in target_frameworks:
+            indices = pending[framework]
+            for offset in range(0, len(indices), batch_size):
+                batch_indices = indices[offset:offset + batch_size]
+                batch = [statement_pairs[i] for i in batch_indices]
+                controls = self.frameworks.get(framework, {})
+
+                if statement_vectors and framework in prefiltered:
+                    controls = await self._shortlist_controls(
+                        framework=framework,
+                        statement_vectors=np.stack([statement_vectors[i] for i in batch_indices])
+                    )
+                candidate_counts.append(len(controls))
+
+                call = functools.partial(
+                    self._map_statements_to_framework,
+                    statements=batch,
                     framework=framework,
-                    controls=framework_controls,
-                    user_id=user_id
+                    controls=controls,
+                    user_id=user_id,
+                    cache_pending=cache_pending
                 )
+                if progress_callback:
+                    call = self._with_progress(call, progress_callback, batch, framework)
 
-                mappings.extend(relevant_mappings)
+                calls.append(call)
+                labels.append(f"{batch[0][0]}+{len(batch) - 1}:{framework.value}")
+                call_keys.append((framework, batch_indices))
+
+        provider = get_ollama_client().get_provider_name()
+        call_results = await get_provider_executor(provider).map(calls, labels=labels)
+
+        for (framework, batch_indices), batch_results in zip(call_keys, call_results):
+            for index, statement_mappings in zip(batch_indices, batch_results):
+                framework_results[(index, framework)] = statement_mappings
+
+        await self._cache_flush(cache_pending)
+
+        # Assemble in deterministic order: statement, then framework
+        for index in range(len(statement_pairs)):
+            for framework in target_frameworks:
+                mappings.extend(framework_results[(index, framework)])
 
         # Calculate coverage summary
         coverage_summary = self._calculate_coverage_summary(mappings, target_frameworks)
@@ -359,6 +466,13 @@ class PolicyMappingEngine:
             policy_id=policy_id,
             frameworks=len(target_frameworks),
             mappings=len(mappings),
+            mapping_calls=len(calls),
+            cache_hits=cache_hits,
+            cache_misses=cache_misses,
+            avg_candidate_controls=(
+                sum(candidate_counts) / len(candidate_counts) if candidate_counts else 0.0
+            ),
+            max_concurrency=worker_concurrency(provider),
             gaps=len(all_gaps),
             score=overall_score,
             processing_time_ms=processing_time
@@ -377,29 +491,391 @@ class PolicyMappingEngine:
             processing_time_ms=processing_time
         )
 
-    async def _map_statement_to_framework(
+    def _with_progress(
+        self,
+        call: Callable[[], Awaitable[List[List[PolicyMapping]]]],
+        progress_callback: ProgressCallback,
+        batch: List[Tuple[str, str]],
+        framework: ComplianceFramework
+    ) -> Callable[[], Awaitable[List[List[PolicyMapping]]]]:
+        """Wrap a batch mapping call to report each statement on completion"""
+        async def run() -> List[List[PolicyMapping]]:
+            batch_results = await call()
+            for (statement_id, _), statement_mappings in zip(batch, batch_results):
+                await progress_callback("statement_mapped", {
+                    "statement_id": statement_id,
+                    "framework": framework,
+                    "mappings": statement_mappings,
+                    "cached": False,
+                })
+            return batch_results
+
+        return run
+
+    def _catalogue_version(self, framework: ComplianceFramework) -> str:
+        """Hash of a framework's control definitions"""
+        if framework not in self._catalogue_versions:
+            controls = self.frameworks.get(framework, {})
+            material = json.dumps(
+                [asdict(ctrl) for ctrl in controls.values()],
+                sort_keys=True
+            )
+            self._catalogue_versions[framework] = hashlib.sha256(
+                material.encode()
+            ).hexdigest()[:16]
+        return self._catalogue_versions[framework]
+
+    def _prefiltered(self, framework: ComplianceFramework) -> bool:
+        """Whether mapping prompts for a framework only see a control shortlist"""
+        return (
+            self.settings.policy_mapping.control_prefilter_enabled
+            and len(self.frameworks.get(framework, {})) > max(1, self.settings.policy_mapping.control_top_k)
+        )
+
+    def _cache_key(self, statement_content: str, framework: ComplianceFramework) -> str:
+        """Build the mapping cache key for a statement (shortlist settings included when they shape the prompt)"""
+        shortlisted = self._prefiltered(framework)
+        return MappingCache.make_key(
+            statement_content=statement_content,
+            framework=framework.value,
+            catalogue_version=self._catalogue_version(framework),
+            model=self.settings.llm.ollama_model,
+            temperature=MAPPING_TEMPERATURE,
+            control_top_k=max(1, self.settings.policy_mapping.control_top_k) if shortlisted else None,
+            similarity_floor=self.settings.policy_mapping.control_similarity_floor if shortlisted else None
+        )
+
+    async def _cache_lookup_many(
         self,
+        statement_pairs: List[Tuple[str, str]],
+        frameworks: List[ComplianceFramework]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Read cached items for every statement and framework in one executor call"""
+        if self.cache is None or not statement_pairs:
+            return {}
+
+        keys = [
+            self._cache_key(statement_content, framework)
+            for framework in frameworks
+            for _, statement_content in statement_pairs
+        ]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.cache.get_many, keys)
+
+    def _cached_mappings(
+        self,
+        cached_items: Dict[str, List[Dict[str, Any]]],
         statement_id: str,
         statement_content: str,
+        framework: ComplianceFramework
+    ) -> Optional[List[PolicyMapping]]:
+        """Get cached mappings for a statement, or None on miss"""
+        items = cached_items.get(self._cache_key(statement_content, framework))
+        if items is None:
+            return None
+
+        return self._parse_mapping_items(
+            items, statement_id, statement_content, self.frameworks.get(framework, {})
+        )
+
+    def _cache_store(
+        self,
+        cache_pending: Optional[Dict[str, List[Dict[str, Any]]]],
+        statement_content: str,
         framework: ComplianceFramework,
-        controls: Dict[str, FrameworkControl],
-        user_id: Optional[str] = None
-    ) -> List[PolicyMapping]:
-        """Map a single statement to framework controls using AI"""
+        mappings: List[PolicyMapping]
+    ):
+        """Queue successfully parsed mappings for a statement for the analysis' cache flush"""
+        if self.cache is None or cache_pending is None:
+            return
+
+        cache_pending[self._cache_key(statement_content, framework)] = [
+            {
+                "control_id": m.control.control_id,
+                "coverage_level": m.coverage_level.value,
+                "confidence": m.confidence_score,
+                "rationale": m.rationale,
+                "gaps": m.gaps,
+                "recommendations": m.recommendations,
+            }
+            for m in mappings
+        ]
+
+    async def _cache_flush(self, cache_pending: Dict[str, List[Dict[str, Any]]]):
+        """Write an analysis' queued mapping results in one transaction off the event loop"""
+        if self.cache is None or not cache_pending:
+            return
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.cache.set_many, dict(cache_pending))
+
+    async def _embed_normalized(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with the local model and L2-normalize the rows"""
+        vectors = np.asarray(
+            await get_rag_engine().embedding_pool.embed(texts),
+            dtype=np.float32
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    async def _get_control_index(
+        self,
+        framework: ComplianceFramework
+    ) -> Tuple[List[str], np.ndarray]:
+        """Get (control_ids, embedding matrix) for a framework, embedding once"""
+        if framework not in self._control_index:
+            controls = self.frameworks.get(framework, {})
+            texts = [
+                f"{ctrl.title}: {ctrl.description}. Requirements: {', '.join(ctrl.requirements)}"
+                for ctrl in controls.values()
+            ]
+            matrix = (
+                await self._embed_normalized(texts) if texts
+                else np.zeros((0, self.settings.rag.embedding_dimension), dtype=np.float32)
+            )
+            self._control_index[framework] = (list(controls.keys()), matrix)
+
+            logger.info(
+                "control_index_built",
+                framework=framework.value,
+                controls=len(texts)
+            )
+
+        return self._control_index[framework]
 
-        # Build context of all controls
-        controls_context = "\n".join([
+    async def _shortlist_controls(
+        self,
+        framework: ComplianceFramework,
+        statement_vectors: np.ndarray
+    ) -> Dict[str, FrameworkControl]:
+        """
+        Shortlist candidate controls for a batch of statements
+
+        Each statement contributes its top-k controls by cosine similarity
+        that clear the similarity floor; the batch gets their union. Small
+        catalogues (no larger than k) are returned unchanged.
+
+        Args:
+            framework: Framework to shortlist from
+            statement_vectors: Normalized statement embeddings
+
+        Returns:
+            Candidate controls in catalogue order
+        """
+        controls = self.frameworks.get(framework, {})
+        top_k = max(1, self.settings.policy_mapping.control_top_k)
+        floor = self.settings.policy_mapping.control_similarity_floor
+
+        if len(controls) <= top_k:
+            return controls
+
+        control_ids, control_matrix = await self._get_control_index(framework)
+        similarities = statement_vectors @ control_matrix.T
+
+        selected = set()
+        for row in similarities:
+            top_indices = np.argpartition(-row, top_k - 1)[:top_k]
+            selected.update(int(i) for i in top_indices if row[i] >= floor)
+
+        return {
+            control_id: controls[control_id]
+            for i, control_id in enumerate(control_ids)
+            if i in selected
+        }
+
+    def _build_controls_context(self, controls: Dict[str, FrameworkControl]) -> str:
+        """Build the prompt context listing the available controls"""
+        return "\n".join([
             f"- {ctrl.control_id}: {ctrl.title}\n  {ctrl.description}\n  Requirements: {', '.join(ctrl.requirements)}"
             for ctrl in controls.values()
         ])
 
+    def _parse_mapping_items(
+        self,
+        items: List[Dict[str, Any]],
+        statement_id: str,
+        statement_content: str,
+        controls: Dict[str, FrameworkControl]
+    ) -> List[PolicyMapping]:
+        """Convert parsed LLM mapping items to PolicyMapping objects"""
+        mappings = []
+        for item in items:
+            control_id = item.get("control_id", "")
+            if control_id in controls:
+                mappings.append(PolicyMapping(
+                    policy_id="",  # Set by caller
+                    statement_id=statement_id,
+                    statement_content=statement_content,
+                    control=controls[control_id],
+                    coverage_level=CoverageLevel(item.get("coverage_level", "partial")),
+                    confidence_score=float(item.get("confidence", 0.5)),
+                    rationale=item.get("rationale", ""),
+                    gaps=item.get("gaps", []),
+                    recommendations=item.get("recommendations", [])
+                ))
+        return mappings
+
+    async def _map_statements_to_framework(
+        self,
+        statements: List[Tuple[str, str]],
+        framework: ComplianceFramework,
+        controls: Dict[str, FrameworkControl],
+        user_id: Optional[str] = None,
+        cache_pending: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[List[PolicyMapping]]:
+        """
+        Map a batch of statements to framework controls in one LLM call
+
+        Falls back to per-statement calls for the whole batch when the
+        response cannot be parsed, and for any statement it omits.
+
+        Args:
+            statements: (statement_id, statement_content) pairs
+            framework: Framework to map against
+            controls: Framework controls
+            user_id: User performing analysis
+            cache_pending: Analysis-local queue for parsed results to cache
+
+        Returns:
+            Mappings for each statement, in input order
+        """
+        # Nothing to map against (e.g. no control cleared the pre-filter)
+        if not controls:
+            return [[] for _ in statements]
+
+        if len(statements) == 1:
+            statement_id, statement_content = statements[0]
+            return [await self._map_statement_to_framework(
+                statement_id=statement_id,
+                statement_content=statement_content,
+                framework=framework,
+                controls=controls,
+                user_id=user_id,
+                cache_pending=cache_pending
+            )]
+
+        # Key statements by ID, or by position when IDs are missing/duplicated
+        keys = [statement_id for statement_id, _ in statements]
+        if not all(keys) or len(set(keys)) != len(keys):
+            keys = [f"S{i + 1}" for i in range(len(statements))]
+
+        statements_context = "\n\n".join([
+            f"[statement_id: {key}]\n{content}"
+            for key, (_, content) in zip(keys, statements)
+        ])
+
+        prompt = f"""Analyze each of these policy statements and map them to the relevant {framework.value} controls.
+
+POLICY STATEMENTS:
+{statements_context}
+
+AVAILABLE CONTROLS:
+{self._build_controls_context(controls)}
+
+For each statement and each relevant control, provide:
+1. Control ID
+2. Coverage level (full/partial/minimal/none)
+3. Confidence score (0.0-1.0)
+4. Rationale for the mapping
+5. Any gaps or missing elements
+6. Recommendations to improve coverage
+
+Return a JSON array with one entry per statement_id:
+[{{
+    "statement_id": "string",
+    "mappings": [{{
+        "control_id": "string",
+        "coverage_level": "full|partial|minimal|none",
+        "confidence": 0.0-1.0,
+        "rationale": "string",
+        "gaps": ["string"],
+        "recommendations": ["string"]
+    }}]
+}}]
+
+Include every statement_id, with an empty mappings list if no control is relevant.
+Only include controls with coverage_level != "none"."""
+
+        batch_data: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+        try:
+            response = await get_ollama_client().generate(
+                prompt=prompt,
+                system_prompt=SYSTEM_PROMPTS["policy_mapper"],
+                user_id=user_id,
+                temperature=MAPPING_TEMPERATURE
+            )
+
+            json_match = re.search(r'\[[\s\S]*\]', response.content)
+            if json_match:
+                batch_data = {
+                    str(entry["statement_id"]): entry.get("mappings", [])
+                    for entry in json.loads(json_match.group())
+                }
+
+        except Exception as e:
+            logger.warning(
+                "batch_mapping_failed",
+                framework=framework.value,
+                batch_size=len(statements),
+                error=str(e)
+            )
+
+        if batch_data is None:
+            logger.warning(
+                "batch_mapping_fallback",
+                framework=framework.value,
+                batch_size=len(statements)
+            )
+            batch_data = {}
+
+        results = []
+        for key, (statement_id, statement_content) in zip(keys, statements):
+            if key in batch_data:
+                try:
+                    statement_mappings = self._parse_mapping_items(
+                        batch_data[key], statement_id, statement_content, controls
+                    )
+                    self._cache_store(cache_pending, statement_content, framework, statement_mappings)
+                    results.append(statement_mappings)
+                    continue
+                except Exception as e:
+                    logger.warning(
+                        "batch_mapping_entry_invalid",
+                        statement_id=statement_id,
+                        error=str(e)
+                    )
+
+            # Fall back to a per-statement call
+            results.append(await self._map_statement_to_framework(
+                statement_id=statement_id,
+                statement_content=statement_content,
+                framework=framework,
+                controls=controls,
+                user_id=user_id,
+                cache_pending=cache_pending
+            ))
+
+        return results
+
+    async def _map_statement_to_framework(
+        self,
+        statement_id: str,
+        statement_content: str,
+        framework: ComplianceFramework,
+        controls: Dict[str, FrameworkControl],
+        user_id: Optional[str] = None,
+        cache_pending: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[PolicyMapping]:
+        """Map a single statement to framework controls using AI"""
+
         prompt = f"""Analyze this policy statement and map it to the relevant {framework.value} controls.
 
 POLICY STATEMENT:
 {statement_content}
 
 AVAILABLE CONTROLS:
-{controls_context}
+{self._build_controls_context(controls)}
 
 For each relevant control, provide:
 1. Control ID
@@ -422,11 +898,11 @@ Return JSON array:
 Only include controls with coverage_level != "none"."""
 
         try:
-            response = await ollama_client.generate(
+            response = await get_ollama_client().generate(
                 prompt=prompt,
                 system_prompt=SYSTEM_PROMPTS["policy_mapper"],
                 user_id=user_id,
-                temperature=0.1  # Low temperature for consistency
+                temperature=MAPPING_TEMPERATURE
             )
 
             # Parse JSON from response
@@ -438,21 +914,10 @@ Only include controls with coverage_level != "none"."""
                 return []
 
             # Convert to PolicyMapping objects
-            mappings = []
-            for item in mapping_data:
-                control_id = item.get("control_id", "")
-                if control_id in controls:
-                    mappings.append(PolicyMapping(
-                        policy_id="",  # Set by caller
-                        statement_id=statement_id,
-                        statement_content=statement_content,
-                        control=controls[control_id],
-                        coverage_level=CoverageLevel(item.get("coverage_level", "partial")),
-                        confidence_score=float(item.get("confidence", 0.5)),
-                        rationale=item.get("rationale", ""),
-                        gaps=item.get("gaps", []),
-                        recommendations=item.get("recommendations", [])
-                    ))
+            mappings = self._parse_mapping_items(
+                mapping_data, statement_id, statement_content, controls
+            )
+            self._cache_store(cache_pending, statement_content, framework, mappings)
 
             return mappings
 
@@ -558,7 +1023,7 @@ Provide 5-7 actionable recommendations to address these gaps. Each recommendatio
 Return as JSON array of strings."""
 
         try:
-            response = await ollama_client.generate(
+            response = await get_ollama_client().generate(
                 prompt=prompt,
                 system_prompt=SYSTEM_PROMPTS["policy_mapper"],
                 user_id=user_id
@@ -600,5 +1065,20 @@ Return as JSON array of strings."""
         return round(total_score / total_weight * 100, 1) if total_weight > 0 else 0.0
 
 
-# Singleton instance
-policy_mapper = PolicyMappingEngine()
+# Singleton instance (built on first use)
+_policy_mapper: Optional[PolicyMappingEngine] = None
+
+
+def get_policy_mapper() -> PolicyMappingEngine:
+    """Get the shared PolicyMappingEngine"""
+    global _policy_mapper
+    if _policy_mapper is None:
+        _policy_mapper = PolicyMappingEngine()
+    return _policy_mapper
+
+
+def __getattr__(name: str):
+    # Legacy module attribute: `from modules.policy_mapper import policy_mapper`
+    if name == "policy_mapper":
+        return get_policy_mapper()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,9 @@ AI-powered Security Operations Center Capability Maturity Assessment
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import functools
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -14,7 +16,9 @@ import re
 import structlog
 
 from config.settings import get_settings
-from llm.ollama_client import ollama_client, SYSTEM_PROMPTS, LLMMessage, LLMRole
+from llm.ollama_client import get_ollama_client, SYSTEM_PROMPTS, LLMMessage, LLMRole
+from llm.concurrency import get_provider_executor, ProgressCallback
+from llm.scheduler import Priority, at_priority
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -64,6 +68,7 @@ class SOCCMMAssessment:
     priority_improvements: List[Dict[str, Any]]
     roadmap: List[Dict[str, Any]]
     processing_time_ms: float
+    domain_timings_ms: Dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -244,12 +249,14 @@ class SOCCMMAnalyzer:
         self.settings = get_settings()
         self.domain_criteria = DOMAIN_CRITERIA
 
+    @at_priority(Priority.BATCH)
     async def analyze_evidence(
         self,
         evidence_list: List[Evidence],
         organization: str,
         target_maturity: MaturityLevel = MaturityLevel.DEFINED,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> SOCCMMAssessment:
         """
         Analyze evidence and produce SOC-CMM assessment
@@ -259,11 +266,12 @@ class SOCCMMAnalyzer:
             organization: Organization name
             target_maturity: Target maturity level
             user_id: User performing assessment
+            progress_callback: Receives a "domain_assessed" event as each
+                domain assessment completes
 
         Returns:
             Complete SOC-CMM assessment
         """
-        import time
         import hashlib
         start_time = time.time()
 
@@ -274,16 +282,28 @@ class SOCCMMAnalyzer:
         # Group evidence by domain
         domain_evidence = self._group_evidence_by_domain(evidence_list)
 
-        # Assess each domain
-        domain_assessments = []
-        for domain in SOCCMMDomain:
-            assessment = await self._assess_domain(
-                domain=domain,
-                evidence=domain_evidence.get(domain, []),
-                target_level=target_maturity,
-                user_id=user_id
-            )
-            domain_assessments.append(assessment)
+        # Assess domains concurrently (they are independent) under the
+        # provider's concurrency limit; results keep domain order
+        executor = get_provider_executor(get_ollama_client().get_provider_name())
+        timed_results = await executor.map(
+            [
+                functools.partial(
+                    self._timed_assess_domain,
+                    domain=domain,
+                    evidence=domain_evidence.get(domain, []),
+                    target_level=target_maturity,
+                    user_id=user_id,
+                    progress_callback=progress_callback
+                )
+                for domain in SOCCMMDomain
+            ],
+            labels=[f"soc_cmm:{domain.value}" for domain in SOCCMMDomain]
+        )
+        domain_assessments = [assessment for assessment, _ in timed_results]
+        domain_timings = {
+            assessment.domain.value: elapsed_ms
+            for assessment, elapsed_ms in timed_results
+        }
 
         # Calculate overall maturity
         overall_score = sum(a.score for a in domain_assessments) / len(domain_assessments)
@@ -318,6 +338,7 @@ class SOCCMMAnalyzer:
             organization=organization,
             overall_score=overall_score,
             overall_maturity=overall_maturity.name,
+            domain_timings_ms=domain_timings,
             processing_time_ms=processing_time
         )
 
@@ -331,7 +352,8 @@ class SOCCMMAnalyzer:
             executive_summary=executive_summary,
             priority_improvements=priority_improvements,
             roadmap=roadmap,
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            domain_timings_ms=domain_timings
         )
 
     def _group_evidence_by_domain(
@@ -344,6 +366,24 @@ class SOCCMMAnalyzer:
             grouped[evidence.domain].append(evidence)
         return grouped
 
+    async def _timed_assess_domain(
+        self,
+        progress_callback: Optional[ProgressCallback] = None,
+        **kwargs
+    ) -> Tuple[DomainAssessment, float]:
+        """Assess a domain, measure how long it took (ms) and report it"""
+        start_time = time.time()
+        assessment = await self._assess_domain(**kwargs)
+        elapsed_ms = (time.time() - start_time) * 1000
+
+        if progress_callback:
+            await progress_callback("domain_assessed", {
+                "assessment": assessment,
+                "elapsed_ms": elapsed_ms,
+            })
+
+        return assessment, elapsed_ms
+
     async def _assess_domain(
         self,
         domain: SOCCMMDomain,
@@ -398,7 +438,7 @@ Return JSON:
 }}"""
 
         try:
-            response = await ollama_client.generate(
+            response = await get_ollama_client().generate(
                 prompt=prompt,
                 system_prompt=SYSTEM_PROMPTS["soc_cmm_analyst"],
                 user_id=user_id,
@@ -483,7 +523,7 @@ Write a 2-3 paragraph executive summary that:
 Use professional language suitable for CISO/executive audience."""
 
         try:
-            response = await ollama_client.generate(
+            response = await get_ollama_client().generate(
                 prompt=prompt,
                 system_prompt=SYSTEM_PROMPTS["executive_reporter"],
                 user_id=user_id
@@ -588,5 +628,20 @@ Use professional language suitable for CISO/executive audience."""
         return roadmap
 
 
-# Singleton instance
-soc_cmm_analyzer = SOCCMMAnalyzer()
+# Singleton instance (built on first use)
+_soc_cmm_analyzer: Optional[SOCCMMAnalyzer] = None
+
+
+def get_soc_cmm_analyzer() -> SOCCMMAnalyzer:
+    """Get the shared SOCCMMAnalyzer"""
+    global _soc_cmm_analyzer
+    if _soc_cmm_analyzer is None:
+        _soc_cmm_analyzer = SOCCMMAnalyzer()
+    return _soc_cmm_analyzer
+
+
+def __getattr__(name: str):
+    # Legacy module attribute: `from modules.soc_cmm_analyzer import soc_cmm_analyzer`
+    if name == "soc_cmm_analyzer":
+        return get_soc_cmm_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
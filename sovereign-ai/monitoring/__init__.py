@@ -0,0 +1,32 @@
+# Monitoring module - Local Prometheus metrics (scraped, never pushed)
+from .metrics import (
+    EMBEDDING_QUEUE_WAIT_SECONDS,
+    EMBEDDING_ENCODE_SECONDS,
+    EMBEDDING_QUEUE_DEPTH,
+    EMBEDDING_QUERY_BATCH_SIZE,
+    RAG_CACHE_REQUESTS,
+    DLP_SCANS,
+    DLP_SCAN_SECONDS,
+    DLP_SCAN_CACHE_REQUESTS,
+    LLM_POOL_WAIT_SECONDS,
+    LLM_CONNECTIONS,
+    LLM_SCHEDULER_QUEUE_DEPTH,
+    LLM_SCHEDULER_WAIT_SECONDS,
+    LLM_SCHEDULER_ACTIVE,
+)
+
+__all__ = [
+    "EMBEDDING_QUEUE_WAIT_SECONDS",
+    "EMBEDDING_ENCODE_SECONDS",
+    "EMBEDDING_QUEUE_DEPTH",
+    "EMBEDDING_QUERY_BATCH_SIZE",
+    "RAG_CACHE_REQUESTS",
+    "DLP_SCANS",
+    "DLP_SCAN_SECONDS",
+    "DLP_SCAN_CACHE_REQUESTS",
+    "LLM_POOL_WAIT_SECONDS",
+    "LLM_CONNECTIONS",
+    "LLM_SCHEDULER_QUEUE_DEPTH",
+    "LLM_SCHEDULER_WAIT_SECONDS",
+    "LLM_SCHEDULER_ACTIVE",
+]
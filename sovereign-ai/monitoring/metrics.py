@@ -0,0 +1,113 @@
+"""
+Sovereign AI - Prometheus Metrics
+Metrics exposed on /metrics for an on-premises scraper; under api.server the
+workers share a PROMETHEUS_MULTIPROC_DIR and the endpoint aggregates them
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# ============================================================================
+# Embedding Worker Pool
+# ============================================================================
+
+EMBEDDING_QUEUE_WAIT_SECONDS = Histogram(
+    "sovereign_embedding_queue_wait_seconds",
+    "Time an embedding request waited for a worker",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+EMBEDDING_ENCODE_SECONDS = Histogram(
+    "sovereign_embedding_encode_seconds",
+    "Time spent in SentenceTransformer.encode per request",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+EMBEDDING_QUEUE_DEPTH = Gauge(
+    "sovereign_embedding_queue_depth",
+    "Embedding requests queued or running on the worker pool",
+    multiprocess_mode="livesum",
+)
+
+EMBEDDING_QUERY_BATCH_SIZE = Histogram(
+    "sovereign_embedding_query_batch_size",
+    "Query embedding requests coalesced into one encode call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+
+# ============================================================================
+# RAG Caches
+# ============================================================================
+
+RAG_CACHE_REQUESTS = Counter(
+    "sovereign_rag_cache_requests_total",
+    "RAG cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+
+
+# ============================================================================
+# Data Loss Prevention
+# ============================================================================
+
+DLP_SCANS = Counter(
+    "sovereign_dlp_scans_total",
+    "DLP detection passes by path (fast = prefilter clean, Presidio/NER skipped)",
+    ["path"],
+)
+
+DLP_SCAN_SECONDS = Histogram(
+    "sovereign_dlp_scan_seconds",
+    "DLP detection time by path",
+    ["path"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+
+DLP_SCAN_CACHE_REQUESTS = Counter(
+    "sovereign_dlp_scan_cache_requests_total",
+    "DLP scan result cache lookups by result (hit/miss)",
+    ["result"],
+)
+
+# ============================================================================
+# LLM HTTP Connection Pool
+# ============================================================================
+
+LLM_POOL_WAIT_SECONDS = Histogram(
+    "sovereign_llm_pool_wait_seconds",
+    "Time from sending an LLM HTTP request until it holds a pooled or new connection",
+    ["provider"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+LLM_CONNECTIONS = Counter(
+    "sovereign_llm_connections_total",
+    "LLM HTTP requests by connection used (new = TCP connect, reused = keep-alive)",
+    ["provider", "connection"],
+)
+
+
+# ============================================================================
+# LLM Request Scheduler
+# ============================================================================
+
+LLM_SCHEDULER_QUEUE_DEPTH = Gauge(
+    "sovereign_llm_scheduler_queue_depth",
+    "LLM calls waiting for a scheduler slot by provider and priority",
+    ["provider", "priority"],
+    multiprocess_mode="livesum",
+)
+
+LLM_SCHEDULER_WAIT_SECONDS = Histogram(
+    "sovereign_llm_scheduler_wait_seconds",
+    "Time an LLM call waited for a scheduler slot by provider and priority",
+    ["provider", "priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+LLM_SCHEDULER_ACTIVE = Gauge(
+    "sovereign_llm_scheduler_active",
+    "LLM calls holding a scheduler slot by provider",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
@@ -1,4 +1,11 @@
 # RAG module - Local embeddings and vector search
-from .engine import RAGEngine, rag_engine, DocumentType, Document, RetrievalResult, RAGResponse
+from .engine import RAGEngine, get_rag_engine, DocumentType, Document, RetrievalResult, RAGResponse
 
-__all__ = ["RAGEngine", "rag_engine", "DocumentType", "Document", "RetrievalResult", "RAGResponse"]
+__all__ = ["RAGEngine", "get_rag_engine", "DocumentType", "Document", "RetrievalResult", "RAGResponse"]
+
+
+def __getattr__(name: str):
+    # Legacy package attribute, built on first access
+    if name == "rag_engine":
+        return get_rag_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
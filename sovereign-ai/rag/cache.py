@@ -0,0 +1,103 @@
+"""
+Sovereign AI - RAG Caches
+In-process LRU caches for query embeddings and retrieval results
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from monitoring.metrics import RAG_CACHE_REQUESTS
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache keys (case and whitespace insensitive)"""
+    return " ".join(query.lower().split())
+
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by entry count and/or total size
+    Entries optionally expire ttl_seconds after they were stored
+    Not thread-safe - intended for use on the event loop
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.ttl_seconds = ttl_seconds
+        # key -> (value, size, expires_at)
+        self._data: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a value and mark it most recently used"""
+        entry = self._data.get(key)
+        if entry is not None and entry[2] <= time.monotonic():
+            self.pop(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            RAG_CACHE_REQUESTS.labels(cache=self.name, result="miss").inc()
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        RAG_CACHE_REQUESTS.labels(cache=self.name, result="hit").inc()
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting least recently used entries over the bounds"""
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        self.pop(key)
+        self._data[key] = (value, size, expires_at)
+        self._bytes += size
+
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, evicted_size, _) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def pop(self, key: Hashable):
+        """Remove a key if present"""
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self):
+        """Remove all entries"""
+        self._data.clear()
+        self._bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for logging"""
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
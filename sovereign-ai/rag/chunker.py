@@ -0,0 +1,217 @@
+"""
+Sovereign AI - Markdown Chunker
+Token-aware, heading-aware document chunking for embedding
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+# Bump when chunk boundaries change so stored documents are re-chunked
+CHUNKER_VERSION = 2
+
+# Batch token counter: texts -> token count per text (no special tokens)
+TokenCounter = Callable[[List[str]], List[int]]
+
+
+@dataclass
+class TextChunk:
+    """A chunk of document text with the markdown headings it falls under"""
+    text: str
+    heading_path: List[str] = field(default_factory=list)
+    token_count: int = 0
+
+
+@dataclass
+class _Unit:
+    """Smallest piece of text the chunker places (heading, paragraph or fragment)"""
+    text: str
+    level: int = 0  # Heading level, 0 for body text
+    title: str = ""  # Heading text without the leading #s
+    tokens: int = 0
+
+
+def estimate_tokens(texts: List[str]) -> List[int]:
+    """Rough token count (~4 characters per token) when no tokenizer is available"""
+    return [max(1, len(text) // 4) for text in texts]
+
+
+class MarkdownChunker:
+    """
+    Splits markdown into chunks that fit an embedding model's token window
+
+    One pass over the lines produces headings and paragraphs, which are
+    token-counted in a single batch and packed greedily into chunks. Chunks
+    never span a heading; a section longer than the budget is split at
+    paragraph, then line, then sentence, then word boundaries with a small
+    token overlap between consecutive chunks of the same section. A single
+    word over the budget (e.g. an encoded blob) is cut by characters.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Optional[TokenCounter] = None,
+        max_tokens: int = 254,
+        overlap_tokens: int = 32
+    ):
+        self.count_tokens = count_tokens or estimate_tokens
+        self.max_tokens = max(8, max_tokens)
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 2))
+
+    def chunk(self, text: str) -> List[TextChunk]:
+        """
+        Chunk a document
+
+        Args:
+            text: Markdown or plain text
+
+        Returns:
+            Chunks in document order (none for empty or blank input)
+        """
+        units = list(self._split_units(text))
+        if not units:
+            return []
+
+        for unit, tokens in zip(units, self.count_tokens([u.text for u in units])):
+            unit.tokens = tokens
+
+        units = [piece for unit in units for piece in self._fit(unit)]
+        return list(self._pack(units))
+
+    def _split_units(self, text: str) -> Iterator[_Unit]:
+        """Yield headings and paragraphs (fenced code kept as one block)"""
+        paragraph: List[str] = []
+        in_fence = False
+
+        for line in text.splitlines():
+            if FENCE_PATTERN.match(line):
+                in_fence = not in_fence
+                paragraph.append(line)
+                continue
+
+            if in_fence:
+                paragraph.append(line)
+                continue
+
+            heading = HEADING_PATTERN.match(line)
+            if heading or not line.strip():
+                if paragraph:
+                    yield _Unit(text="\n".join(paragraph).strip())
+                    paragraph = []
+                if heading:
+                    yield _Unit(
+                        text=line.strip(),
+                        level=len(heading.group(1)),
+                        title=heading.group(2)
+                    )
+                continue
+
+            paragraph.append(line)
+
+        if paragraph:
+            yield _Unit(text="\n".join(paragraph).strip())
+
+    def _fit(self, unit: _Unit) -> List[_Unit]:
+        """Split a unit that exceeds the budget at the finest boundary needed"""
+        if unit.tokens <= self.max_tokens:
+            return [unit]
+
+        for splitter in (self._split_lines, self._split_sentences, self._split_words, self._split_chars):
+            parts = [part for part in splitter(unit.text) if part.strip()]
+            if len(parts) > 1:
+                break
+        else:
+            return [unit]
+
+        # Only the first piece of a split heading opens the section
+        parts = [part.strip() for part in parts]
+        pieces = [
+            _Unit(
+                text=part,
+                level=unit.level if i == 0 else 0,
+                title=unit.title if i == 0 else "",
+                tokens=tokens
+            )
+            for i, (part, tokens) in enumerate(zip(parts, self.count_tokens(parts)))
+        ]
+        return [fitted for piece in pieces for fitted in self._fit(piece)]
+
+    @staticmethod
+    def _split_lines(text: str) -> List[str]:
+        return text.split("\n")
+
+    @staticmethod
+    def _split_sentences(text: str) -> List[str]:
+        return SENTENCE_PATTERN.split(text)
+
+    @staticmethod
+    def _split_words(text: str) -> List[str]:
+        words = text.split()
+        if len(words) < 2:
+            return [text]
+        middle = len(words) // 2
+        return [" ".join(words[:middle]), " ".join(words[middle:])]
+
+    @staticmethod
+    def _split_chars(text: str) -> List[str]:
+        middle = len(text) // 2
+        return [text[:middle], text[middle:]]
+
+    def _pack(self, units: List[_Unit]) -> Iterator[TextChunk]:
+        """Greedily pack units into chunks, breaking at every heading"""
+        headings: List[Tuple[int, str]] = []  # (level, title) stack
+        current: List[_Unit] = []
+        current_tokens = 0
+        has_body = False
+
+        def emit() -> TextChunk:
+            return TextChunk(
+                text="\n\n".join(u.text for u in current),
+                heading_path=[title for _, title in headings],
+                token_count=current_tokens
+            )
+
+        for unit in units:
+            if unit.level:
+                # New section: close the previous one. Heading-only sections
+                # (e.g. a parent heading directly followed by a subsection)
+                # are carried into the next chunk instead of emitted alone.
+                if has_body:
+                    yield emit()
+                    current, current_tokens, has_body = [], 0, False
+
+                while headings and headings[-1][0] >= unit.level:
+                    headings.pop()
+                headings.append((unit.level, unit.title))
+
+            elif has_body and current_tokens + unit.tokens > self.max_tokens:
+                yield emit()
+                current, current_tokens = self._overlap(current)
+
+            # Drop carried text (overlap or parent headings) that leaves no
+            # room; headings stay in heading_path either way
+            if current_tokens + unit.tokens > self.max_tokens:
+                current, current_tokens = [], 0
+
+            current.append(unit)
+            current_tokens += unit.tokens
+            has_body = has_body or not unit.level
+
+        if current:
+            yield emit()
+
+    def _overlap(self, units: List[_Unit]) -> Tuple[List[_Unit], int]:
+        """Trailing body units (up to overlap_tokens) repeated in the next chunk"""
+        carried: List[_Unit] = []
+        tokens = 0
+        for unit in reversed(units):
+            if unit.level or tokens + unit.tokens > self.overlap_tokens:
+                break
+            carried.append(unit)
+            tokens += unit.tokens
+        carried.reverse()
+        return carried, tokens
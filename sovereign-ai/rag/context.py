@@ -0,0 +1,195 @@
+"""
+Sovereign AI - RAG Context Builder
+Packs retrieved chunks into a token-budgeted prompt context
+"""
+
+import math
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Tuple
+
+from .chunker import TokenCounter, estimate_tokens
+
+SOURCE_SEPARATOR = "\n\n---\n\n"
+PARAGRAPH_SEPARATOR = "\n\n"
+MAX_OVERLAP_PARAGRAPHS = 8
+
+# The chat LLM's tokenizer (Mistral/Llama SentencePiece) splits text more
+# finely than the embedding model's WordPiece, much more so outside English
+# (Arabic falls back to near one token per character). A UTF-8 byte count
+# over this bounds it from above for both.
+LLM_BYTES_PER_TOKEN = 3
+
+
+def llm_token_counter(count_tokens: TokenCounter, margin: float) -> TokenCounter:
+    """
+    Conservative LLM-side token counter built on the embedding tokenizer
+
+    Args:
+        count_tokens: Embedding model token counter
+        margin: Share added to its counts (0.2 = +20%)
+
+    Returns:
+        Counter giving, per text, the larger of the padded embedding count
+        and the UTF-8 byte bound
+    """
+    def count(texts: List[str]) -> List[int]:
+        return [
+            max(math.ceil(tokens * (1 + margin)), math.ceil(len(text.encode("utf-8")) / LLM_BYTES_PER_TOKEN))
+            for text, tokens in zip(texts, count_tokens(texts))
+        ]
+    return count
+
+
+@dataclass
+class ContextPassage:
+    """One cited passage: a run of adjacent chunks from the same document"""
+    source: Any  # RetrievalResult carrying the merged content
+    chunk_indices: List[int]
+    tokens: int = 0
+
+
+class ContextBuilder:
+    """
+    Builds the knowledge-base context for a RAG prompt
+
+    Chunks from the same parent document are de-duplicated and adjacent
+    chunks are merged (dropping the chunker's overlap), then passages are
+    added in score order until the token budget is spent. Passages are
+    numbered in the order they appear, so [Source N] always refers to the
+    N-th returned source.
+    """
+
+    def __init__(self, count_tokens: TokenCounter = None):
+        self.count_tokens = count_tokens or estimate_tokens
+
+    def build(self, results: List[Any], max_tokens: int) -> Tuple[str, List[Any]]:
+        """
+        Build a context string from retrieval results
+
+        Args:
+            results: RetrievalResults (any order)
+            max_tokens: Token budget for the whole context
+
+        Returns:
+            Tuple of (context, cited sources in [Source N] order)
+        """
+        passages = self._merge_passages(results)
+        if not passages or max_tokens <= 0:
+            return "", []
+
+        # Count once with the largest possible source number so the
+        # header estimate is an upper bound
+        labels = [self._format(len(passages), p.source) for p in passages]
+        for passage, tokens in zip(passages, self.count_tokens(labels)):
+            passage.tokens = tokens
+
+        separator_tokens = self.count_tokens([SOURCE_SEPARATOR])[0]
+        selected: List[ContextPassage] = []
+        used = 0
+        for passage in passages:
+            cost = passage.tokens + (separator_tokens if selected else 0)
+            if used + cost <= max_tokens:
+                selected.append(passage)
+                used += cost
+
+        # Nothing fits whole: keep the best passage, cut to the budget
+        if not selected:
+            selected = [self._truncate(passages[0], max_tokens)]
+
+        sources = [passage.source for passage in selected]
+        context = SOURCE_SEPARATOR.join(
+            self._format(i + 1, source) for i, source in enumerate(sources)
+        )
+        return context, sources
+
+    @staticmethod
+    def _format(number: int, source: Any) -> str:
+        return (
+            f"[Source {number}] (Type: {source.document.doc_type.value}, "
+            f"Match: {source.match_strength.value.upper()}, "
+            f"Score: {source.similarity_score:.2f})\n"
+            f"{source.document.content}"
+        )
+
+    def _merge_passages(self, results: List[Any]) -> List[ContextPassage]:
+        """Group results by parent document and merge runs of adjacent chunks"""
+        # parent_id -> chunk_index -> best result for that chunk
+        groups: Dict[Any, Dict[int, Any]] = {}
+        standalone: List[ContextPassage] = []
+
+        for result in results:
+            metadata = result.document.metadata or {}
+            chunk_index = metadata.get("chunk_index")
+            if chunk_index is None:
+                standalone.append(ContextPassage(source=result, chunk_indices=[]))
+                continue
+
+            chunks = groups.setdefault(metadata.get("parent_id", result.document.id), {})
+            previous = chunks.get(chunk_index)
+            if previous is None or result.similarity_score > previous.similarity_score:
+                chunks[chunk_index] = result
+
+        passages = standalone
+        for chunks in groups.values():
+            run: List[Tuple[int, Any]] = []
+            for chunk_index in sorted(chunks):
+                if run and chunk_index != run[-1][0] + 1:
+                    passages.append(self._merge_run(run))
+                    run = []
+                run.append((chunk_index, chunks[chunk_index]))
+            passages.append(self._merge_run(run))
+
+        passages.sort(key=lambda p: p.source.similarity_score, reverse=True)
+        return passages
+
+    def _merge_run(self, run: List[Tuple[int, Any]]) -> ContextPassage:
+        """Merge consecutive chunks into one passage led by the best-scoring chunk"""
+        lead = max((result for _, result in run), key=lambda r: r.similarity_score)
+        if len(run) == 1:
+            return ContextPassage(source=lead, chunk_indices=[run[0][0]])
+
+        content = run[0][1].document.content
+        for _, result in run[1:]:
+            content = self._join_overlapping(content, result.document.content)
+
+        chunk_indices = [chunk_index for chunk_index, _ in run]
+        document = replace(
+            lead.document,
+            content=content,
+            metadata={**lead.document.metadata, "merged_chunks": len(run)}
+        )
+        return ContextPassage(source=replace(lead, document=document), chunk_indices=chunk_indices)
+
+    @staticmethod
+    def _join_overlapping(first: str, second: str) -> str:
+        """Concatenate two chunks, dropping paragraphs the second repeats from the first"""
+        first_parts = first.split(PARAGRAPH_SEPARATOR)
+        second_parts = second.split(PARAGRAPH_SEPARATOR)
+
+        longest = min(len(first_parts), len(second_parts) - 1, MAX_OVERLAP_PARAGRAPHS)
+        for size in range(longest, 0, -1):
+            if first_parts[-size:] == second_parts[:size]:
+                second_parts = second_parts[size:]
+                break
+
+        return PARAGRAPH_SEPARATOR.join(first_parts + second_parts)
+
+    def _truncate(self, passage: ContextPassage, max_tokens: int) -> ContextPassage:
+        """Cut a passage's content to fit the budget (header included)"""
+        content = passage.source.document.content
+        ratio = max_tokens / max(passage.tokens, 1)
+        content = content[:max(0, int(len(content) * ratio))]
+
+        # Proportional cut is approximate: trim further until it fits
+        while content:
+            source = replace(
+                passage.source,
+                document=replace(passage.source.document, content=content)
+            )
+            tokens = self.count_tokens([self._format(1, source)])[0]
+            if tokens <= max_tokens:
+                return ContextPassage(source=source, chunk_indices=passage.chunk_indices, tokens=tokens)
+            content = content[:int(len(content) * 0.9)]
+
+        source = replace(passage.source, document=replace(passage.source.document, content=""))
+        return ContextPassage(source=source, chunk_indices=passage.chunk_indices, tokens=0)
@@ -0,0 +1,83 @@
+"""
+Sovereign AI - Query Embedding Micro-Batcher
+Coalesces concurrent single-query embedding requests into one encode call
+"""
+
+import asyncio
+import functools
+from typing import List, Optional, Set, Tuple
+
+import structlog
+
+from monitoring.metrics import EMBEDDING_QUERY_BATCH_SIZE
+
+logger = structlog.get_logger()
+
+
+class EmbeddingMicroBatcher:
+    """
+    Collects query embedding requests for up to max_wait_ms or max_batch
+    items, encodes them as one batch and resolves each caller's future
+    """
+
+    def __init__(self, embedding_pool, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.embedding_pool = embedding_pool
+        self.max_batch = max(1, max_batch)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed_single(self, text: str) -> List[float]:
+        """Embed a query, sharing an encode call with concurrent callers"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Dispatch the pending requests as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._encode_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(functools.partial(self._batch_done, batch))
+
+    def _batch_done(self, batch: List[Tuple[str, asyncio.Future]], task: asyncio.Task):
+        """Forget a finished batch task; cancel its callers if it was cancelled"""
+        self._tasks.discard(task)
+        # A task cancelled before or during encode (e.g. on shutdown) never
+        # resolves its futures, which would leave the callers waiting forever
+        if task.cancelled():
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    async def _encode_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Encode a batch and resolve its futures"""
+        EMBEDDING_QUERY_BATCH_SIZE.observe(len(batch))
+
+        try:
+            vectors = await self.embedding_pool.embed([text for text, _ in batch])
+        except Exception as e:
+            logger.error("query_embedding_batch_failed", batch_size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
@@ -0,0 +1,79 @@
+"""
+Sovereign AI - Embedding Worker Pool
+Runs CPU-bound sentence-transformer encoding on dedicated threads
+so the API event loop is never blocked by an embedding job
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import structlog
+
+from monitoring.metrics import (
+    EMBEDDING_QUEUE_WAIT_SECONDS,
+    EMBEDDING_ENCODE_SECONDS,
+    EMBEDDING_QUEUE_DEPTH,
+)
+
+logger = structlog.get_logger()
+
+
+class EmbeddingWorkerPool:
+    """
+    Bounded worker pool in front of a local embedding model
+    At most workers + max_queue requests are admitted at once; further
+    callers wait on the event loop (backpressure) instead of piling up
+    """
+
+    def __init__(self, embedding_model, workers: int = 1, max_queue: int = 64):
+        self.embedding_model = embedding_model
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="embedding"
+        )
+        self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+
+        logger.info(
+            "embedding_pool_initialized",
+            workers=self.workers,
+            max_queue=self.max_queue
+        )
+
+    def _encode(self, texts: List[str], queued_at: float) -> List[List[float]]:
+        """Encode on a worker thread, recording queue wait and encode time"""
+        started_at = time.perf_counter()
+        EMBEDDING_QUEUE_WAIT_SECONDS.observe(started_at - queued_at)
+
+        try:
+            return self.embedding_model.embed(texts)
+        finally:
+            EMBEDDING_ENCODE_SECONDS.observe(time.perf_counter() - started_at)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings on the worker pool"""
+        if not texts:
+            return []
+
+        queued_at = time.perf_counter()
+
+        async with self._slots:
+            EMBEDDING_QUEUE_DEPTH.inc()
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor, self._encode, texts, queued_at
+                )
+            finally:
+                EMBEDDING_QUEUE_DEPTH.dec()
+
+    async def embed_single(self, text: str) -> List[float]:
+        """Embed single text on the worker pool"""
+        return (await self.embed([text]))[0]
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
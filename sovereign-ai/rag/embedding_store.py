@@ -0,0 +1,208 @@
+"""
+Sovereign AI - Persistent Embedding Cache
+On-disk chunk embedding cache keyed by (embedding model, dimension,
+sha256(chunk)) so collection rebuilds read vectors from disk instead of
+re-encoding
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import structlog
+
+from monitoring.metrics import RAG_CACHE_REQUESTS
+
+logger = structlog.get_logger()
+
+DIGEST_SIZE = 32  # sha256
+
+
+class EmbeddingDiskCache:
+    """
+    Append-only embedding store for one embedding model
+
+    vectors.f32 is a float32 matrix (one row per chunk) read through a
+    memory map; index.bin holds the sha256 digest of each row's chunk in
+    row order. Rows are appended vector first, digest second, so a torn
+    write is detected and trimmed on load.
+
+    API workers share the store: appends hold an exclusive flock and
+    take their row numbers from the files themselves, and every lookup
+    first indexes rows appended since the last one (by any process).
+    """
+
+    def __init__(self, directory: str, model_name: str, dimension: int):
+        # One directory per exact model name and dimension: the slug keeps it
+        # readable, the name hash keeps models whose slugs collide apart
+        model_slug = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        model_hash = hashlib.sha256(model_name.encode()).hexdigest()[:8]
+        self.path = Path(directory) / f"{model_slug}-{dimension}d-{model_hash}"
+        self.model_name = model_name
+        self.dimension = dimension
+        self._vectors_path = self.path / "vectors.f32"
+        self._index_path = self.path / "index.bin"
+        self._lock_path = self.path / ".lock"
+        self._row_bytes = dimension * np.dtype(np.float32).itemsize
+        self._rows: Dict[bytes, int] = {}
+        self._row_count = 0  # Rows indexed so far
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.sha256(text.encode()).digest()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock on the store files across processes"""
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _complete_rows(self) -> int:
+        """Rows present in full in both files"""
+        return min(
+            os.path.getsize(self._index_path) // DIGEST_SIZE,
+            os.path.getsize(self._vectors_path) // self._row_bytes
+        )
+
+    def _trim(self) -> int:
+        """Cut both files back to complete rows (caller holds the file lock)"""
+        row_count = self._complete_rows()
+        os.truncate(self._index_path, row_count * DIGEST_SIZE)
+        os.truncate(self._vectors_path, row_count * self._row_bytes)
+        return row_count
+
+    def _load(self):
+        """Create the store, trimming any partially written row"""
+        if self._loaded:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._file_lock():
+            self._vectors_path.touch(exist_ok=True)
+            self._index_path.touch(exist_ok=True)
+            self._trim()
+
+        self._loaded = True
+        self._refresh()
+
+        logger.info(
+            "embedding_cache_loaded",
+            model=self.model_name,
+            path=str(self.path),
+            rows=self._row_count
+        )
+
+    def _refresh(self):
+        """Index rows appended since the last read, by this or another process"""
+        row_count = self._complete_rows()
+        if row_count <= self._row_count:
+            return
+
+        with open(self._index_path, "rb") as f:
+            f.seek(self._row_count * DIGEST_SIZE)
+            index_bytes = f.read((row_count - self._row_count) * DIGEST_SIZE)
+
+        for i in range(len(index_bytes) // DIGEST_SIZE):
+            self._rows[index_bytes[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]] = self._row_count + i
+        self._row_count += len(index_bytes) // DIGEST_SIZE
+
+    def _get_matrix(self) -> Optional[np.memmap]:
+        """Memory map covering every indexed row, remapped after appends"""
+        if self._row_count == 0:
+            return None
+
+        if self._matrix is None or self._matrix.shape[0] < self._row_count:
+            self._matrix = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self._row_count, self.dimension)
+            )
+        return self._matrix
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            Embedding per text, or None where not cached
+        """
+        with self._lock:
+            self._load()
+            self._refresh()
+            rows = [self._rows.get(self._digest(text)) for text in texts]
+            matrix = self._get_matrix()
+            vectors = [
+                matrix[row].tolist() if row is not None else None
+                for row in rows
+            ]
+
+        hits = sum(1 for vector in vectors if vector is not None)
+        if hits:
+            RAG_CACHE_REQUESTS.labels(cache="embedding_disk", result="hit").inc(hits)
+        if len(vectors) - hits:
+            RAG_CACHE_REQUESTS.labels(cache="embedding_disk", result="miss").inc(len(vectors) - hits)
+
+        return vectors
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]):
+        """
+        Append embeddings for chunks not yet cached
+
+        Args:
+            texts: Chunk texts
+            vectors: Their embeddings (same order)
+        """
+        with self._lock:
+            self._load()
+
+            with self._file_lock():
+                # Rows appended by other processes decide what is still
+                # missing and where our rows start
+                self._trim()
+                self._refresh()
+
+                digests: List[bytes] = []
+                seen = set()
+                rows = []
+                for text, vector in zip(texts, vectors):
+                    digest = self._digest(text)
+                    if digest in self._rows or digest in seen:
+                        continue
+                    if len(vector) != self.dimension:
+                        logger.warning(
+                            "embedding_cache_dimension_mismatch",
+                            expected=self.dimension,
+                            actual=len(vector)
+                        )
+                        return
+                    seen.add(digest)
+                    digests.append(digest)
+                    rows.append(vector)
+
+                if not rows:
+                    return
+
+                # Vectors first: an index entry must never point past the matrix
+                with open(self._vectors_path, "ab") as f:
+                    f.write(np.asarray(rows, dtype=np.float32).tobytes())
+                with open(self._index_path, "ab") as f:
+                    f.write(b"".join(digests))
+
+                self._refresh()
@@ -5,23 +5,49 @@ ALL DATA STAYS LOCAL - No external vector databases or embedding APIs
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, field
+import copy
+import functools
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncGenerator, List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 import hashlib
+import heapq
+import itertools
 import json
+import os
+import sys
+import threading
 
-import chromadb
-from sentence_transformers import SentenceTransformer
 import structlog
 
 from config.settings import get_settings
 from llm import get_llm_client, SYSTEM_PROMPTS, LLMMessage, LLMRole
+from security.dlp import get_dlp_engine
+from .embedding_pool import EmbeddingWorkerPool
+from .embedding_batcher import EmbeddingMicroBatcher
+from .embedding_store import EmbeddingDiskCache
+from .chunker import CHUNKER_VERSION, MarkdownChunker, TextChunk
+from .context import ContextBuilder, llm_token_counter
+from .cache import LRUCache, normalize_query
+
+# chromadb and sentence-transformers (torch) are imported when the engine
+# is built, so importing this module (e.g. for DocumentType) stays cheap
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Allowance for the fixed instructions wrapped around the context in query()
+CONTEXT_INSTRUCTION_TOKENS = 64
+
+# A chunked document ready to upsert: (doc_id, chunk_ids, chunks, chunk_metadatas)
+PreparedDocument = Tuple[str, List[str], List[str], List[Dict[str, Any]]]
+
 
 class DocumentType(str, Enum):
     """Types of documents in the RAG system"""
@@ -82,17 +108,31 @@ class LocalEmbeddingModel:
     NO EXTERNAL API CALLS - runs entirely on local hardware
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", torch_threads: int = 0):
         self.model_name = model_name
+        self.torch_threads = torch_threads
         self._model = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
         logger.info("initializing_local_embedding_model", model=model_name)
 
     @property
-    def model(self) -> SentenceTransformer:
-        """Lazy load model"""
+    def model(self) -> "SentenceTransformer":
+        """Lazy load model (thread-safe, may be first touched by a pool worker)"""
         if self._model is None:
-            self._model = SentenceTransformer(self.model_name)
-            logger.info("embedding_model_loaded", model=self.model_name)
+            with self._load_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    if self.torch_threads > 0:
+                        import torch
+                        torch.set_num_threads(self.torch_threads)
+                    self._model = SentenceTransformer(self.model_name)
+                    logger.info(
+                        "embedding_model_loaded",
+                        model=self.model_name,
+                        torch_threads=self.torch_threads or "default"
+                    )
         return self._model
 
     def embed(self, texts: List[str]) -> List[List[float]]:
@@ -108,6 +148,25 @@ class LocalEmbeddingModel:
         """Embed single text"""
         return self.embed([text])[0]
 
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Count model tokens per text (excluding special tokens)"""
+        if self._tokenizer is None:
+            model = self.model
+            with self._load_lock:
+                if self._tokenizer is None:
+                    # Private copy: fast tokenizers must not be shared with
+                    # the encode threads
+                    self._tokenizer = copy.deepcopy(model.tokenizer)
+
+        encoded = self._tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
 
 class RAGEngine:
     """
@@ -120,19 +179,115 @@ class RAGEngine:
 
         # Initialize local embedding model
         self.embedding_model = LocalEmbeddingModel(
-            self.settings.rag.embedding_model
+            self.settings.rag.embedding_model,
+            torch_threads=self.settings.rag.embedding_torch_threads
+        )
+
+        # Dedicated worker pool so encoding never blocks the event loop
+        self.embedding_pool = EmbeddingWorkerPool(
+            self.embedding_model,
+            workers=self.settings.rag.embedding_workers,
+            max_queue=self.settings.rag.embedding_max_queue
+        )
+
+        # Token-aware markdown chunker sized to the embedding window
+        self.chunker = MarkdownChunker(
+            count_tokens=self.embedding_model.count_tokens,
+            max_tokens=self.settings.rag.chunk_max_tokens - 2,  # [CLS] and [SEP]
+            overlap_tokens=self.settings.rag.chunk_overlap_tokens
+        )
+
+        # Token-budgeted prompt context for query(), counted conservatively
+        # for the chat LLM's tokenizer rather than the embedding model's
+        self.count_llm_tokens = llm_token_counter(
+            self.embedding_model.count_tokens,
+            margin=self.settings.rag.context_token_margin
+        )
+        self.context_builder = ContextBuilder(count_tokens=self.count_llm_tokens)
+
+        # Chunk embeddings persisted across collection rebuilds
+        self.embedding_cache: Optional[EmbeddingDiskCache] = None
+        if self.settings.rag.embedding_cache_enabled:
+            self.embedding_cache = EmbeddingDiskCache(
+                directory=self.settings.rag.embedding_cache_directory or os.path.join(
+                    self.settings.rag.chroma_persist_directory, "embedding_cache"
+                ),
+                model_name=self.settings.rag.embedding_model,
+                dimension=self.settings.rag.embedding_dimension
+            )
+
+        # Coalesce concurrent query embeddings into shared encode calls
+        self.query_batcher = EmbeddingMicroBatcher(
+            self.embedding_pool,
+            max_batch=self.settings.rag.query_batch_max_size,
+            max_wait_ms=self.settings.rag.query_batch_max_wait_ms
+        )
+
+        # Level 1: normalized query -> embedding as a compact float32 array
+        # (bounded by memory; a list of Python floats is ~4x larger)
+        self.query_embedding_cache = LRUCache(
+            name="query_embedding",
+            max_bytes=self.settings.rag.query_embedding_cache_max_bytes,
+            sizeof=sys.getsizeof
         )
 
-        # Initialize ChromaDB (local persistent storage)
+        # Level 2: (query, collections, generations, top_k, threshold) -> results
+        # Generations only see this worker's writes; the TTL bounds how long
+        # another worker's writes can go unseen
+        self.retrieval_cache = LRUCache(
+            name="retrieval",
+            max_entries=self.settings.rag.retrieval_cache_max_entries,
+            ttl_seconds=self.settings.rag.retrieval_cache_ttl_seconds
+        )
+        self.collection_generations: Dict[str, int] = {}
+
+        # Blocking Chroma lookups run on one pool per collection (built on
+        # first use), so collections are searched in parallel and a hung
+        # collection cannot starve the others of workers
+        self.query_executors: Dict[str, ThreadPoolExecutor] = {}
+        # Searches still running past their deadline, per collection
+        self._overdue_searches: Counter = Counter()
+        self._overdue_lock = threading.Lock()
+
+        # Initialize ChromaDB (local persistent storage) and collections
+        self._connect()
+
+        logger.info("rag_engine_initialized", persist_dir=self.settings.rag.chroma_persist_directory)
+
+    def _connect(self):
+        """Open the ChromaDB client and collections"""
+        import chromadb
+
         self.chroma_client = chromadb.PersistentClient(
             path=self.settings.rag.chroma_persist_directory,
             settings=chromadb.Settings(anonymized_telemetry=False)  # CRITICAL: No telemetry
         )
-
-        # Initialize collections
         self._init_collections()
 
-        logger.info("rag_engine_initialized", persist_dir=self.settings.rag.chroma_persist_directory)
+    def reconnect(self):
+        """
+        Reopen ChromaDB in a forked worker process
+
+        SQLite connections must not be shared across fork, and Chroma caches
+        one client system per path, so the cache is dropped first.
+        """
+        from chromadb.api.client import SharedSystemClient
+
+        SharedSystemClient.clear_system_cache()
+        self._connect()
+        logger.info("rag_engine_reconnected", pid=os.getpid())
+
+    def load_models(self):
+        """Load the embedding model weights without running inference (safe before fork)"""
+        _ = self.embedding_model.model
+
+    async def warm_up(self):
+        """Load the embedding model and run a dummy encode, tokenization and cache read"""
+        loop = asyncio.get_running_loop()
+        await self.embedding_pool.embed_single("warm-up")
+        await loop.run_in_executor(None, self.embedding_model.count_tokens, ["warm-up"])
+        if self.embedding_cache is not None:
+            await loop.run_in_executor(None, self.embedding_cache.get_many, [])
 
     def _init_collections(self):
         """Initialize ChromaDB collections"""
@@ -157,6 +312,10 @@ class RAGEngine:
 
     def _get_collection_for_type(self, doc_type: DocumentType):
         """Get appropriate collection for document type"""
+        return self.collections[self._get_collection_key_for_type(doc_type)]
+
+    def _get_collection_key_for_type(self, doc_type: DocumentType) -> str:
+        """Get the collection key for a document type"""
         type_to_collection = {
             DocumentType.POLICY: "policies",
             DocumentType.FRAMEWORK: "frameworks",
@@ -167,8 +326,7 @@ class RAGEngine:
             DocumentType.INCIDENT: "threats",
             DocumentType.AUDIT_FINDING: "evidence",
         }
-        collection_name = type_to_collection.get(doc_type, "evidence")
-        return self.collections[collection_name]
+        return type_to_collection.get(doc_type, "evidence")
 
     def _classify_match_strength(self, similarity_score: float) -> MatchStrength:
         """
@@ -184,36 +342,9 @@ class RAGEngine:
         else:
             return MatchStrength.NONE
 
-    def _chunk_text(self, text: str) -> List[str]:
-        """Split text into chunks for embedding"""
-        chunk_size = self.settings.rag.chunk_size
-        chunk_overlap = self.settings.rag.chunk_overlap
-
-        if len(text) <= chunk_size:
-            return [text]
-
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + chunk_size
-
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence endings
-                for sep in [". ", ".\n", "\n\n", "\n"]:
-                    last_sep = text[start:end].rfind(sep)
-                    if last_sep > chunk_size // 2:
-                        end = start + last_sep + len(sep)
-                        break
-
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-
-            start = end - chunk_overlap
-
-        return chunks
+    def _chunk_text(self, text: str) -> List[TextChunk]:
+        """Split text into token-bounded chunks along markdown sections"""
+        return self.chunker.chunk(text)
 
     async def add_document(
         self,
@@ -225,6 +356,10 @@ class RAGEngine:
         """
         Add document to RAG system
 
+        Re-adding an existing doc_id is an incremental upsert: only chunks
+        whose content hash changed are re-embedded, chunks that no longer
+        exist are deleted and an unchanged document is skipped.
+
         Args:
             content: Document content
             doc_type: Type of document
@@ -234,49 +369,368 @@ class RAGEngine:
         Returns:
             Document ID
         """
+        # Chunking (tokenization) and Chroma calls are blocking: run them
+        # in the default executor so the event loop keeps serving requests
+        loop = asyncio.get_running_loop()
+        doc_id, collection_key, chunk_ids, chunks, chunk_metadatas = await loop.run_in_executor(
+            None,
+            functools.partial(
+                self._prepare_chunks,
+                content=content,
+                doc_type=doc_type,
+                doc_id=doc_id,
+                metadata=metadata
+            )
+        )
+
+        collection = self.collections[collection_key]
+        stored = await loop.run_in_executor(None, self._get_stored_chunks, collection, [doc_id])
+        plan = self._plan_upsert(stored.get(doc_id, {}), chunk_ids, chunk_metadatas)
+
+        if plan is None:
+            logger.info(
+                "document_unchanged",
+                doc_id=doc_id,
+                doc_type=doc_type.value,
+                chunks=len(chunks)
+            )
+            return doc_id
+
+        embed_idx, update_idx, stale_ids = plan
+
+        # Generate embeddings locally (on the worker pool), changed chunks only
+        embeddings = await self._embed_chunks([chunks[i] for i in embed_idx])
+
+        await loop.run_in_executor(None, functools.partial(
+            self._write_chunks,
+            collection,
+            embed_ids=[chunk_ids[i] for i in embed_idx],
+            embeddings=embeddings,
+            embed_texts=[chunks[i] for i in embed_idx],
+            embed_metadatas=[chunk_metadatas[i] for i in embed_idx],
+            update_ids=[chunk_ids[i] for i in update_idx],
+            update_metadatas=[chunk_metadatas[i] for i in update_idx],
+            stale_ids=stale_ids
+        ))
+        self._bump_generation(collection_key)
+
+        logger.info(
+            "document_added",
+            doc_id=doc_id,
+            doc_type=doc_type.value,
+            chunks=len(chunks),
+            embedded=len(embed_idx),
+            unchanged=len(update_idx),
+            deleted=len(stale_ids)
+        )
+
+        return doc_id
+
+    async def add_documents(self, documents: List[Document], user_id: Optional[str] = None) -> List[str]:
+        """
+        Add many documents to RAG system in bulk
+
+        DLP-scans every document in one batch (sanitized text is indexed),
+        chunks it, embeds all changed chunks in large batches and writes
+        each collection with a few large calls (same incremental upsert
+        semantics as add_document). A document ID repeated in the batch is
+        indexed once, from its last occurrence.
+
+        Args:
+            documents: Documents to index (empty id = content hash)
+            user_id: User indexing the documents (DLP audit)
+
+        Returns:
+            Document IDs in input order
+
+        Raises:
+            ValueError: A document was blocked by DLP policy
+        """
+        import time
+        start_time = time.time()
+
+        # DLP, chunking (tokenization) and Chroma calls are blocking: run
+        # them in the default executor so the event loop keeps serving requests
+        loop = asyncio.get_running_loop()
+        if self.settings.dlp.dlp_enabled and self.settings.dlp.dlp_scan_documents:
+            documents = await loop.run_in_executor(None, self._sanitize_documents, documents, user_id)
+
+        doc_ids, prepared, duplicate_documents = await loop.run_in_executor(
+            None, self._prepare_documents, documents
+        )
+
+        embed_batch = max(1, self.settings.rag.embedding_batch_size)
+        add_batch = max(1, self.settings.rag.chroma_add_batch_size)
+        total_chunks = 0
+        embedded_chunks = 0
+        deleted_chunks = 0
+        skipped_documents = 0
+
+        for collection_key, entries in prepared.items():
+            collection = self.collections[collection_key]
+            stored = await loop.run_in_executor(
+                None, self._get_stored_chunks, collection, [entry[0] for entry in entries]
+            )
+
+            embed_ids: List[str] = []
+            embed_texts: List[str] = []
+            embed_metadatas: List[Dict[str, Any]] = []
+            update_ids: List[str] = []
+            update_metadatas: List[Dict[str, Any]] = []
+            stale_ids: List[str] = []
+
+            for doc_id, chunk_ids, chunks, chunk_metadatas in entries:
+                total_chunks += len(chunk_ids)
+                plan = self._plan_upsert(
+                    stored.get(doc_id, {}), chunk_ids, chunk_metadatas
+                )
+                if plan is None:
+                    skipped_documents += 1
+                    continue
+
+                embed_idx, update_idx, doc_stale_ids = plan
+                embed_ids.extend(chunk_ids[i] for i in embed_idx)
+                embed_texts.extend(chunks[i] for i in embed_idx)
+                embed_metadatas.extend(chunk_metadatas[i] for i in embed_idx)
+                update_ids.extend(chunk_ids[i] for i in update_idx)
+                update_metadatas.extend(chunk_metadatas[i] for i in update_idx)
+                stale_ids.extend(doc_stale_ids)
+
+            if not (embed_ids or update_ids or stale_ids):
+                continue
+
+            # Embed changed chunks in large batches
+            embeddings: List[List[float]] = []
+            for i in range(0, len(embed_texts), embed_batch):
+                embeddings.extend(await self._embed_chunks(embed_texts[i:i + embed_batch]))
+
+            # Write in a few large calls
+            for i in range(0, max(len(embed_ids), len(update_ids), 1), add_batch):
+                await loop.run_in_executor(None, functools.partial(
+                    self._write_chunks,
+                    collection,
+                    embed_ids=embed_ids[i:i + add_batch],
+                    embeddings=embeddings[i:i + add_batch],
+                    embed_texts=embed_texts[i:i + add_batch],
+                    embed_metadatas=embed_metadatas[i:i + add_batch],
+                    update_ids=update_ids[i:i + add_batch],
+                    update_metadatas=update_metadatas[i:i + add_batch],
+                    stale_ids=stale_ids if i == 0 else []
+                ))
+
+            self._bump_generation(collection_key)
+            embedded_chunks += len(embed_ids)
+            deleted_chunks += len(stale_ids)
+
+        logger.info(
+            "documents_added",
+            documents=len(documents),
+            duplicate_documents=duplicate_documents,
+            skipped_documents=skipped_documents,
+            collections=len(prepared),
+            chunks=total_chunks,
+            embedded=embedded_chunks,
+            deleted=deleted_chunks,
+            processing_time_ms=(time.time() - start_time) * 1000
+        )
+
+        return doc_ids
+
+    def _prepare_documents(
+        self,
+        documents: List[Document]
+    ) -> Tuple[List[str], Dict[str, List[PreparedDocument]], int]:
+        """
+        Chunk a batch of documents, keeping only the last occurrence of a repeated ID
+
+        Returns:
+            Tuple of (doc_ids in input order, collection key ->
+            [(doc_id, chunk_ids, chunks, chunk_metadatas)], duplicates dropped)
+        """
+        doc_ids = []
+        latest: Dict[str, Tuple[str, PreparedDocument]] = {}
+
+        for document in documents:
+            doc_id, collection_key, chunk_ids, chunks, chunk_metadatas = self._prepare_chunks(
+                content=document.content,
+                doc_type=document.doc_type,
+                doc_id=document.id or None,
+                metadata=document.metadata
+            )
+            doc_ids.append(doc_id)
+            latest[doc_id] = (collection_key, (doc_id, chunk_ids, chunks, chunk_metadatas))
+
+        prepared: Dict[str, List[PreparedDocument]] = {}
+        for collection_key, entry in latest.values():
+            prepared.setdefault(collection_key, []).append(entry)
+
+        return doc_ids, prepared, len(documents) - len(latest)
+
+    def _embedding_model_tag(self) -> str:
+        """Identify the model (and dimension) that produced stored chunk vectors"""
+        return f"{self.settings.rag.embedding_model}@{self.settings.rag.embedding_dimension}"
+
+    def _prepare_chunks(
+        self,
+        content: str,
+        doc_type: DocumentType,
+        doc_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str, List[str], List[str], List[Dict[str, Any]]]:
+        """
+        Chunk a document and build its chunk IDs and metadata
+
+        Returns:
+            Tuple of (doc_id, collection_key, chunk_ids, chunks, chunk_metadatas)
+        """
         # Generate ID if not provided
         if doc_id is None:
             doc_id = hashlib.sha256(content.encode()).hexdigest()[:16]
 
         # Chunk document
-        chunks = self._chunk_text(content)
-
-        # Generate embeddings locally
-        embeddings = self.embedding_model.embed(chunks)
+        text_chunks = self._chunk_text(content)
+        chunks = [chunk.text for chunk in text_chunks]
+
+        # Document hash covers everything stored with the chunks, so an
+        # unchanged hash means the stored document can be left as is
+        doc_metadata = dict(metadata or {})
+        embedding_model = self._embedding_model_tag()
+        doc_hash = hashlib.sha256(json.dumps(
+            [
+                content, doc_type.value, doc_metadata, CHUNKER_VERSION,
+                self.settings.rag.chunk_max_tokens, self.settings.rag.chunk_overlap_tokens,
+                embedding_model
+            ],
+            sort_keys=True,
+            default=str
+        ).encode()).hexdigest()
 
-        # Get appropriate collection
-        collection = self._get_collection_for_type(doc_type)
-
-        # Prepare metadata
-        doc_metadata = metadata or {}
         doc_metadata.update({
             "doc_type": doc_type.value,
             "added_at": datetime.utcnow().isoformat(),
             "chunk_count": len(chunks),
+            "doc_hash": doc_hash,
         })
 
-        # Add chunks to collection
         chunk_ids = [f"{doc_id}_{i}" for i in range(len(chunks))]
         chunk_metadatas = [
-            {**doc_metadata, "chunk_index": i, "parent_id": doc_id}
-            for i in range(len(chunks))
+            {
+                **doc_metadata,
+                "chunk_index": i,
+                "parent_id": doc_id,
+                "content_hash": hashlib.sha256(chunk.text.encode()).hexdigest(),
+                "embedding_model": embedding_model,
+                "heading_path": " > ".join(chunk.heading_path),
+                "section": chunk.heading_path[-1] if chunk.heading_path else "",
+                "token_count": chunk.token_count,
+            }
+            for i, chunk in enumerate(text_chunks)
         ]
 
-        collection.add(
-            ids=chunk_ids,
-            embeddings=embeddings,
-            documents=chunks,
-            metadatas=chunk_metadatas
-        )
+        return doc_id, self._get_collection_key_for_type(doc_type), chunk_ids, chunks, chunk_metadatas
 
-        logger.info(
-            "document_added",
-            doc_id=doc_id,
-            doc_type=doc_type.value,
-            chunks=len(chunks)
+    async def _embed_chunks(self, texts: List[str]) -> List[List[float]]:
+        """Embed document chunks, reusing vectors from the persistent cache"""
+        if self.embedding_cache is None or not texts:
+            return await self.embedding_pool.embed(texts)
+
+        loop = asyncio.get_running_loop()
+        embeddings = await loop.run_in_executor(
+            None, self.embedding_cache.get_many, texts
         )
 
-        return doc_id
+        missing = [i for i, vector in enumerate(embeddings) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            encoded = await self.embedding_pool.embed(missing_texts)
+            for i, vector in zip(missing, encoded):
+                embeddings[i] = vector
+            await loop.run_in_executor(
+                None, self.embedding_cache.put_many, missing_texts, encoded
+            )
+
+        return embeddings
+
+    def _get_stored_chunks(
+        self,
+        collection,
+        doc_ids: List[str]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get stored chunk metadata grouped by parent document ID"""
+        if not doc_ids:
+            return {}
+
+        where = {"parent_id": doc_ids[0]} if len(doc_ids) == 1 else {"parent_id": {"$in": doc_ids}}
+        existing = collection.get(where=where, include=["metadatas"])
+
+        stored: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for chunk_id, chunk_metadata in zip(existing["ids"], existing["metadatas"]):
+            stored.setdefault(chunk_metadata.get("parent_id"), {})[chunk_id] = chunk_metadata
+        return stored
+
+    def _plan_upsert(
+        self,
+        stored: Dict[str, Dict[str, Any]],
+        chunk_ids: List[str],
+        chunk_metadatas: List[Dict[str, Any]]
+    ) -> Optional[Tuple[List[int], List[int], List[str]]]:
+        """
+        Diff a prepared document against its stored chunks
+
+        Returns:
+            None if the document is unchanged, otherwise a tuple of
+            (indices to embed, indices needing a metadata refresh only,
+            stale chunk IDs to delete)
+        """
+        doc_hash = chunk_metadatas[0]["doc_hash"] if chunk_metadatas else None
+
+        if stored and len(stored) == len(chunk_ids) and all(
+            stored.get(chunk_id, {}).get("doc_hash") == doc_hash for chunk_id in chunk_ids
+        ):
+            return None
+
+        embed_idx = []
+        update_idx = []
+        for i, (chunk_id, chunk_metadata) in enumerate(zip(chunk_ids, chunk_metadatas)):
+            previous = stored.get(chunk_id)
+            # Same text embedded by the same model: the stored vector is reusable
+            if (
+                previous is not None
+                and previous.get("content_hash") == chunk_metadata["content_hash"]
+                and previous.get("embedding_model") == chunk_metadata["embedding_model"]
+            ):
+                update_idx.append(i)
+            else:
+                embed_idx.append(i)
+
+        current_ids = set(chunk_ids)
+        stale_ids = [chunk_id for chunk_id in stored if chunk_id not in current_ids]
+
+        return embed_idx, update_idx, stale_ids
+
+    def _write_chunks(
+        self,
+        collection,
+        embed_ids: List[str],
+        embeddings: List[List[float]],
+        embed_texts: List[str],
+        embed_metadatas: List[Dict[str, Any]],
+        update_ids: List[str],
+        update_metadatas: List[Dict[str, Any]],
+        stale_ids: List[str]
+    ):
+        """Apply an upsert plan: write changed chunks, refresh metadata, drop stale chunks"""
+        if embed_ids:
+            collection.upsert(
+                ids=embed_ids,
+                embeddings=embeddings,
+                documents=embed_texts,
+                metadatas=embed_metadatas
+            )
+        if update_ids:
+            collection.update(ids=update_ids, metadatas=update_metadatas)
+        if stale_ids:
+            collection.delete(ids=stale_ids)
 
     async def retrieve(
         self,
@@ -299,82 +753,227 @@ class RAGEngine:
         """
         top_k = top_k or self.settings.rag.top_k_results
         similarity_threshold = similarity_threshold or self.settings.rag.similarity_threshold
+        normalized_query = normalize_query(query)
 
-        # Generate query embedding locally
-        query_embedding = self.embedding_model.embed_single(query)
-
-        results = []
-
-        # Search relevant collections
-        collections_to_search = []
+        # Resolve collections to search
+        collection_keys = []
         if doc_types:
             for doc_type in doc_types:
-                collection = self._get_collection_for_type(doc_type)
-                if collection not in collections_to_search:
-                    collections_to_search.append(collection)
+                collection_key = self._get_collection_key_for_type(doc_type)
+                if collection_key not in collection_keys:
+                    collection_keys.append(collection_key)
         else:
-            collections_to_search = list(self.collections.values())
+            collection_keys = list(self.collections.keys())
 
-        for collection in collections_to_search:
-            try:
-                search_results = collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=top_k,
-                    include=["documents", "metadatas", "distances"]
+        # Level 2 cache: keyed on collection generations, so any write to a
+        # searched collection makes older entries unreachable (they age out)
+        generations = tuple(self.collection_generations.get(k, 0) for k in collection_keys)
+        cache_key = (
+            normalized_query, tuple(collection_keys), generations, top_k, similarity_threshold
+        )
+        cached_results = self.retrieval_cache.get(cache_key)
+        if cached_results is not None:
+            return list(cached_results)
+
+        # Level 1 cache, then local embedding (micro-batched on the worker pool)
+        cached_embedding = self.query_embedding_cache.get(normalized_query)
+        if cached_embedding is not None:
+            query_embedding = cached_embedding.tolist()
+        else:
+            query_embedding = await self.query_batcher.embed_single(normalized_query)
+            self.query_embedding_cache.set(normalized_query, array("f", query_embedding))
+
+        # Search collections concurrently, each under its own timeout
+        timeout = self.settings.rag.collection_query_timeout_seconds
+        searches = [
+            self._search_with_deadline(
+                collection_key, query_embedding, top_k, similarity_threshold, timeout
+            )
+            for collection_key in collection_keys
+        ]
+        outcomes = await asyncio.gather(*searches, return_exceptions=True)
+
+        ranked_lists = []
+        complete = True
+        for collection_key, outcome in zip(collection_keys, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                complete = False
+                logger.warning(
+                    "retrieval_timeout",
+                    collection=self.collections[collection_key].name,
+                    timeout_seconds=timeout
+                )
+            elif isinstance(outcome, Exception):
+                complete = False
+                logger.error(
+                    "retrieval_error",
+                    collection=self.collections[collection_key].name,
+                    error=str(outcome)
                 )
+            else:
+                ranked_lists.append(outcome)
 
-                if search_results and search_results["documents"]:
-                    for i, (doc, metadata, distance) in enumerate(zip(
-                        search_results["documents"][0],
-                        search_results["metadatas"][0],
-                        search_results["distances"][0]
-                    )):
-                        # Convert distance to similarity (cosine)
-                        similarity = 1 - distance
-
-                        if similarity >= similarity_threshold:
-                            match_strength = self._classify_match_strength(similarity)
-                            results.append(RetrievalResult(
-                                document=Document(
-                                    id=metadata.get("parent_id", "unknown"),
-                                    content=doc,
-                                    doc_type=DocumentType(metadata.get("doc_type", "evidence")),
-                                    metadata=metadata
-                                ),
-                                similarity_score=similarity,
-                                rank=i,
-                                match_strength=match_strength
-                            ))
-
-            except Exception as e:
-                logger.error("retrieval_error", collection=collection.name, error=str(e))
-
-        # Sort by similarity and return top k
-        results.sort(key=lambda x: x.similarity_score, reverse=True)
-        return results[:top_k]
+        # k-way merge of the per-collection lists (each already sorted by similarity)
+        results = list(itertools.islice(
+            heapq.merge(*ranked_lists, key=lambda r: r.similarity_score, reverse=True),
+            top_k
+        ))
 
-    async def query(
+        # Partial results (a collection failed or timed out) are not cached
+        if not complete:
+            return results
+
+        self.retrieval_cache.set(cache_key, tuple(results))
+        return results
+
+    async def _search_with_deadline(
         self,
-        question: str,
-        doc_types: Optional[List[DocumentType]] = None,
-        system_prompt_key: str = "policy_mapper",
-        user_id: Optional[str] = None
-    ) -> RAGResponse:
+        collection_key: str,
+        query_embedding: List[float],
+        top_k: int,
+        similarity_threshold: float,
+        timeout: float
+    ) -> List[RetrievalResult]:
         """
-        RAG query: retrieve context and generate answer
+        Search one collection on its query executor under a timeout
 
-        Args:
-            question: User question
-            doc_types: Filter document types
-            system_prompt_key: Key for system prompt
-            user_id: User ID for audit
+        Waiting for a query worker and running the search are each limited
+        to timeout, so a search queued behind others still gets its full run
+        time but never waits forever. A search whose caller has gone
+        (cancelled or timed out) before it starts is skipped instead of
+        occupying a worker, and a collection with a search still running
+        past its deadline fails fast instead of queueing behind it.
 
-        Returns:
-            RAGResponse with answer and sources
+        Raises:
+            asyncio.TimeoutError: The search could not start or finish in time
         """
-        import time
-        start_time = time.time()
+        with self._overdue_lock:
+            if self._overdue_searches[collection_key]:
+                raise asyncio.TimeoutError()
+
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+        abandoned = threading.Event()
+        state = {"finished": False, "overdue": False}
+
+        def run() -> List[RetrievalResult]:
+            if abandoned.is_set():
+                return []
+            loop.call_soon_threadsafe(started.set)
+            try:
+                return self._search_collection(collection_key, query_embedding, top_k, similarity_threshold)
+            finally:
+                with self._overdue_lock:
+                    state["finished"] = True
+                    if state["overdue"]:
+                        self._overdue_searches[collection_key] -= 1
+
+        future = loop.run_in_executor(self._query_executor(collection_key), run)
+        try:
+            await asyncio.wait_for(started.wait(), timeout=timeout)
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            with self._overdue_lock:
+                if started.is_set() and not state["finished"]:
+                    state["overdue"] = True
+                    self._overdue_searches[collection_key] += 1
+            raise
+        finally:
+            abandoned.set()
+
+    def _sanitize_documents(self, documents: List[Document], user_id: Optional[str]) -> List[Document]:
+        """DLP-scan document contents in one batch and keep the sanitized text"""
+        results = get_dlp_engine().scan_batch(
+            [doc.content for doc in documents],
+            context="document_ingestion",
+            user_id=user_id
+        )
 
+        sanitized = []
+        for doc, result in zip(documents, results):
+            if result.blocked and self.settings.dlp.block_on_detection:
+                raise ValueError(f"Document {doc.id or '(unnamed)'} blocked by DLP policy")
+            sanitized.append(replace(doc, content=result.sanitized_text))
+        return sanitized
+
+    def _query_executor(self, collection_key: str) -> ThreadPoolExecutor:
+        """Query pool of one collection"""
+        executor = self.query_executors.get(collection_key)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, self.settings.rag.collection_query_workers),
+                thread_name_prefix=f"chroma-query-{collection_key}"
+            )
+            self.query_executors[collection_key] = executor
+        return executor
+
+    def _search_collection(
+        self,
+        collection_key: str,
+        query_embedding: List[float],
+        top_k: int,
+        similarity_threshold: float
+    ) -> List[RetrievalResult]:
+        """Query one collection (runs on the query executor), best match first"""
+        search_results = self.collections[collection_key].query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            include=["documents", "metadatas", "distances"]
+        )
+
+        results = []
+        if search_results and search_results["documents"]:
+            for i, (doc, metadata, distance) in enumerate(zip(
+                search_results["documents"][0],
+                search_results["metadatas"][0],
+                search_results["distances"][0]
+            )):
+                # Convert distance to similarity (cosine)
+                similarity = 1 - distance
+
+                if similarity >= similarity_threshold:
+                    match_strength = self._classify_match_strength(similarity)
+                    results.append(RetrievalResult(
+                        document=Document(
+                            id=metadata.get("parent_id", "unknown"),
+                            content=doc,
+                            doc_type=DocumentType(metadata.get("doc_type", "evidence")),
+                            metadata=metadata
+                        ),
+                        similarity_score=similarity,
+                        rank=i,
+                        match_strength=match_strength
+                    ))
+
+        # Chroma returns nearest first; sort defensively so the merge stays valid
+        results.sort(key=lambda r: r.similarity_score, reverse=True)
+        return results
+
+    def _bump_generation(self, collection_key: str):
+        """Mark a collection as changed, invalidating cached retrievals"""
+        self.collection_generations[collection_key] = (
+            self.collection_generations.get(collection_key, 0) + 1
+        )
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss statistics for the retrieval caches"""
+        return {
+            "query_embedding": self.query_embedding_cache.stats(),
+            "retrieval": self.retrieval_cache.stats(),
+        }
+
+    async def _prepare_query(
+        self,
+        question: str,
+        doc_types: Optional[List[DocumentType]],
+        system_prompt_key: str
+    ) -> Tuple[List[RetrievalResult], List[RetrievalResult], str, List[LLMMessage], int]:
+        """
+        Retrieve and pack context for a RAG query
+
+        Returns:
+            Tuple of (retrieval_results, cited sources, context, messages, context_budget)
+        """
         # Retrieve relevant documents
         retrieval_results = await self.retrieve(
             query=question,
@@ -382,24 +981,22 @@ class RAGEngine:
             top_k=self.settings.rag.top_k_results
         )
 
-        # Build context from retrieved documents
-        context_parts = []
-        for i, result in enumerate(retrieval_results):
-            context_parts.append(
-                f"[Source {i+1}] (Type: {result.document.doc_type.value}, "
-                f"Match: {result.match_strength.value.upper()}, "
-                f"Score: {result.similarity_score:.2f})\n"
-                f"{result.document.content}"
-            )
-
-        context = "\n\n---\n\n".join(context_parts)
-
         # Get system prompt
         system_prompt = SYSTEM_PROMPTS.get(
             system_prompt_key,
             SYSTEM_PROMPTS["policy_mapper"]
         )
 
+        # Build context within the token budget left by the prompt and answer
+        context_budget = min(
+            self.settings.rag.context_max_tokens,
+            self.settings.llm.context_window
+            - self.settings.llm.max_tokens
+            - sum(self.count_llm_tokens([system_prompt, question]))
+            - CONTEXT_INSTRUCTION_TOKENS
+        )
+        context, sources = self.context_builder.build(retrieval_results, context_budget)
+
         # Augment system prompt with context
         augmented_prompt = f"""{system_prompt}
 
@@ -410,12 +1007,48 @@ Based on the above context, answer the following question.
 If the context doesn't contain relevant information, say so.
 Always cite your sources using [Source N] notation."""
 
-        # Generate response using configured LLM provider
         messages = [
             LLMMessage(role=LLMRole.SYSTEM, content=augmented_prompt),
             LLMMessage(role=LLMRole.USER, content=question)
         ]
 
+        return retrieval_results, sources, context, messages, context_budget
+
+    @staticmethod
+    def _confidence(retrieval_results: List[RetrievalResult]) -> float:
+        """Calculate confidence based on retrieval scores"""
+        if retrieval_results:
+            avg_similarity = sum(r.similarity_score for r in retrieval_results) / len(retrieval_results)
+            return min(avg_similarity * 1.2, 1.0)  # Boost slightly, cap at 1.0
+        return 0.3  # Low confidence without sources
+
+    async def query(
+        self,
+        question: str,
+        doc_types: Optional[List[DocumentType]] = None,
+        system_prompt_key: str = "policy_mapper",
+        user_id: Optional[str] = None
+    ) -> RAGResponse:
+        """
+        RAG query: retrieve context and generate answer
+
+        Args:
+            question: User question
+            doc_types: Filter document types
+            system_prompt_key: Key for system prompt
+            user_id: User ID for audit
+
+        Returns:
+            RAGResponse with answer and sources
+        """
+        import time
+        start_time = time.time()
+
+        retrieval_results, sources, context, messages, context_budget = await self._prepare_query(
+            question, doc_types, system_prompt_key
+        )
+
+        # Generate response using configured LLM provider
         llm_client = get_llm_client()
         llm_response = await llm_client.chat(
             messages=messages,
@@ -423,31 +1056,92 @@ Always cite your sources using [Source N] notation."""
         )
 
         processing_time = (time.time() - start_time) * 1000
-
-        # Calculate confidence based on retrieval scores
-        if retrieval_results:
-            avg_similarity = sum(r.similarity_score for r in retrieval_results) / len(retrieval_results)
-            confidence = min(avg_similarity * 1.2, 1.0)  # Boost slightly, cap at 1.0
-        else:
-            confidence = 0.3  # Low confidence without sources
+        confidence = self._confidence(retrieval_results)
 
         logger.info(
             "rag_query_complete",
             question_length=len(question),
             sources_found=len(retrieval_results),
+            sources_used=len(sources),
+            context_budget_tokens=context_budget,
+            embedding_cache_hit_rate=round(self.query_embedding_cache.hit_rate, 3),
+            retrieval_cache_hit_rate=round(self.retrieval_cache.hit_rate, 3),
             confidence=confidence,
             processing_time_ms=processing_time
         )
 
         return RAGResponse(
             answer=llm_response.content,
-            sources=retrieval_results,
+            sources=sources,
             context_used=context,
             confidence=confidence,
             processing_time_ms=processing_time,
             model=llm_response.model
         )
 
+    async def query_stream(
+        self,
+        question: str,
+        doc_types: Optional[List[DocumentType]] = None,
+        system_prompt_key: str = "policy_mapper",
+        user_id: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[str, Any], None]:
+        """
+        Streaming RAG query: sources first, then the answer as it is generated
+
+        Args:
+            question: User question
+            doc_types: Filter document types
+            system_prompt_key: Key for system prompt
+            user_id: User ID for audit
+
+        Yields:
+            ("sources", List[RetrievalResult]), then ("token", str) chunks
+            (output DLP applied), then ("done", stats dict)
+        """
+        import time
+        start_time = time.time()
+
+        retrieval_results, sources, context, messages, context_budget = await self._prepare_query(
+            question, doc_types, system_prompt_key
+        )
+        confidence = self._confidence(retrieval_results)
+        yield "sources", sources
+
+        llm_client = get_llm_client()
+        first_token_time = None
+        response_length = 0
+
+        async for chunk in llm_client.chat_stream(messages=messages, user_id=user_id):
+            if first_token_time is None:
+                first_token_time = time.time()
+            response_length += len(chunk)
+            yield "token", chunk
+
+        processing_time = (time.time() - start_time) * 1000
+        time_to_first_token = (
+            (first_token_time - start_time) * 1000 if first_token_time else processing_time
+        )
+
+        logger.info(
+            "rag_query_stream_complete",
+            question_length=len(question),
+            sources_found=len(retrieval_results),
+            sources_used=len(sources),
+            context_budget_tokens=context_budget,
+            response_length=response_length,
+            confidence=confidence,
+            time_to_first_token_ms=time_to_first_token,
+            processing_time_ms=processing_time
+        )
+
+        yield "done", {
+            "provider": llm_client.get_provider_name(),
+            "confidence": confidence,
+            "time_to_first_token_ms": time_to_first_token,
+            "processing_time_ms": processing_time,
+        }
+
     async def index_policy(
         self,
         policy_id: str,
@@ -558,6 +1252,35 @@ Always cite your sources using [Source N] notation."""
         self.chroma_client.persist()
         logger.info("rag_data_persisted")
 
+    def shutdown(self):
+        """Stop the embedding and collection query worker threads"""
+        self.embedding_pool.shutdown()
+        for executor in self.query_executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance, built on first use so importing this module stays cheap
+_rag_engine: Optional[RAGEngine] = None
+_rag_engine_lock = threading.Lock()
+
+
+def get_rag_engine() -> RAGEngine:
+    """Get the shared RAG engine, opening ChromaDB on first use"""
+    global _rag_engine
+    if _rag_engine is None:
+        with _rag_engine_lock:
+            if _rag_engine is None:
+                _rag_engine = RAGEngine()
+    return _rag_engine
+
+
+def rag_engine_loaded() -> bool:
+    """Whether the RAG engine has been built"""
+    return _rag_engine is not None
+
 
-# Singleton instance
-rag_engine = RAGEngine()
+def __getattr__(name: str):
+    # Legacy module attribute: `from rag.engine import rag_engine`
+    if name == "rag_engine":
+        return get_rag_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Script to measure the cold import time of the API using `python -X importtime`.
+
+Usage: python scripts/benchmark_import_time.py [module]   (default: api.main)
+
+Reports wall-clock and total import time, the slowest top-level packages,
+and whether any heavy model dependency (torch, chromadb, spaCy, Presidio)
+was imported - they should only load when an engine is first used.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Configuration
+APP_DIR = Path(__file__).parent.parent
+RUNS = int(os.environ.get("IMPORTTIME_RUNS", "5"))
+TOP_N = int(os.environ.get("IMPORTTIME_TOP_N", "15"))
+
+HEAVY_PACKAGES = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "chromadb",
+    "spacy",
+    "presidio_analyzer",
+    "presidio_anonymizer",
+]
+
+# "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)\s*$")
+
+
+def run_once(module: str) -> Tuple[float, Dict[str, int]]:
+    """Import the module in a fresh interpreter; returns (wall ms, self us per top-level package)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if proc.returncode != 0:
+        print(f"ERROR: importing {module} failed")
+        print(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "")
+        sys.exit(1)
+
+    packages: Dict[str, int] = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            packages[match.group(3).split(".")[0]] += int(match.group(1))
+
+    return wall_ms, packages
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else "api.main"
+
+    print(f"Measuring import time of {module} ({RUNS} runs, first run compiles bytecode)")
+    print()
+
+    # Warm-up run so bytecode compilation is not measured
+    run_once(module)
+    runs = sorted((run_once(module) for _ in range(RUNS)), key=lambda run: run[0])
+    wall_ms, packages = runs[len(runs) // 2]
+
+    total_ms = sum(packages.values()) / 1000
+    print("=" * 60)
+    print(f"  Wall clock (median): {wall_ms:8.1f} ms")
+    print(f"  Wall clock (best):   {runs[0][0]:8.1f} ms")
+    print(f"  Import time:         {total_ms:8.1f} ms")
+    print("=" * 60)
+    print()
+
+    print(f"Slowest top-level packages (self time, top {TOP_N}):")
+    for name, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_N]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+    print()
+
+    heavy = [name for name in HEAVY_PACKAGES if name in packages]
+    if heavy:
+        print(f"Heavy model dependencies imported: {', '.join(heavy)}")
+    else:
+        print("Heavy model dependencies imported: none")
+
+
+if __name__ == "__main__":
+    main()
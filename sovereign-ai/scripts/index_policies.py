@@ -7,12 +7,19 @@ import os
 import sys
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import List
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 POLICIES_DIR = Path(__file__).parent.parent / "data" / "policies"
 
+# Bulk indexing: files per request and concurrent requests in flight
+# (large requests amortise the per-call embedding and Chroma upsert cost)
+BULK_BATCH_SIZE = int(os.environ.get("INDEX_BULK_BATCH_SIZE", "50"))
+MAX_WORKERS = int(os.environ.get("INDEX_MAX_WORKERS", "4"))
+
 # Headers for authentication (using internal header method)
 HEADERS = {
     "Content-Type": "application/json",
@@ -45,10 +52,8 @@ def extract_metadata(content: str, filename: str) -> dict:
     return metadata
 
 
-def index_policy(file_path: Path) -> bool:
-    """Index a single policy file into the RAG system."""
-    print(f"Indexing: {file_path.name}")
-
+def build_payload(file_path: Path) -> dict:
+    """Build the index request payload for a policy file."""
     # Read the policy content
     with open(file_path, 'r') as f:
         content = f.read()
@@ -56,33 +61,40 @@ def index_policy(file_path: Path) -> bool:
     # Extract metadata
     metadata = extract_metadata(content, file_path.name)
 
-    # Prepare the request payload
-    payload = {
+    return {
         "content": content,
         "doc_type": "policy",
         "doc_id": metadata.get('document_id', file_path.stem),
         "metadata": metadata
     }
 
+
+def index_policies(file_paths: List[Path]) -> int:
+    """Index a batch of policy files with one bulk request. Returns successes."""
+    names = ", ".join(p.name for p in file_paths)
+
     try:
+        payload = {"documents": [build_payload(p) for p in file_paths]}
+
         response = requests.post(
-            f"{API_BASE_URL}/api/v1/documents/index",
+            f"{API_BASE_URL}/api/v1/documents/index/bulk",
             headers=HEADERS,
             json=payload,
-            timeout=30
+            timeout=300
         )
 
         if response.status_code == 200:
             result = response.json()
-            print(f"  ✓ Indexed successfully: {result.get('doc_id')}")
-            return True
+            for doc_id in result.get('doc_ids', []):
+                print(f"  ✓ Indexed successfully: {doc_id}")
+            return len(file_paths)
         else:
-            print(f"  ✗ Failed to index: {response.status_code} - {response.text}")
-            return False
+            print(f"  ✗ Failed to index [{names}]: {response.status_code} - {response.text}")
+            return 0
 
-    except requests.exceptions.RequestException as e:
-        print(f"  ✗ Error indexing: {str(e)}")
-        return False
+    except (OSError, requests.exceptions.RequestException) as e:
+        print(f"  ✗ Error indexing [{names}]: {str(e)}")
+        return 0
 
 
 def main():
@@ -120,15 +132,20 @@ def main():
     print(f"Found {len(policy_files)} policy files to index")
     print()
 
-    # Index each policy
+    # Index policies in bulk batches, several requests in flight at once
+    batches = [
+        policy_files[i:i + BULK_BATCH_SIZE]
+        for i in range(0, len(policy_files), BULK_BATCH_SIZE)
+    ]
+
     success_count = 0
-    fail_count = 0
 
-    for policy_file in policy_files:
-        if index_policy(policy_file):
-            success_count += 1
-        else:
-            fail_count += 1
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = [pool.submit(index_policies, batch) for batch in batches]
+        for future in as_completed(futures):
+            success_count += future.result()
+
+    fail_count = len(policy_files) - success_count
 
     # Summary
     print()
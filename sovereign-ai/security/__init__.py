@@ -8,7 +8,7 @@ from .auth import (
     require_permission,
     require_mfa,
 )
-from .dlp import DLPEngine, dlp_engine
+from .dlp import DLPEngine, get_dlp_engine
 
 __all__ = [
     "AuthService",
@@ -19,5 +19,12 @@ __all__ = [
     "require_permission",
     "require_mfa",
     "DLPEngine",
-    "dlp_engine",
+    "get_dlp_engine",
 ]
+
+
+def __getattr__(name: str):
+    # Legacy package attribute, built on first access
+    if name == "dlp_engine":
+        return get_dlp_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
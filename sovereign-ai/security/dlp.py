@@ -5,22 +5,98 @@ Ensures no data exfiltration through prompts
 """
 
 import re
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass, field
+import json
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from datetime import datetime
 import hashlib
+import time
 
 import structlog
-from presidio_analyzer import AnalyzerEngine, PatternRecognizer, Pattern
-from presidio_anonymizer import AnonymizerEngine
-from presidio_anonymizer.entities import OperatorConfig
 
 from config.settings import get_settings
+from monitoring.metrics import DLP_SCANS, DLP_SCAN_SECONDS, DLP_SCAN_CACHE_REQUESTS
+
+# Presidio pulls in spaCy; imported when the engine is built (see get_dlp_engine)
+if TYPE_CHECKING:
+    from presidio_analyzer import AnalyzerEngine
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Presidio entities requested on every scan
+ANALYZER_ENTITIES = [
+    "PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER",
+    "CREDIT_CARD", "IBAN_CODE", "IP_ADDRESS",
+    "API_KEY", "PASSWORD"
+]
+
+# Sample text for warm_up(): exercises NER and the common recognizers
+WARMUP_TEXT = "Contact John Smith at john.smith@example.com or +1 555 010 0100 from 10.0.0.1"
+
+# Prefilter triggers for Presidio's built-in regex entities
+# (email, phone/card digit runs, IBAN); custom patterns are added per engine
+PREFILTER_TRIGGERS = [
+    r"@",
+    r"\d[\d\s().-]{5,}\d",
+    r"\b[A-Z]{2}\d{2}[A-Z0-9]{4}",
+]
+
+# Capitalized words (possible person names for spaCy NER). Sentence-initial
+# words only count when they are not a common sentence opener.
+NAME_CANDIDATE = re.compile(r"\b[A-Z][a-z]+\b")
+SENTENCE_OPENERS = frozenset({
+    "A", "An", "And", "Any", "Are", "As", "At", "But", "Can", "Could", "Describe",
+    "Do", "Does", "Explain", "For", "Give", "How", "I", "If", "In", "Is", "It",
+    "List", "Map", "Of", "On", "Our", "Please", "Provide", "Should", "So",
+    "Summarize", "That", "The", "These", "This", "Those", "To", "We", "What",
+    "When", "Where", "Which", "Who", "Why", "Will", "With", "Would", "Yes", "No",
+})
+SENTENCE_END_CHARS = ".!?:;\n"
+SENTENCE_SKIP_CHARS = " \t\r\"'(*#>-"
+
+
+def has_name_candidate(text: str) -> bool:
+    """Whether text contains a capitalized word that NER could tag as a person"""
+    for match in NAME_CANDIDATE.finditer(text):
+        i = match.start() - 1
+        while i >= 0 and text[i] in SENTENCE_SKIP_CHARS:
+            i -= 1
+        sentence_initial = i < 0 or text[i] in SENTENCE_END_CHARS
+        if not sentence_initial or match.group() not in SENTENCE_OPENERS:
+            return True
+    return False
+
+
+# Patterns that are a bare character-class run (e.g. "[a-zA-Z0-9_-]{32,}")
+# are slow to search at every offset; the prefilter replaces them with a
+# length check on whitespace-separated tokens
+CHAR_RUN_PATTERN = re.compile(r"^\[[^\]]+\]\{(\d+)(?:,\d*)?\}=?$")
+
+
+def _scoped_pattern(pattern: str, ignore_case: bool = False) -> str:
+    """Wrap a regex so it can be OR-ed into a combined pattern"""
+    if pattern.startswith("(?i)"):
+        return f"(?i:{pattern[4:]})"
+    return f"(?i:{pattern})" if ignore_case else f"(?:{pattern})"
+
+
+# Streamed text that may still grow into a finding is held back:
+# the trailing partial word, a credential keyword still awaiting its value,
+# a trailing run of capitalized words (possible multi-word name), and a
+# trailing run of digit groups and separators (card, phone, IBAN) that is
+# only released once a non-digit boundary arrives
+STREAM_TRAILING_WORD = re.compile(r"\S+$")
+STREAM_PENDING_TRIGGER = re.compile(
+    r"(?i)(?:bearer|basic|password|secret|token|aws[_\-]?secret[_\-]?access[_\-]?key"
+    r"|-----BEGIN[A-Z ]*|(?:mongodb|postgresql|mysql|redis):?/{0,2})['\"]?\s*[:=]?\s*['\"]?$"
+)
+STREAM_TRAILING_NAME = re.compile(r"(?:\b[A-Z][\w'-]*\s+)*\b[A-Z][\w'-]*\s*$")
+STREAM_TRAILING_NUMBER = re.compile(r"(?:\b[A-Z]{2}\d{2}(?:[ -]?[A-Z\d])*[ -]?|[+(]?\d[\d\s().+-]*)$")
+
 
 class SensitiveDataType(str, Enum):
     """Types of sensitive data to detect"""
@@ -56,6 +132,13 @@ class DLPAction(str, Enum):
     BLOCK = "block"
 
 
+# When overlapping findings merge into one redaction, the label of the
+# most severe one is used: action first, then data type category, then confidence
+REDACTING_ACTIONS = (DLPAction.REDACT, DLPAction.BLOCK)
+ACTION_SEVERITY = {DLPAction.REDACT: 0, DLPAction.BLOCK: 1}
+CATEGORY_SEVERITY = {"NETWORK": 0, "PII": 1, "FINANCIAL": 2, "CREDENTIAL": 3, "CLASSIFIED": 4}
+
+
 @dataclass
 class DLPFinding:
     """Represents a sensitive data finding"""
@@ -81,6 +164,55 @@ class DLPScanResult:
     processing_time_ms: float
 
 
+class ScanResultCache:
+    """
+    Bounded TTL cache of scan results (sanitized text, findings, blocked)
+    keyed by (sha256(text), DLP settings version)
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 600.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Tuple[bytes, str], Tuple[float, str, List[DLPFinding], bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[bytes, str]) -> Optional[Tuple[str, List[DLPFinding], bool]]:
+        """Get an unexpired result and mark it most recently used"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._data[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                DLP_SCAN_CACHE_REQUESTS.labels(result="miss").inc()
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+        DLP_SCAN_CACHE_REQUESTS.labels(result="hit").inc()
+        return entry[1], list(entry[2]), entry[3]
+
+    def set(self, key: Tuple[bytes, str], sanitized_text: str, findings: List[DLPFinding], blocked: bool):
+        """Store a result, evicting the least recently used entries over the bound"""
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic(), sanitized_text, list(findings), blocked)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class DLPEngine:
     """
     Data Loss Prevention Engine
@@ -88,15 +220,33 @@ class DLPEngine:
     """
 
     def __init__(self):
+        from presidio_analyzer import BatchAnalyzerEngine
+        from presidio_anonymizer import AnonymizerEngine
+
         self.settings = get_settings()
         self.analyzer = self._initialize_analyzer()
+        self.batch_analyzer = BatchAnalyzerEngine(analyzer_engine=self.analyzer)
         self.anonymizer = AnonymizerEngine()
 
         # Custom patterns for security-specific data
         self.custom_patterns = self._load_custom_patterns()
 
-    def _initialize_analyzer(self) -> AnalyzerEngine:
+        # Cheap first pass deciding whether Presidio/NER needs to run
+        self.prefilter = self._build_prefilter()
+        self.fast_path_scans = 0
+        self.full_scans = 0
+
+        # Results of previous scans, so a prompt scanned in the API layer and
+        # again in the LLM client (or a replayed chat history) is analyzed once
+        self.scan_cache = ScanResultCache(
+            max_entries=self.settings.dlp.scan_cache_max_entries,
+            ttl_seconds=self.settings.dlp.scan_cache_ttl_seconds
+        )
+
+    def _initialize_analyzer(self) -> "AnalyzerEngine":
         """Initialize Presidio analyzer with custom recognizers"""
+        from presidio_analyzer import AnalyzerEngine, PatternRecognizer, Pattern
+
         analyzer = AnalyzerEngine()
 
         # Add custom recognizers
@@ -133,6 +283,18 @@ class DLPEngine:
         analyzer.registry.add_recognizer(password_recognizer)
         analyzer.registry.add_recognizer(ip_recognizer)
 
+        # Batch size of the nlp.pipe pass behind scan_batch (spaCy's default
+        # for pipe(); Presidio's batch API does not take one)
+        for nlp in getattr(analyzer.nlp_engine, "nlp", {}).values():
+            nlp.batch_size = self.settings.dlp.batch_size
+
+        # Presidio matches pattern recognizers case-insensitively
+        self._recognizer_regexes = [
+            pattern.regex
+            for recognizer in (api_key_recognizer, password_recognizer, ip_recognizer)
+            for pattern in recognizer.patterns
+        ]
+
         return analyzer
 
     def _load_custom_patterns(self) -> Dict[str, re.Pattern]:
@@ -145,6 +307,58 @@ class DLPEngine:
             "aws_secret": re.compile(r"(?i)aws[_\-]?secret[_\-]?access[_\-]?key['\"]?\s*[:=]\s*['\"]?[a-zA-Z0-9/+=]{40}"),
         }
 
+    def _build_prefilter(self) -> re.Pattern:
+        """Combine every DLP regex into one pattern (any hit = suspicious)"""
+        parts = [_scoped_pattern(p) for p in PREFILTER_TRIGGERS]
+        self._prefilter_min_token = None
+
+        for regex in self._recognizer_regexes:
+            char_run = CHAR_RUN_PATTERN.match(regex)
+            if char_run:
+                length = int(char_run.group(1))
+                self._prefilter_min_token = min(self._prefilter_min_token or length, length)
+            else:
+                parts.append(_scoped_pattern(regex, ignore_case=True))
+
+        parts += [_scoped_pattern(p.pattern) for p in self.custom_patterns.values()]
+        return re.compile("|".join(parts))
+
+    def warm_up(self):
+        """Run one full Presidio analysis so lazy spaCy/recognizer setup happens now"""
+        self.analyzer.analyze(text=WARMUP_TEXT, language="en", entities=ANALYZER_ENTITIES)
+
+    def needs_full_scan(self, text: str) -> bool:
+        """Whether text needs Presidio (prefilter hit or possible person name)"""
+        if not self.settings.dlp.fast_path_enabled:
+            return True
+        if self.prefilter.search(text) or has_name_candidate(text):
+            return True
+        return self._prefilter_min_token is not None and any(
+            len(token) >= self._prefilter_min_token for token in text.split()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Fast-path and scan cache statistics"""
+        total = self.fast_path_scans + self.full_scans
+        cache_lookups = self.scan_cache.hits + self.scan_cache.misses
+        return {
+            "scans": total,
+            "fast_path_scans": self.fast_path_scans,
+            "full_scans": self.full_scans,
+            "fast_path_rate": round(self.fast_path_scans / total, 3) if total else 0.0,
+            "cache_entries": len(self.scan_cache),
+            "cache_hits": self.scan_cache.hits,
+            "cache_hit_rate": round(self.scan_cache.hits / cache_lookups, 3) if cache_lookups else 0.0,
+        }
+
+    def settings_version(self) -> str:
+        """Fingerprint of everything that affects scan results (cache key part)"""
+        state = {
+            "dlp": self.settings.dlp.model_dump(),
+            "patterns": {name: p.pattern for name, p in self.custom_patterns.items()},
+        }
+        return hashlib.sha256(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
     def scan(
         self,
         text: str,
@@ -162,49 +376,228 @@ class DLPEngine:
         Returns:
             DLPScanResult with findings and sanitized text
         """
-        import time
         start_time = time.time()
 
+        cache_key, cached = self._cache_lookup(text)
+        if cached is not None:
+            return self._scan_result(text, *cached, start_time, context, user_id, cached=True)
+
+        findings, blocked = self._detect(text)
+        sanitized_text = self._finish_scan(text, findings, blocked, cache_key)
+        return self._scan_result(text, sanitized_text, findings, blocked, start_time, context, user_id)
+
+    def scan_batch(
+        self,
+        texts: List[str],
+        context: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> List[DLPScanResult]:
+        """
+        Scan many texts, running spaCy NER over them with one nlp.pipe pass
+
+        Cached and prefilter-clean texts skip NER; duplicates are analyzed
+        once. Intended for bulk workloads such as document ingestion.
+
+        Args:
+            texts: Texts to scan
+            context: Context of the scan (input/output/document)
+            user_id: User who triggered the scan
+
+        Returns:
+            DLPScanResult per text, in input order
+        """
+        start_time = time.time()
+
+        # text -> (sanitized_text, findings, blocked, from_cache)
+        outcomes: Dict[str, Tuple[str, List[DLPFinding], bool, bool]] = {}
+        pending: Dict[str, Optional[Tuple[bytes, str]]] = {}  # text -> cache key, needs NER
+
+        for text in texts:
+            if text in outcomes or text in pending:
+                continue
+
+            cache_key, cached = self._cache_lookup(text)
+            if cached is not None:
+                outcomes[text] = (*cached, True)
+            elif self.needs_full_scan(text):
+                pending[text] = cache_key
+            else:
+                self._record_scan("fast", time.perf_counter())
+                outcomes[text] = (self._finish_scan(text, [], False, cache_key), [], False, False)
+
+        pending_texts = list(pending)
+        for text, (findings, blocked) in zip(pending_texts, self._detect_batch(pending_texts)):
+            sanitized_text = self._finish_scan(text, findings, blocked, pending[text])
+            outcomes[text] = (sanitized_text, findings, blocked, False)
+
+        # Every input is audited, including cached and repeated texts
+        results = []
+        for text in texts:
+            sanitized_text, findings, blocked, from_cache = outcomes[text]
+            results.append(self._scan_result(
+                text, sanitized_text, findings, blocked, start_time, context, user_id,
+                cached=from_cache
+            ))
+
+        return results
+
+    def _cache_lookup(
+        self,
+        text: str
+    ) -> Tuple[Optional[Tuple[bytes, str]], Optional[Tuple[str, List[DLPFinding], bool]]]:
+        """Cache key for text (None when caching is off) and any cached result"""
+        if not self.settings.dlp.scan_cache_enabled:
+            return None, None
+        cache_key = (hashlib.sha256(text.encode()).digest(), self.settings_version())
+        return cache_key, self.scan_cache.get(cache_key)
+
+    def _finish_scan(
+        self,
+        text: str,
+        findings: List[DLPFinding],
+        blocked: bool,
+        cache_key: Optional[Tuple[bytes, str]]
+    ) -> str:
+        """Apply redactions and cache the result; returns the sanitized text"""
+        sanitized_text = text
+
+        # Apply redaction if enabled
+        if self.settings.dlp.redact_sensitive_data:
+            sanitized_text = self._apply_redactions(text, findings)
+
+        if cache_key is not None:
+            self.scan_cache.set(cache_key, sanitized_text, findings, blocked)
+
+        return sanitized_text
+
+    def _scan_result(
+        self,
+        text: str,
+        sanitized_text: str,
+        findings: List[DLPFinding],
+        blocked: bool,
+        start_time: float,
+        context: Optional[str],
+        user_id: Optional[str],
+        cached: bool = False
+    ) -> DLPScanResult:
+        """Build the scan result and write its findings to the audit log (cached or not)"""
         scan_id = hashlib.sha256(
             f"{text[:100]}{datetime.utcnow().isoformat()}".encode()
         ).hexdigest()[:16]
 
-        findings: List[DLPFinding] = []
-        sanitized_text = text
-        blocked = False
+        processing_time = (time.time() - start_time) * 1000
+
+        # Log findings
+        if findings:
+            logger.warning(
+                "dlp_findings_detected",
+                scan_id=scan_id,
+                context=context,
+                user_id=user_id,
+                finding_count=len(findings),
+                blocked=blocked,
+                data_types=[f.data_type.value for f in findings],
+                cached=cached
+            )
+
+        return DLPScanResult(
+            original_text=text,
+            sanitized_text=sanitized_text,
+            findings=findings,
+            blocked=blocked,
+            scan_id=scan_id,
+            scan_timestamp=datetime.utcnow(),
+            processing_time_ms=processing_time
+        )
+
+    def _record_scan(self, path: str, start_time: float, count: int = 1):
+        """Count detection passes by path and observe their (per-text) duration"""
+        if path == "fast":
+            self.fast_path_scans += count
+        else:
+            self.full_scans += count
+
+        DLP_SCANS.labels(path=path).inc(count)
+        elapsed = (time.perf_counter() - start_time) / count
+        for _ in range(count):
+            DLP_SCAN_SECONDS.labels(path=path).observe(elapsed)
+
+    def _detect(self, text: str) -> Tuple[List[DLPFinding], bool]:
+        """Run Presidio and the custom patterns over text (fast path when clean)"""
+        start_time = time.perf_counter()
+
+        # Fast path: nothing any recognizer could match and no name candidates
+        if not self.needs_full_scan(text):
+            self._record_scan("fast", start_time)
+            return [], False
 
         # Run Presidio analysis
         try:
             presidio_results = self.analyzer.analyze(
                 text=text,
                 language="en",
-                entities=[
-                    "PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER",
-                    "CREDIT_CARD", "IBAN_CODE", "IP_ADDRESS",
-                    "API_KEY", "PASSWORD"
-                ]
+                entities=ANALYZER_ENTITIES
             )
+        except Exception as e:
+            logger.error("presidio_scan_failed", error=str(e))
+            presidio_results = []
 
-            for result in presidio_results:
-                data_type = self._map_entity_to_type(result.entity_type)
-                detected_text = text[result.start:result.end]
+        detection = self._collect_findings(text, presidio_results)
+        self._record_scan("full", start_time)
 
-                finding = DLPFinding(
-                    data_type=data_type,
-                    confidence=result.score,
-                    start=result.start,
-                    end=result.end,
-                    text=detected_text,
-                    redacted_text=self._redact_text(detected_text, data_type),
-                    action_taken=self._determine_action(data_type, result.score)
-                )
-                findings.append(finding)
+        return detection
 
-                if finding.action_taken == DLPAction.BLOCK:
-                    blocked = True
+    def _detect_batch(self, texts: List[str]) -> List[Tuple[List[DLPFinding], bool]]:
+        """Run Presidio (batched spaCy pipeline) and the custom patterns over texts"""
+        if not texts:
+            return []
 
+        start_time = time.perf_counter()
+        try:
+            presidio_results = list(self._analyze_batch(texts))
         except Exception as e:
-            logger.error("presidio_scan_failed", error=str(e))
+            logger.error("presidio_batch_scan_failed", batch_size=len(texts), error=str(e))
+            return [self._detect(text) for text in texts]
+
+        detections = [
+            self._collect_findings(text, results)
+            for text, results in zip(texts, presidio_results)
+        ]
+        self._record_scan("full", start_time, count=len(texts))
+
+        return detections
+
+    def _analyze_batch(self, texts: List[str]) -> List[List[Any]]:
+        """Presidio results per text, with NLP artifacts from one nlp.pipe pass"""
+        return self.batch_analyzer.analyze_iterator(
+            texts,
+            language="en",
+            entities=ANALYZER_ENTITIES
+        )
+
+    def _collect_findings(self, text: str, presidio_results: List[Any]) -> Tuple[List[DLPFinding], bool]:
+        """Turn Presidio results into findings and apply the custom patterns"""
+        findings: List[DLPFinding] = []
+        blocked = False
+
+        for result in presidio_results:
+            data_type = self._map_entity_to_type(result.entity_type)
+            detected_text = text[result.start:result.end]
+
+            finding = DLPFinding(
+                data_type=data_type,
+                confidence=result.score,
+                start=result.start,
+                end=result.end,
+                text=detected_text,
+                redacted_text=self._redact_text(detected_text, data_type),
+                action_taken=self._determine_action(data_type, result.score)
+            )
+            findings.append(finding)
+
+            if finding.action_taken == DLPAction.BLOCK:
+                blocked = True
 
         # Run custom pattern matching
         for pattern_name, pattern in self.custom_patterns.items():
@@ -224,33 +617,7 @@ class DLPEngine:
                 findings.append(finding)
                 blocked = True
 
-        # Apply redaction if enabled
-        if self.settings.dlp.redact_sensitive_data:
-            sanitized_text = self._apply_redactions(text, findings)
-
-        processing_time = (time.time() - start_time) * 1000
-
-        # Log findings
-        if findings:
-            logger.warning(
-                "dlp_findings_detected",
-                scan_id=scan_id,
-                context=context,
-                user_id=user_id,
-                finding_count=len(findings),
-                blocked=blocked,
-                data_types=[f.data_type.value for f in findings]
-            )
-
-        return DLPScanResult(
-            original_text=text,
-            sanitized_text=sanitized_text,
-            findings=findings,
-            blocked=blocked,
-            scan_id=scan_id,
-            scan_timestamp=datetime.utcnow(),
-            processing_time_ms=processing_time
-        )
+        return findings, blocked
 
     def _map_entity_to_type(self, entity_type: str) -> SensitiveDataType:
         """Map Presidio entity to our data type"""
@@ -318,21 +685,49 @@ class DLPEngine:
         }
         return type_labels.get(data_type, "[REDACTED]")
 
+    @staticmethod
+    def _severity(finding: DLPFinding) -> Tuple[int, int, float]:
+        category = finding.data_type.value.split("_", 1)[0]
+        return (
+            ACTION_SEVERITY.get(finding.action_taken, 0),
+            CATEGORY_SEVERITY.get(category, 0),
+            finding.confidence
+        )
+
+    def _resolve_spans(self, findings: List[DLPFinding]) -> List[Tuple[int, int, DLPFinding]]:
+        """Merge overlapping redactable findings into disjoint (start, end, lead) spans"""
+        redactable = sorted(
+            (f for f in findings if f.action_taken in REDACTING_ACTIONS),
+            key=lambda f: (f.start, -f.end)
+        )
+
+        spans: List[Tuple[int, int, DLPFinding]] = []
+        for finding in redactable:
+            if spans and finding.start < spans[-1][1]:
+                start, end, lead = spans[-1]
+                if self._severity(finding) > self._severity(lead):
+                    lead = finding
+                spans[-1] = (start, max(end, finding.end), lead)
+            else:
+                spans.append((finding.start, finding.end, finding))
+
+        return spans
+
     def _apply_redactions(
         self,
         text: str,
         findings: List[DLPFinding]
     ) -> str:
-        """Apply redactions to text based on findings"""
-        # Sort findings by position (reverse) to maintain offsets
-        sorted_findings = sorted(findings, key=lambda f: f.start, reverse=True)
-
-        result = text
-        for finding in sorted_findings:
-            if finding.action_taken in [DLPAction.REDACT, DLPAction.BLOCK]:
-                result = result[:finding.start] + finding.redacted_text + result[finding.end:]
+        """Apply redactions to text based on findings (single pass over text)"""
+        parts: List[str] = []
+        position = 0
+        for start, end, lead in self._resolve_spans(findings):
+            parts.append(text[position:start])
+            parts.append(lead.redacted_text)
+            position = end
+        parts.append(text[position:])
 
-        return result
+        return "".join(parts)
 
     def scan_prompt(self, prompt: str, user_id: str) -> Tuple[str, bool]:
         """
@@ -364,6 +759,161 @@ class DLPEngine:
         result = self.scan(output, context="ai_output", user_id=user_id)
         return result.sanitized_text, len(result.findings) > 0
 
+    async def scan_output_stream(
+        self,
+        chunks: AsyncIterator[str],
+        user_id: str
+    ) -> AsyncGenerator[str, None]:
+        """
+        Scan streamed AI output incrementally
+
+        Yields:
+            Sanitized text as soon as it can no longer be part of a finding
+        """
+        scanner = StreamingDLPScanner(self, user_id=user_id)
+        async for chunk in chunks:
+            released = scanner.feed(chunk)
+            if released:
+                yield released
+
+        released = scanner.close()
+        if released:
+            yield released
+
+
+class StreamingDLPScanner:
+    """
+    Incremental output DLP for streamed text
+
+    Each chunk is scanned together with a lookback window of already
+    released text (so findings straddling chunk boundaries are seen),
+    instead of rescanning the whole response. Text is released as soon as
+    it cannot become part of a longer match; only a short tail is held back.
+    """
+
+    def __init__(self, engine: DLPEngine, user_id: Optional[str] = None, context: str = "ai_output"):
+        self.engine = engine
+        self.user_id = user_id
+        self.context = context
+        self.lookback_chars = engine.settings.dlp.stream_lookback_chars
+        self.max_holdback_chars = engine.settings.dlp.stream_max_holdback_chars
+        self.findings: List[DLPFinding] = []
+        self.scans = 0
+        self._lookback = ""  # Tail of released original text
+        self._pending = ""  # Received but not yet released
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; return sanitized text that is safe to release"""
+        self._pending += chunk
+        window = self._lookback + self._pending
+        offset = len(self._lookback)
+
+        # Cheap check first: nothing can be released while the whole
+        # pending text is still a partial word / pending match
+        if self._holdback_start(window, [], offset) <= offset:
+            return ""
+
+        findings, _ = self.engine._detect(window)
+        self.scans += 1
+        return self._release(window, findings, self._holdback_start(window, findings, offset))
+
+    def close(self) -> str:
+        """Release everything still held back and log the stream's findings"""
+        released = ""
+        if self._pending:
+            window = self._lookback + self._pending
+            findings, _ = self.engine._detect(window)
+            self.scans += 1
+            released = self._release(window, findings, len(window))
+
+        if self.findings:
+            logger.warning(
+                "dlp_findings_detected",
+                context=self.context,
+                user_id=self.user_id,
+                finding_count=len(self.findings),
+                blocked=any(f.action_taken == DLPAction.BLOCK for f in self.findings),
+                data_types=[f.data_type.value for f in self.findings],
+                streamed=True,
+                scans=self.scans
+            )
+        return released
+
+    @property
+    def had_findings(self) -> bool:
+        return bool(self.findings)
+
+    def _holdback_start(self, window: str, findings: List[DLPFinding], offset: int) -> int:
+        """Window position from which text must be held back"""
+        end = len(window)
+        start = end
+
+        for pattern in (STREAM_TRAILING_WORD, STREAM_PENDING_TRIGGER, STREAM_TRAILING_NAME, STREAM_TRAILING_NUMBER):
+            match = pattern.search(window, max(offset, end - self.max_holdback_chars))
+            if match:
+                start = min(start, match.start())
+
+        # A finding reaching into the held tail may still grow: hold it whole
+        changed = True
+        while changed:
+            changed = False
+            for finding in findings:
+                if finding.end >= start and finding.start < start:
+                    start = finding.start
+                    changed = True
+
+        return max(start, offset, end - self.max_holdback_chars)
+
+    def _release(self, window: str, findings: List[DLPFinding], release_end: int) -> str:
+        """Sanitize and release window[offset:release_end]"""
+        offset = len(self._lookback)
+        if release_end <= offset:
+            return ""
+
+        # Findings overlapping the released span, clipped to it
+        released_findings = [
+            replace(
+                finding,
+                start=max(finding.start, offset) - offset,
+                end=min(finding.end, release_end) - offset
+            )
+            for finding in findings
+            if finding.start < release_end and finding.end > offset
+        ]
+        self.findings.extend(released_findings)
+
+        raw = window[offset:release_end]
+        released = raw
+        if released_findings and self.engine.settings.dlp.redact_sensitive_data:
+            released = self.engine._apply_redactions(raw, released_findings)
+
+        self._lookback = (self._lookback + raw)[-self.lookback_chars:] if self.lookback_chars else ""
+        self._pending = window[release_end:]
+        return released
+
+
+# Singleton instance, built on first use so importing this module stays cheap
+_dlp_engine: Optional[DLPEngine] = None
+_dlp_engine_lock = threading.Lock()
+
+
+def get_dlp_engine() -> DLPEngine:
+    """Get the shared DLP engine, loading Presidio/spaCy on first use"""
+    global _dlp_engine
+    if _dlp_engine is None:
+        with _dlp_engine_lock:
+            if _dlp_engine is None:
+                _dlp_engine = DLPEngine()
+    return _dlp_engine
+
+
+def dlp_engine_loaded() -> bool:
+    """Whether the DLP engine has been built"""
+    return _dlp_engine is not None
+
 
-# Singleton instance
-dlp_engine = DLPEngine()
+def __getattr__(name: str):
+    # Legacy module attribute: `from security.dlp import dlp_engine`
+    if name == "dlp_engine":
+        return get_dlp_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
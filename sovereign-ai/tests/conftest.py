@@ -0,0 +1,9 @@
+"""
+Sovereign AI - Test Configuration
+Makes the application packages importable from the tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
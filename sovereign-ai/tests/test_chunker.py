@@ -0,0 +1,24 @@
+"""
+Sovereign AI - Markdown Chunker Tests
+Chunks must stay within the embedding model's token window
+"""
+
+import pytest
+
+from rag.chunker import MarkdownChunker
+
+
+@pytest.mark.parametrize("text", ["", "   ", "\n\n\t\n"])
+def test_blank_input_has_no_chunks(text):
+    assert MarkdownChunker().chunk(text) == []
+
+
+def test_oversized_word_is_split_to_budget():
+    chunker = MarkdownChunker(max_tokens=254)
+    blob = "x" * 5000
+
+    chunks = chunker.chunk(f"# Attachment\n\nEncoded: {blob} end")
+
+    assert all(chunk.token_count <= 254 for chunk in chunks)
+    assert "".join(chunk.text for chunk in chunks).count("x") == len(blob)
+    assert all(chunk.heading_path == ["Attachment"] for chunk in chunks)